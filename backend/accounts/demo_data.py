@@ -0,0 +1,234 @@
+# backend/accounts/demo_data.py
+"""
+Domain rules for synthetic Makerfex data, shared by seed_demo_makerfex (one
+hand-made demo shop) and generate_load_data (many shops, in bulk).
+
+Every helper takes an `rng` with the random module's interface: the seed
+command passes the module itself, the generator a seeded random.Random per
+shop so its output is reproducible.
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+from projects.models import Project, ProjectStageTransition
+from sales.models import SalesOrder
+from tasks.models import Task
+
+# name, order, is_initial, is_final, allows_sale_log
+#   - is_final=True is the workflow terminus
+#   - allows_sale_log=True is the business gate for 'Log for Sale'
+STAGE_DEFS = [
+    ("Inquiry", 10, True, False, False),
+    ("Design", 20, False, False, False),
+    ("Cut & Mill", 30, False, False, False),
+    ("Assembly", 40, False, False, False),
+    ("Finishing", 50, False, False, False),
+    ("Ready to Ship", 60, False, False, True),   # sellable gate example
+    ("Completed", 70, False, True, True),        # also sellable in demo (shop can change)
+]
+
+# name, slug, base price, estimated hours
+TEMPLATE_DEFS = [
+    ("Walnut Coffee Table", "walnut-coffee-table", 850, 18),
+    ("Charcuterie Board", "charcuterie-board", 120, 3),
+    ("Floating Shelf Set", "floating-shelf-set", 220, 6),
+    ("Maple Desk", "maple-desk", 650, 16),
+]
+
+FIRST_NAMES = [
+    "Alex", "Taylor", "Morgan", "Riley", "Sam", "Casey",
+    "Jordan", "Avery", "Quinn", "Hayden", "Jamie", "Cameron",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Lee", "Garcia", "Brown",
+    "Davis", "Miller", "Wilson", "Moore", "Anderson",
+]
+CUSTOMER_SOURCES = ["Etsy", "Website", "Local fair"]
+
+PROJECT_SCENARIOS = [
+    "completed_on_time",
+    "completed_late",
+    "active_future",
+    "active_overdue",
+    "cancelled_midway",
+    "on_hold",
+]
+PROJECT_SCENARIO_WEIGHTS = [0.25, 0.15, 0.2, 0.15, 0.15, 0.1]
+
+ACTIVE_STAGE_NAMES = ["Design", "Cut & Mill", "Assembly", "Finishing", "Ready to Ship"]
+PAUSED_STAGE_NAMES = ["Design", "Assembly", "Finishing"]
+
+PROJECT_PRIORITIES = [
+    Project.Priority.LOW,
+    Project.Priority.NORMAL,
+    Project.Priority.HIGH,
+    Project.Priority.RUSH,
+]
+
+TASK_STATUSES = [
+    Task.Status.TODO,
+    Task.Status.IN_PROGRESS,
+    Task.Status.BLOCKED,
+    Task.Status.DONE,
+]
+
+ORDER_STATUSES = [
+    SalesOrder.Status.PAID,
+    SalesOrder.Status.OPEN,
+    SalesOrder.Status.DRAFT,
+    SalesOrder.Status.CANCELLED,
+    SalesOrder.Status.REFUNDED,
+]
+ORDER_STATUS_WEIGHTS = [0.6, 0.15, 0.1, 0.1, 0.05]
+ORDER_SOURCES = [
+    SalesOrder.Source.ETSY,
+    SalesOrder.Source.WEBSITE,
+    SalesOrder.Source.POS,
+]
+ORDER_TAX_RATE = 0.08
+
+
+def datetime_from_date(d: date):
+    """
+    Helper: convert a date to a naive datetime at noon (to avoid DST weirdness).
+    """
+    return datetime(d.year, d.month, d.day, 12, 0, 0)
+
+
+def project_scenario(rng, stage_map, created_dt, today) -> dict:
+    """
+    Pick a project scenario and derive status, dates and current stage from it.
+    Returns the matching Project field values.
+    """
+    scenario = rng.choices(PROJECT_SCENARIOS, weights=PROJECT_SCENARIO_WEIGHTS)[0]
+
+    # Start date after creation
+    start_date = (created_dt + timedelta(days=rng.randint(0, 7))).date()
+    completed_at = None
+
+    if scenario == "completed_on_time":
+        status = Project.Status.COMPLETED
+        due_date = start_date + timedelta(days=rng.randint(14, 60))
+        completed_at = timezone.make_aware(datetime_from_date(due_date - timedelta(days=rng.randint(0, 3))))
+        current_stage = stage_map["Completed"]
+
+    elif scenario == "completed_late":
+        status = Project.Status.COMPLETED
+        due_date = start_date + timedelta(days=rng.randint(14, 45))
+        completed_at = timezone.make_aware(datetime_from_date(due_date + timedelta(days=rng.randint(1, 14))))
+        current_stage = stage_map["Completed"]
+
+    elif scenario == "active_future":
+        status = Project.Status.ACTIVE
+        # due date in the near future (1–30 days ahead)
+        due_date = today + timedelta(days=rng.randint(1, 30))
+        current_stage = stage_map[rng.choice(ACTIVE_STAGE_NAMES)]
+
+    elif scenario == "active_overdue":
+        status = Project.Status.ACTIVE
+        # due date in the recent past (1–30 days ago)
+        due_date = today - timedelta(days=rng.randint(1, 30))
+        current_stage = stage_map[rng.choice(ACTIVE_STAGE_NAMES)]
+
+    elif scenario == "cancelled_midway":
+        status = Project.Status.CANCELLED
+        due_date = start_date + timedelta(days=rng.randint(14, 60))
+        current_stage = stage_map[rng.choice(PAUSED_STAGE_NAMES)]
+
+    else:  # on_hold
+        status = Project.Status.ON_HOLD
+        due_date = start_date + timedelta(days=rng.randint(21, 90))
+        current_stage = stage_map[rng.choice(PAUSED_STAGE_NAMES)]
+
+    return {
+        "status": status,
+        "start_date": start_date,
+        "due_date": due_date,
+        "completed_at": completed_at,
+        "current_stage": current_stage,
+        "priority": rng.choice(PROJECT_PRIORITIES),
+    }
+
+
+def stage_history(rng, project, stage_path, now) -> list:
+    """
+    Unsaved ProjectStageTransition rows walking project through stage_path up
+    to its current stage, spread between creation and completion (or now).
+    """
+    if not project.current_stage_id:
+        return []
+    stage_ids = [stage.id for stage in stage_path]
+    path = stage_path[: stage_ids.index(project.current_stage_id) + 1]
+    end = project.completed_at or now - timedelta(days=rng.randint(0, 5))
+    span = max(end - project.created_at, timedelta(hours=len(path)))
+
+    rows = []
+    previous = None
+    for step, stage in enumerate(path):
+        rows.append(
+            ProjectStageTransition(
+                shop_id=project.shop_id,
+                project=project,
+                workflow_id=project.workflow_id,
+                from_stage=previous,
+                to_stage=stage,
+                entered_at=project.created_at + span * step / len(path),
+            )
+        )
+        previous = stage
+    return rows
+
+
+def project_tasks(rng, project, station_choices, assignees, num_tasks=None) -> list:
+    """
+    Unsaved Task rows for project. station_choices is a list of (stage,
+    station) pairs; assignees may include None. Without num_tasks, cancelled
+    projects get 1-3 tasks and the rest 3-7.
+    """
+    if num_tasks is None:
+        if project.status == Project.Status.CANCELLED:
+            num_tasks = rng.randint(1, 3)
+        else:
+            num_tasks = rng.randint(3, 7)
+
+    tasks = []
+    for order_index in range(num_tasks):
+        stage, station = rng.choice(station_choices)
+        status = rng.choice(TASK_STATUSES)
+
+        est_hours = round(rng.uniform(0.5, 4.0), 1)
+        act_hours = None
+        if status in {Task.Status.IN_PROGRESS, Task.Status.DONE}:
+            act_hours = round(est_hours * rng.uniform(0.5, 1.5), 1)
+
+        tasks.append(
+            Task(
+                shop_id=project.shop_id,
+                project=project,
+                title=f"Task {order_index + 1} for {project.name}",
+                description="Demo task for seeded project.",
+                status=status,
+                stage=stage,
+                station=station,
+                assignee=rng.choice(assignees),
+                order=order_index + 1,
+                estimated_hours=est_hours,
+                actual_hours=act_hours,
+                due_date=project.due_date,
+            )
+        )
+    return tasks
+
+
+def order_line_amounts(rng, template) -> list:
+    """
+    [(quantity, unit_price, line_total)] for a 1-2 line order of template.
+    """
+    lines = []
+    for _ in range(rng.randint(1, 2)):
+        qty = rng.choice([1, 1, 1, 2])
+        unit_price = template.base_price or rng.randint(100, 900)
+        lines.append((qty, unit_price, qty * unit_price))
+    return lines
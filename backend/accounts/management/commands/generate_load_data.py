@@ -0,0 +1,404 @@
+# backend/accounts/management/commands/generate_load_data.py
+
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.demo_data import (
+    CUSTOMER_SOURCES,
+    FIRST_NAMES,
+    LAST_NAMES,
+    ORDER_SOURCES,
+    ORDER_STATUS_WEIGHTS,
+    ORDER_STATUSES,
+    ORDER_TAX_RATE,
+    STAGE_DEFS,
+    TEMPLATE_DEFS,
+    datetime_from_date,
+    order_line_amounts,
+    project_scenario,
+    project_tasks,
+    stage_history,
+)
+from accounts.models import Employee, Shop, Station
+from customers.models import Customer
+from customers.stats import refresh_shop_customer_stats
+from inventory.models import Consumable, Equipment, InventoryTransaction, Material
+from makerfex_backend.backfill import map_in_processes
+from makerfex_backend.versions import bump_versions
+from products.models import ProductTemplate
+from projects.models import Project, ProjectStageTransition
+from sales.models import SalesOrder, SalesOrderLine
+from sales.rollups import rebuild_shop_sales_rollups
+from tasks.models import Task
+from workflows.models import Workflow, WorkflowStage
+
+# Station name, code, employee roles working there.
+LOAD_STATIONS = [
+    ("Table Saw", "TS-01", ["Owner"]),
+    ("CNC Router", "CNC-01", ["CNC Operator"]),
+    ("Assembly Bench", "ASM-01", ["Owner", "Finisher"]),
+    ("Finishing Booth", "FIN-01", ["Finisher"]),
+    ("Packing & Shipping", "PACK-01", ["Packaging"]),
+]
+LOAD_ROLES = ["Owner", "CNC Operator", "Finisher", "Packaging"]
+
+# Project stage -> station the project sits at (see seed_demo_makerfex).
+STAGE_STATIONS = {
+    "Design": "Assembly Bench",
+    "Cut & Mill": "Table Saw",
+    "Assembly": "Assembly Bench",
+    "Finishing": "Finishing Booth",
+    "Ready to Ship": "Packing & Shipping",
+    "Completed": "Packing & Shipping",
+}
+
+# Task (stage, station) pairs.
+TASK_STATIONS = [
+    ("Cut & Mill", "Table Saw"),
+    ("Cut & Mill", "CNC Router"),
+    ("Assembly", "Assembly Bench"),
+    ("Finishing", "Finishing Booth"),
+    ("Ready to Ship", "Packing & Shipping"),
+]
+
+INVENTORY_KINDS = [
+    (InventoryTransaction.InventoryType.MATERIAL, Material, "material", "MAT"),
+    (InventoryTransaction.InventoryType.CONSUMABLE, Consumable, "consumable", "CON"),
+    (InventoryTransaction.InventoryType.EQUIPMENT, Equipment, "equipment", "EQ"),
+]
+
+MONTHS_BACK = 12
+
+
+def generate_shop(index: int, params: dict) -> dict:
+    """
+    Build load shop number `index` and everything in it. Deterministic in
+    (params["seed"], index, params["anchor"]), whichever process runs it.
+    Returns row counts per model.
+    """
+    rng = random.Random(f"{params['seed']}:{index}")
+    now = timezone.make_aware(datetime.combine(date.fromisoformat(params["anchor"]), dt_time(12)))
+    today = now.date()
+    chunk = params["chunk_size"]
+    counts = {}
+
+    def insert(model, rows, created=None):
+        """
+        bulk_create rows in chunks. created_at/updated_at are auto_now fields,
+        so backdated timestamps (created, aligned with rows) are written with
+        one bulk_update per chunk.
+        """
+        model.objects.bulk_create(rows, batch_size=chunk)
+        if created:
+            for row, created_at in zip(rows, created):
+                row.created_at = row.updated_at = created_at
+            model.objects.bulk_update(rows, ["created_at", "updated_at"], batch_size=chunk)
+        counts[model._meta.label] = counts.get(model._meta.label, 0) + len(rows)
+        return rows
+
+    with transaction.atomic():
+        shop = Shop.objects.create(
+            name=f"Load Shop {index:04d}",
+            slug=f"{params['prefix']}-{index:04d}",
+            email=f"shop{index}@example.org",
+        )
+
+        employees = insert(
+            Employee,
+            [
+                Employee(shop=shop, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES), role=role)
+                for role in LOAD_ROLES
+            ],
+        )
+        by_role = {employee.role: employee for employee in employees}
+        owner = by_role["Owner"]
+
+        stations = {
+            station.name: station
+            for station in insert(Station, [Station(shop=shop, name=name, code=code) for name, code, _ in LOAD_STATIONS])
+        }
+        Station.employees.through.objects.bulk_create(
+            [
+                Station.employees.through(station_id=stations[name].id, employee_id=by_role[role].id)
+                for name, _, roles in LOAD_STATIONS
+                for role in roles
+            ]
+        )
+
+        workflow = Workflow.objects.create(
+            shop=shop,
+            name="Woodworking - Standard",
+            is_default=True,
+            is_active=True,
+            created_by=owner,
+        )
+        stage_path = insert(
+            WorkflowStage,
+            [
+                WorkflowStage(
+                    workflow=workflow,
+                    name=name,
+                    order=order,
+                    is_initial=is_initial,
+                    is_final=is_final,
+                    allows_sale_log=allows_sale_log,
+                )
+                for name, order, is_initial, is_final, allows_sale_log in STAGE_DEFS
+            ],
+        )
+        stage_map = {stage.name: stage for stage in stage_path}
+
+        templates = insert(
+            ProductTemplate,
+            [
+                ProductTemplate(
+                    shop=shop,
+                    name=name,
+                    slug=slug,
+                    base_price=price,
+                    estimated_hours=hours,
+                    default_workflow=workflow,
+                )
+                for name, slug, price, hours in TEMPLATE_DEFS
+            ],
+        )
+
+        # Customers and projects are spread over the rolling year.
+        customers = []
+        customer_created = []
+        for i in range(params["customers"]):
+            fn, ln = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            customer = Customer(
+                shop=shop,
+                first_name=fn,
+                last_name=ln,
+                email=f"{fn.lower()}.{ln.lower()}{i}@example.org",
+                phone=f"+1-555-{i:06d}",
+                country_code="US",
+                is_vip=(i % 10 == 0),
+                source=rng.choice(CUSTOMER_SOURCES),
+            )
+            customers.append(customer)
+            customer_created.append(now - timedelta(days=rng.randint(10, MONTHS_BACK * 30)))
+        insert(Customer, customers, created=customer_created)
+
+        projects = []
+        project_created = []
+        for i in range(params["projects"]):
+            template = rng.choice(templates)
+            created_dt = now - timedelta(days=rng.randint(15, MONTHS_BACK * 30))
+            scenario = project_scenario(rng, stage_map, created_dt, today)
+            stage = scenario["current_stage"]
+            station_name = STAGE_STATIONS.get(stage.name)
+            project = Project(
+                shop=shop,
+                customer=rng.choice(customers) if customers else None,
+                name=f"{template.name} #{1000 + i}",
+                reference_code=f"LD{index}-{1000 + i}",
+                workflow=workflow,
+                current_stage=stage,
+                station=stations[station_name] if station_name else None,
+                priority=scenario["priority"],
+                status=scenario["status"],
+                start_date=scenario["start_date"],
+                due_date=scenario["due_date"],
+                completed_at=scenario["completed_at"],
+                created_by=owner,
+                assigned_to=rng.choice(employees),
+                estimated_hours=template.estimated_hours,
+            )
+            projects.append(project)
+            project_created.append(created_dt)
+        insert(Project, projects, created=project_created)
+
+        transitions = []
+        for project in projects:
+            transitions.extend(stage_history(rng, project, stage_path, now))
+        insert(ProjectStageTransition, transitions)
+
+        task_stations = [(stage_map[stage], stations[station]) for stage, station in TASK_STATIONS]
+        assignees = employees + [None]
+        tasks = []
+        for project in projects:
+            num_tasks = rng.randint(max(0, params["tasks"] // 2), params["tasks"] * 3 // 2)
+            tasks.extend(project_tasks(rng, project, task_stations, assignees, num_tasks=num_tasks))
+            if len(tasks) >= chunk:
+                insert(Task, tasks)
+                tasks = []
+        insert(Task, tasks)
+
+        # Inventory: items round-robin over the three kinds. Materials and
+        # consumables get a ledger of `ledger` transactions, and their
+        # quantity_on_hand is the ledger's balance.
+        items = {model: [] for _, model, _, _ in INVENTORY_KINDS}
+        ledgers = []
+        for n in range(params["inventory"]):
+            inventory_type, model, field, prefix = INVENTORY_KINDS[n % len(INVENTORY_KINDS)]
+            deltas = []
+            if model is not Equipment:
+                deltas = [Decimal(rng.choice([-3, -2, -1, -1, 5, 10])) for _ in range(params["ledger"])]
+            item = model(
+                shop=shop,
+                name=f"{prefix} item {n}",
+                sku=f"{prefix}-{index}-{n}",
+                unit_of_measure="unit",
+                quantity_on_hand=Decimal(rng.randint(10, 200)) + sum(deltas),
+                reorder_point=Decimal(rng.randint(0, 20)),
+                unit_cost=Decimal(rng.randint(1, 9000)) / 100,
+            )
+            items[model].append(item)
+            ledgers.append((inventory_type, field, item, deltas))
+        for model, rows in items.items():
+            insert(model, rows)
+
+        ledger = []
+        for inventory_type, field, item, deltas in ledgers:
+            for delta in deltas:
+                ledger.append(
+                    InventoryTransaction(
+                        shop=shop,
+                        inventory_type=inventory_type,
+                        quantity_delta=delta,
+                        reason=(
+                            InventoryTransaction.Reason.CONSUME if delta < 0 else InventoryTransaction.Reason.ADJUSTMENT
+                        ),
+                        project=rng.choice(projects) if projects and delta < 0 else None,
+                        **{field: item},
+                    )
+                )
+            if len(ledger) >= chunk:
+                insert(InventoryTransaction, ledger)
+                ledger = []
+        insert(InventoryTransaction, ledger)
+
+        orders = []
+        order_lines = []  # per order
+        for i in range(params["orders"]):
+            template = rng.choice(templates)
+            order_date = today - timedelta(days=rng.randint(5, MONTHS_BACK * 30))
+            project = rng.choice(projects) if projects else None
+            amounts = order_line_amounts(rng, template)
+            subtotal = sum(line_total for _, _, line_total in amounts)
+            tax = round(subtotal * ORDER_TAX_RATE, 2)
+            order = SalesOrder(
+                shop=shop,
+                customer=rng.choice(customers) if customers else None,
+                project=project,
+                order_number=f"LDO{index}-{2000 + i}",
+                status=rng.choices(ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS)[0],
+                source=rng.choice(ORDER_SOURCES),
+                order_date=order_date,
+                due_date=order_date + timedelta(days=14),
+                subtotal_amount=subtotal,
+                tax_amount=tax,
+                total_amount=subtotal + tax,
+            )
+            orders.append(order)
+            order_lines.append(
+                [
+                    SalesOrderLine(
+                        shop=shop,
+                        order=order,
+                        product_template=template,
+                        project=project,
+                        description=template.name,
+                        quantity=qty,
+                        unit_price=unit_price,
+                        line_total=line_total,
+                    )
+                    for qty, unit_price, line_total in amounts
+                ]
+            )
+        insert(
+            SalesOrder,
+            orders,
+            created=[timezone.make_aware(datetime_from_date(order.order_date)) for order in orders],
+        )
+        # Lines were built before their orders had ids; bulk_create picks them up now.
+        insert(SalesOrderLine, [line for lines in order_lines for line in lines])
+
+        # Everything went in with bulk writes (no post_save): derive and version it all.
+        refresh_shop_customer_stats(shop.id)
+        rebuild_shop_sales_rollups(shop.id)
+        bump_versions(
+            shop.id,
+            Shop, Employee, Station, Workflow, WorkflowStage, ProductTemplate, Customer, Project, Task,
+            Material, Consumable, Equipment, InventoryTransaction, SalesOrder, SalesOrderLine,
+        )
+
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic dataset of many load-test shops (same domain rules as "
+        "seed_demo_makerfex), written with chunked bulk_create, one shop per worker process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shops", type=int, default=4, help="Number of shops to generate.")
+        parser.add_argument("--customers", type=int, default=500, help="Customers per shop.")
+        parser.add_argument("--projects", type=int, default=2000, help="Projects per shop.")
+        parser.add_argument("--tasks", type=int, default=5, help="Average tasks per project.")
+        parser.add_argument("--inventory", type=int, default=150, help="Inventory items per shop.")
+        parser.add_argument("--ledger", type=int, default=20, help="Inventory transactions per material/consumable.")
+        parser.add_argument("--orders", type=int, default=1000, help="Sales orders per shop.")
+        parser.add_argument("--seed", default="makerfex", help="Random seed; same seed + anchor = same data.")
+        parser.add_argument(
+            "--anchor",
+            default="",
+            help="Date (YYYY-MM-DD) the data is relative to (default today). Pin it for byte-identical reruns.",
+        )
+        parser.add_argument("--prefix", default="load", help="Shop slug prefix; existing '<prefix>-*' shops are replaced.")
+        parser.add_argument("--workers", type=int, default=4, help="Worker processes (one shop at a time each).")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per bulk INSERT.")
+
+    def handle(self, *args, **opts):
+        try:
+            anchor = date.fromisoformat(opts["anchor"]) if opts["anchor"] else timezone.localdate()
+        except ValueError:
+            raise CommandError(f"--anchor must be YYYY-MM-DD (got '{opts['anchor']}').")
+
+        params = {
+            "seed": opts["seed"],
+            "anchor": anchor.isoformat(),
+            "prefix": opts["prefix"],
+            "chunk_size": max(1, opts["chunk_size"]),
+            **{key: max(0, opts[key]) for key in ("customers", "projects", "tasks", "inventory", "ledger", "orders")},
+        }
+        shops = max(0, opts["shops"])
+        started = time.perf_counter()
+
+        existing = Shop.objects.filter(slug__startswith=f"{opts['prefix']}-")
+        if existing.exists():
+            self.stdout.write(f"Removing {existing.count()} existing '{opts['prefix']}-*' shop(s)...")
+            existing.delete()
+
+        generate = partial(generate_shop, params=params)
+        results = map_in_processes(generate, range(1, shops + 1), opts["workers"], warn=self.stdout.write)
+        totals = self._collect(results)
+
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+        for label in sorted(totals):
+            self.stdout.write(f"  {label:<32} {totals[label]:>10}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {shops} load shop(s), {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)."
+            )
+        )
+
+    def _collect(self, results) -> dict:
+        totals = {}
+        for index, counts in enumerate(results, start=1):
+            for label, n in counts.items():
+                totals[label] = totals.get(label, 0) + n
+            self.stdout.write(f"Shop {index}: {sum(counts.values())} rows")
+        return totals
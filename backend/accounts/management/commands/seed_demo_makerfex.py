@@ -11,13 +11,28 @@ from accounts.models import Shop, Employee, Station
 from config.models import ShopConfig, IntegrationConfig
 from customers.models import Customer
 from workflows.models import Workflow, WorkflowStage
-from projects.models import Project
-from tasks.models import Task
+from projects.models import Project, ProjectStageTransition
 from inventory.models import Material, Consumable, Equipment
 from products.models import ProductTemplate, ProjectPromotion
 from sales.models import SalesOrder, SalesOrderLine
 from analytics.models import AnalyticsSnapshot, AnalyticsEvent
 from assistants.models import AssistantProfile, AssistantSession, AssistantMessage
+from accounts.demo_data import (
+    CUSTOMER_SOURCES,
+    FIRST_NAMES,
+    LAST_NAMES,
+    ORDER_SOURCES,
+    ORDER_STATUS_WEIGHTS,
+    ORDER_STATUSES,
+    ORDER_TAX_RATE,
+    STAGE_DEFS,
+    TEMPLATE_DEFS,
+    datetime_from_date,
+    order_line_amounts,
+    project_scenario,
+    project_tasks,
+    stage_history,
+)
 
 
 class Command(BaseCommand):
@@ -197,22 +212,8 @@ class Command(BaseCommand):
             created_by=owner_employee,
         )
 
-        # NOTE:
-        # - is_final=True is the workflow terminus
-        # - allows_sale_log=True is the business gate for 'Log for Sale'
-        stage_defs = [
-            # name, order, is_initial, is_final, allows_sale_log
-            ("Inquiry", 10, True, False, False),
-            ("Design", 20, False, False, False),
-            ("Cut & Mill", 30, False, False, False),
-            ("Assembly", 40, False, False, False),
-            ("Finishing", 50, False, False, False),
-            ("Ready to Ship", 60, False, False, True),   # sellable gate example
-            ("Completed", 70, False, True, True),        # also sellable in demo (shop can change)
-        ]
-
         stage_map = {}
-        for name, order, is_initial, is_final, allows_sale_log in stage_defs:
+        for name, order, is_initial, is_final, allows_sale_log in STAGE_DEFS:
             stage = WorkflowStage.objects.create(
                 workflow=workflow,
                 name=name,
@@ -241,21 +242,12 @@ class Command(BaseCommand):
         # -----------------------------
         # 5) Customers (rolling year)
         # -----------------------------
-        first_names = [
-            "Alex", "Taylor", "Morgan", "Riley", "Sam", "Casey",
-            "Jordan", "Avery", "Quinn", "Hayden", "Jamie", "Cameron",
-        ]
-        last_names = [
-            "Smith", "Johnson", "Lee", "Garcia", "Brown",
-            "Davis", "Miller", "Wilson", "Moore", "Anderson",
-        ]
-
         customers = []
         num_customers = 25
 
         for i in range(num_customers):
-            fn = random.choice(first_names)
-            ln = random.choice(last_names)
+            fn = random.choice(FIRST_NAMES)
+            ln = random.choice(LAST_NAMES)
             email = f"{fn.lower()}.{ln.lower()}{i}@example.org"
 
             # Creation anywhere in last 12 months
@@ -273,7 +265,7 @@ class Command(BaseCommand):
                 postal_code="62701",
                 country_code="US",
                 is_vip=(i % 10 == 0),
-                source=random.choice(["Etsy", "Website", "Local fair"]),
+                source=random.choice(CUSTOMER_SOURCES),
                 notes="Demo seeded customer.",
             )
 
@@ -292,15 +284,8 @@ class Command(BaseCommand):
         # -----------------------------
         # 6) Product Templates
         # -----------------------------
-        templates_data = [
-            ("Walnut Coffee Table", "walnut-coffee-table", 850, 18),
-            ("Charcuterie Board", "charcuterie-board", 120, 3),
-            ("Floating Shelf Set", "floating-shelf-set", 220, 6),
-            ("Maple Desk", "maple-desk", 650, 16),
-        ]
-
         templates = []
-        for name, slug, price, hours in templates_data:
+        for name, slug, price, hours in TEMPLATE_DEFS:
             tmpl = ProductTemplate.objects.create(
                 shop=shop,
                 name=name,
@@ -325,97 +310,13 @@ class Command(BaseCommand):
             customer = random.choice(customers)
             template = random.choice(templates)
 
-            # Decide "type" of project scenario
-            scenario = random.choices(
-                [
-                    "completed_on_time",
-                    "completed_late",
-                    "active_future",
-                    "active_overdue",
-                    "cancelled_midway",
-                    "on_hold",
-                ],
-                weights=[0.25, 0.15, 0.2, 0.15, 0.15, 0.1],
-            )[0]
-
             # Base: created sometime in last 12 months
             created_days_ago = random.randint(15, months_back * 30)
             created_dt = now - timedelta(days=created_days_ago)
 
-            # Start date after creation
-            start_date = (created_dt + timedelta(days=random.randint(0, 7))).date()
-
-            # Build scenario-specific status and dates
-            if scenario == "completed_on_time":
-                status = Project.Status.COMPLETED
-                due_date = start_date + timedelta(days=random.randint(14, 60))
-                completed_at = timezone.make_aware(
-                    datetime_from_date(due_date - timedelta(days=random.randint(0, 3)))
-                )
-                current_stage = stage_map["Completed"]
-
-            elif scenario == "completed_late":
-                status = Project.Status.COMPLETED
-                due_date = start_date + timedelta(days=random.randint(14, 45))
-                completed_at = timezone.make_aware(
-                    datetime_from_date(due_date + timedelta(days=random.randint(1, 14)))
-                )
-                current_stage = stage_map["Completed"]
-
-            elif scenario == "active_future":
-                status = Project.Status.ACTIVE
-                # due date in the near future (1–30 days ahead)
-                due_date = today + timedelta(days=random.randint(1, 30))
-                completed_at = None
-                current_stage = random.choice(
-                    [
-                        stage_map["Design"],
-                        stage_map["Cut & Mill"],
-                        stage_map["Assembly"],
-                        stage_map["Finishing"],
-                        stage_map["Ready to Ship"],
-                    ]
-                )
-
-            elif scenario == "active_overdue":
-                status = Project.Status.ACTIVE
-                # due date in the recent past (1–30 days ago)
-                due_date = today - timedelta(days=random.randint(1, 30))
-                completed_at = None
-                current_stage = random.choice(
-                    [
-                        stage_map["Design"],
-                        stage_map["Cut & Mill"],
-                        stage_map["Assembly"],
-                        stage_map["Finishing"],
-                        stage_map["Ready to Ship"],
-                    ]
-                )
-
-            elif scenario == "cancelled_midway":
-                status = Project.Status.CANCELLED
-                due_date = start_date + timedelta(days=random.randint(14, 60))
-                completed_at = None
-                current_stage = random.choice(
-                    [stage_map["Design"], stage_map["Assembly"], stage_map["Finishing"]]
-                )
-
-            else:  # on_hold
-                status = Project.Status.ON_HOLD
-                due_date = start_date + timedelta(days=random.randint(21, 90))
-                completed_at = None
-                current_stage = random.choice(
-                    [stage_map["Design"], stage_map["Assembly"], stage_map["Finishing"]]
-                )
-
-            priority = random.choice(
-                [
-                    Project.Priority.LOW,
-                    Project.Priority.NORMAL,
-                    Project.Priority.HIGH,
-                    Project.Priority.RUSH,
-                ]
-            )
+            # Scenario-specific status, dates and stage
+            scenario = project_scenario(random, stage_map, created_dt, today)
+            current_stage = scenario["current_stage"]
 
             project_name = f"{template.name} #{1000 + i}"
 
@@ -431,11 +332,11 @@ class Command(BaseCommand):
                 workflow=workflow,
                 current_stage=current_stage,
                 station=station,
-                priority=priority,
-                status=status,
-                start_date=start_date,
-                due_date=due_date,
-                completed_at=completed_at,
+                priority=scenario["priority"],
+                status=scenario["status"],
+                start_date=scenario["start_date"],
+                due_date=scenario["due_date"],
+                completed_at=scenario["completed_at"],
                 created_by=owner_employee,
                 assigned_to=random.choice(
                     [owner_employee, cnc_employee, finisher_employee]
@@ -455,16 +356,19 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"✓ {len(projects)} projects created."))
 
+        # Stage history: walk each project through the stages up to its current
+        # one, spread between creation and completion (or now).
+        stage_path = [stage_map[name] for name, *_ in STAGE_DEFS]
+        transitions = []
+        for project in projects:
+            transitions.extend(stage_history(random, project, stage_path, now))
+        ProjectStageTransition.objects.bulk_create(transitions)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ {len(transitions)} stage transitions created."))
+
         # -----------------------------
         # 8) Tasks
         # -----------------------------
-        task_statuses = [
-            Task.Status.TODO,
-            Task.Status.IN_PROGRESS,
-            Task.Status.BLOCKED,
-            Task.Status.DONE,
-        ]
-
         station_choices = [
             (stage_map["Cut & Mill"], table_saw),
             (stage_map["Cut & Mill"], cnc_station),
@@ -474,39 +378,10 @@ class Command(BaseCommand):
         ]
 
         tasks = []
+        assignees = [owner_employee, cnc_employee, finisher_employee, None]
         for project in projects:
-            if project.status == Project.Status.CANCELLED:
-                num_tasks = random.randint(1, 3)
-            else:
-                num_tasks = random.randint(3, 7)
-
-            for order_index in range(num_tasks):
-                stage, station = random.choice(station_choices)
-                status = random.choice(task_statuses)
-
-                title = f"Task {order_index + 1} for {project.name}"
-                est_hours = round(random.uniform(0.5, 4.0), 1)
-                act_hours = None
-                if status in {Task.Status.IN_PROGRESS, Task.Status.DONE}:
-                    act_hours = round(est_hours * random.uniform(0.5, 1.5), 1)
-
-                task = Task.objects.create(
-                    shop=shop,
-                    project=project,
-                    title=title,
-                    description="Demo task for seeded project.",
-                    status=status,
-                    stage=stage,
-                    station=station,
-                    assignee=random.choice(
-                        [owner_employee, cnc_employee, finisher_employee, None]
-                    ),
-                    order=order_index + 1,
-                    estimated_hours=est_hours,
-                    actual_hours=act_hours,
-                    due_date=project.due_date,
-                )
-
+            for task in project_tasks(random, project, station_choices, assignees):
+                task.save()
                 tasks.append(task)
 
         self.stdout.write(self.style.SUCCESS(f"✓ {len(tasks)} tasks created."))
@@ -614,16 +489,7 @@ class Command(BaseCommand):
             days_ago = random.randint(5, months_back * 30)
             order_date = today - timedelta(days=days_ago)
 
-            status = random.choices(
-                [
-                    SalesOrder.Status.PAID,
-                    SalesOrder.Status.OPEN,
-                    SalesOrder.Status.DRAFT,
-                    SalesOrder.Status.CANCELLED,
-                    SalesOrder.Status.REFUNDED,
-                ],
-                weights=[0.6, 0.15, 0.1, 0.1, 0.05],
-            )[0]
+            status = random.choices(ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS)[0]
 
             order_number = f"SGO-{2000 + i}"
 
@@ -633,24 +499,14 @@ class Command(BaseCommand):
                 project=project,
                 order_number=order_number,
                 status=status,
-                source=random.choice(
-                    [
-                        SalesOrder.Source.ETSY,
-                        SalesOrder.Source.WEBSITE,
-                        SalesOrder.Source.POS,
-                    ]
-                ),
+                source=random.choice(ORDER_SOURCES),
                 order_date=order_date,
                 due_date=order_date + timedelta(days=14),
                 currency_code="USD",
             )
 
-            num_lines = random.randint(1, 2)
             subtotal = 0
-            for _ in range(num_lines):
-                qty = random.choice([1, 1, 1, 2])
-                unit_price = tmpl.base_price or random.randint(100, 900)
-                line_total = qty * unit_price
+            for qty, unit_price, line_total in order_line_amounts(random, tmpl):
                 line = SalesOrderLine.objects.create(
                     order=order,
                     product_template=tmpl,
@@ -663,7 +519,7 @@ class Command(BaseCommand):
                 subtotal += line_total
                 lines.append(line)
 
-            tax = round(subtotal * 0.08, 2)
+            tax = round(subtotal * ORDER_TAX_RATE, 2)
             total = subtotal + tax
 
             order.subtotal_amount = subtotal
@@ -820,13 +676,3 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS("✓ Assistant profile, session, and messages created."))
         self.stdout.write(self.style.SUCCESS("Demo Makerfex data reset + seeding complete. 🎉"))
-
-
-def datetime_from_date(d: date):
-    """
-    Helper to create a timezone-naive datetime at noon for a given date.
-    Useful for backdating created_at/occurred_at fields.
-    """
-    from datetime import datetime
-
-    return datetime(d.year, d.month, d.day, 12, 0, 0)
@@ -0,0 +1,51 @@
+# backend/accounts/tests/test_accounts_load_data.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import Shop
+from inventory.models import InventoryTransaction, Material
+from projects.models import Project, ProjectStageTransition
+from sales.models import SalesOrderLine
+from tasks.models import Task
+
+SMALL = ["--shops", "2", "--customers", "5", "--projects", "12", "--tasks", "2", "--inventory", "6",
+         "--ledger", "3", "--orders", "4", "--anchor", "2026-01-15", "--workers", "1", "--chunk-size", "7"]
+
+
+def fingerprint():
+    return {
+        "projects": list(
+            Project.objects.order_by("shop__slug", "reference_code").values_list(
+                "shop__slug", "reference_code", "status", "current_stage__name", "due_date", "created_at", "customer__email"
+            )
+        ),
+        "tasks": list(Task.objects.order_by("project__reference_code", "order").values_list("title", "status", "station__name")),
+        "materials": list(Material.objects.order_by("sku").values_list("sku", "quantity_on_hand")),
+    }
+
+
+@pytest.mark.django_db
+def test_load_data_is_deterministic_and_consistent():
+    call_command("generate_load_data", *SMALL, stdout=StringIO())
+    first = fingerprint()
+
+    # Re-running replaces the shops with identical data.
+    call_command("generate_load_data", *SMALL, stdout=StringIO())
+    assert Shop.objects.filter(slug__startswith="load-").count() == 2
+    assert fingerprint() == first
+    assert len(first["projects"]) == 24
+
+    # Every material has its ledger, and every project a stage history ending
+    # in its current stage.
+    for material in Material.objects.all():
+        assert InventoryTransaction.objects.filter(material=material).count() == 3
+    last_moves = {
+        t.project_id: t.to_stage_id for t in ProjectStageTransition.objects.order_by("entered_at", "id")
+    }
+    assert last_moves == dict(Project.objects.values_list("id", "current_stage_id"))
+    assert not SalesOrderLine.objects.filter(order__isnull=True).exists()
+
+    call_command("generate_load_data", *SMALL, "--seed", "other", stdout=StringIO())
+    assert fingerprint() != first
@@ -1,10 +1,26 @@
 # accounts/utils.py
 from accounts.models import Employee
+from makerfex_backend.timing import timed
 
 def get_shop_for_user(user):
     if not user or not user.is_authenticated:
         return None
+    with timed("tenant"):
+        try:
+            return Employee.objects.select_related("shop").get(user=user, is_active=True).shop
+        except Employee.DoesNotExist:
+            return None
+
+
+def get_request_shop(request):
+    """
+    get_shop_for_user(request.user), resolved once per request: the ETag check
+    and the queryset of a table viewset share one lookup.
+    """
+    # DRF's Request wraps the HttpRequest; cache on the one both layers see.
+    http_request = getattr(request, "_request", request)
     try:
-        return Employee.objects.get(user=user, is_active=True).shop
-    except Employee.DoesNotExist:
-        return None
+        return http_request._makerfex_shop
+    except AttributeError:
+        shop = http_request._makerfex_shop = get_shop_for_user(request.user)
+        return shop
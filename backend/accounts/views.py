@@ -13,6 +13,7 @@ from rest_framework.views import APIView
 
 from accounts.utils import get_shop_for_user
 from makerfex_backend.filters import QueryParamSearchFilter
+from makerfex_backend.query_budget import query_budget
 
 from .models import Shop, Employee, Station
 from .serializers import ShopSerializer, EmployeeSerializer, StationSerializer
@@ -91,6 +92,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         "id",
     ]
     ordering = ("first_name", "last_name", "id")  # default ordering when no ?ordering=
+    query_budgets = {"list": 5, "retrieve": 4}
 
     def get_queryset(self):
         shop = get_shop_for_user(self.request.user)
@@ -110,6 +112,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
         return qs
 
+    @query_budget(4)
     @action(detail=False, methods=["get"], url_path="me")
     def me(self, request):
         """
@@ -219,6 +222,7 @@ class StationViewSet(viewsets.ModelViewSet):
         "id",
     ]
     ordering = ("name", "id")
+    query_budgets = {"list": 6, "retrieve": 5}
 
     def get_queryset(self):
         shop = get_shop_for_user(self.request.user)
@@ -14,6 +14,14 @@ from projects.metrics import (
     metric_projects_throughput_time_series,
     metric_projects_throughput_sparkline,
     metric_projects_top_overdue,
+    metric_projects_time_in_stage,
+    metric_projects_cumulative_flow,
+)
+from sales.metrics import (
+    metric_sales_revenue_by_day,
+    metric_sales_revenue_by_source,
+    metric_sales_average_order_value,
+    metric_sales_top_customers,
 )
 
 # Maps metric key -> callable(shop=..., time_range=..., **kwargs) -> payload dict
@@ -25,6 +33,14 @@ METRIC_REGISTRY = {
     "projects.throughput_30d": metric_projects_throughput_time_series,
     "projects.throughput_sparkline_30d": metric_projects_throughput_sparkline,
     "projects.top_overdue": metric_projects_top_overdue,
+    # Stage history (ProjectStageTransition)
+    "projects.time_in_stage": metric_projects_time_in_stage,
+    "projects.cumulative_flow": metric_projects_cumulative_flow,
+    # Sales (SalesDailyRollup / CustomerStats)
+    "sales.revenue_by_day": metric_sales_revenue_by_day,
+    "sales.revenue_by_source": metric_sales_revenue_by_source,
+    "sales.average_order_value": metric_sales_average_order_value,
+    "sales.top_customers": metric_sales_top_customers,
 }
 
 
@@ -38,4 +54,10 @@ METRIC_CAPABILITIES = {
     "projects.throughput_30d": ["view_shop_aggregates"],
     "projects.throughput_sparkline_30d": ["view_shop_aggregates"],
     "projects.top_overdue": ["view_shop_aggregates"],
+    "projects.time_in_stage": ["view_shop_aggregates"],
+    "projects.cumulative_flow": ["view_shop_aggregates"],
+    "sales.revenue_by_day": ["view_shop_aggregates"],
+    "sales.revenue_by_source": ["view_shop_aggregates"],
+    "sales.average_order_value": ["view_shop_aggregates"],
+    "sales.top_customers": ["view_shop_aggregates"],
 }
@@ -0,0 +1,68 @@
+# backend/analytics/tests/test_analytics_async_views.py
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+
+from analytics.views import analytics_metrics_async
+from makerfex_backend.search import global_search_async
+
+
+@pytest.fixture
+def async_get(auth_client, settings):
+    # Worker-thread connections can't see the test transaction.
+    settings.ASYNC_READ_PARALLEL_QUERIES = False
+    settings.SEARCH_DEADLINE_MS = 0
+    auth = auth_client._credentials["HTTP_AUTHORIZATION"]
+
+    def get(view, path, **params):
+        request = RequestFactory().get(path, params, HTTP_AUTHORIZATION=auth)
+        return async_to_sync(view)(request)
+
+    return get
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("q", ["", "walnut", "board", "status:active", "cutting bord"])
+def test_async_search_matches_sync_view(auth_client, async_get, q):
+    expected = auth_client.get("/api/search/", {"q": q})
+    assert expected.status_code == 200
+
+    resp = async_get(global_search_async, "/api/search/", q=q)
+    assert resp.status_code == 200
+    assert json.loads(resp.content) == json.loads(expected.content)
+
+
+@pytest.mark.django_db
+def test_async_metrics_batch_matches_single_sync_calls(auth_client, async_get):
+    keys = ["projects.active_count", "projects.wip_by_stage", "projects.throughput_30d"]
+    expected = [json.loads(auth_client.get("/api/analytics/metrics/", {"key": key}).content) for key in keys]
+
+    single = async_get(analytics_metrics_async, "/api/analytics/metrics/", key=keys[0])
+    assert json.loads(single.content) == expected[0]
+
+    batch = async_get(analytics_metrics_async, "/api/analytics/metrics/", keys=",".join(keys))
+    assert batch.status_code == 200
+    assert json.loads(batch.content) == expected
+
+
+@pytest.mark.django_db
+def test_async_views_reject_anonymous_and_unknown_keys(async_get):
+    anonymous = async_to_sync(global_search_async)(RequestFactory().get("/api/search/", {"q": "x"}))
+    assert anonymous.status_code == 401
+
+    resp = async_get(analytics_metrics_async, "/api/analytics/metrics/", keys="projects.active_count,nope")
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_async_views_ignore_query_string_tokens(auth_client, async_get):
+    token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+    search = async_to_sync(global_search_async)(RequestFactory().get("/api/search/", {"q": "x", "access_token": token}))
+    assert search.status_code == 401
+
+    metrics = async_to_sync(analytics_metrics_async)(
+        RequestFactory().get("/api/analytics/metrics/", {"key": "projects.active_count", "access_token": token})
+    )
+    assert metrics.status_code == 401
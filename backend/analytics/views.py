@@ -1,4 +1,10 @@
 # backend/analytics/views.py
+import inspect
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -7,6 +13,9 @@ from rest_framework import status, permissions
 from .models import AnalyticsSnapshot, AnalyticsEvent
 from .serializers import AnalyticsSnapshotSerializer, AnalyticsEventSerializer
 
+from makerfex_backend.async_views import authenticate_jwt, gather_in_threads
+from makerfex_backend.serializers import parse_field_list
+
 from .metrics.registry import METRIC_REGISTRY, METRIC_CAPABILITIES
 from .utils import get_shop_for_user
 
@@ -20,6 +29,48 @@ class AnalyticsEventViewSet(viewsets.ModelViewSet):
     queryset = AnalyticsEvent.objects.all()
     serializer_class = AnalyticsEventSerializer
 
+# Query params forwarded to metrics that declare the matching keyword argument,
+# e.g. ?workflow=3 -> metric(..., workflow_id="3").
+METRIC_OPTION_PARAMS = {"workflow": "workflow_id"}
+
+
+def metric_options(key, query_params) -> dict:
+    accepted = inspect.signature(METRIC_REGISTRY[key]).parameters
+    return {
+        kwarg: query_params.get(param)
+        for param, kwarg in METRIC_OPTION_PARAMS.items()
+        if query_params.get(param) and kwarg in accepted
+    }
+
+
+def metric_response(key, shop, time_range, options=None):
+    """
+    Run one registered metric and wrap it in the standard response envelope.
+    """
+    metric_func = METRIC_REGISTRY[key]
+    options = options or {}
+
+    # Capability hook: not strictly enforcing yet, but ready.
+    required_caps = METRIC_CAPABILITIES.get(key, [])
+    # TODO: wire real user capability checks here later.
+
+    try:
+        payload = metric_func(shop=shop, time_range=time_range, **options)
+    except TypeError:
+        # Backwards-compat if some metrics ignore time_range
+        payload = metric_func(shop=shop)
+
+    return {
+        "key": key,
+        "dataSourceType": "metric",
+        "meta": {
+            "shopId": getattr(shop, "id", None),
+            "timeRange": time_range,
+        },
+        "payload": payload,
+    }
+
+
 class AnalyticsMetricView(APIView):
     """
     Generic entry point for metric-style analytics.
@@ -47,8 +98,7 @@ class AnalyticsMetricView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        metric_func = METRIC_REGISTRY.get(key)
-        if metric_func is None:
+        if key not in METRIC_REGISTRY:
             return Response(
                 {"detail": f"Unknown metric key '{key}'."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -61,23 +111,42 @@ class AnalyticsMetricView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Capability hook: not strictly enforcing yet, but ready.
-        required_caps = METRIC_CAPABILITIES.get(key, [])
-        # TODO: wire real user capability checks here later.
-
-        try:
-            payload = metric_func(shop=shop, time_range=time_range)
-        except TypeError:
-            # Backwards-compat if some metrics ignore time_range
-            payload = metric_func(shop=shop)
-
-        response_data = {
-            "key": key,
-            "dataSourceType": "metric",
-            "meta": {
-                "shopId": getattr(shop, "id", None),
-                "timeRange": time_range,
-            },
-            "payload": payload,
+        options = metric_options(key, request.query_params)
+        return Response(metric_response(key, shop, time_range, options), status=status.HTTP_200_OK)
+
+
+async def analytics_metrics_async(request):
+    """
+    ASGI-native AnalyticsMetricView.
+
+    ?key=<key> answers exactly like the sync view. ?keys=a,b,c computes several
+    metrics concurrently (one dashboard load, one request) and returns the
+    envelopes as a list in request order.
+    """
+    user = await sync_to_async(authenticate_jwt)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    single = request.GET.get("key")
+    keys = [single] if single else parse_field_list(request.GET.get("keys"))
+    time_range = request.GET.get("time_range") or "30d"
+
+    if not keys:
+        return JsonResponse({"detail": "Metric key 'key' is required."}, status=400)
+    unknown = [key for key in keys if key not in METRIC_REGISTRY]
+    if unknown:
+        return JsonResponse({"detail": f"Unknown metric key '{unknown[0]}'."}, status=400)
+
+    shop = await sync_to_async(get_shop_for_user)(user)
+    if shop is None:
+        return JsonResponse({"detail": "No shop configured for current user."}, status=400)
+
+    results = await gather_in_threads(
+        {
+            key: partial(metric_response, key, shop, time_range, metric_options(key, request.GET))
+            for key in dict.fromkeys(keys)
         }
-        return Response(response_data, status=status.HTTP_200_OK)
\ No newline at end of file
+    )
+    if single:
+        return JsonResponse(results[single], encoder=JSONEncoder)
+    return JsonResponse([results[key] for key in keys], safe=False, encoder=JSONEncoder)
@@ -1,7 +1,7 @@
 # backend/config/admin.py
 from django.contrib import admin
 
-from .models import ShopConfig, IntegrationConfig
+from .models import BackfillCheckpoint, ChangeVersion, ShopConfig, IntegrationConfig
 
 
 @admin.register(ShopConfig)
@@ -30,3 +30,17 @@ class IntegrationConfigAdmin(admin.ModelAdmin):
     list_filter = ("shop", "provider", "is_active")
     search_fields = ("name",)
     autocomplete_fields = ("shop",)
+
+
+@admin.register(ChangeVersion)
+class ChangeVersionAdmin(admin.ModelAdmin):
+    list_display = ("shop", "model_label", "version")
+    list_filter = ("shop",)
+    search_fields = ("model_label",)
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("name", "scope", "last_id", "processed", "updated_at", "finished_at")
+    list_filter = ("name",)
+    search_fields = ("name", "scope")
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class ConfigConfig(AppConfig):
     name = 'config'
+
+    def ready(self):
+        from makerfex_backend.versions import track_timestamped_models
+
+        # Per-shop change versions for every TimeStampedModel (see makerfex_backend/versions.py).
+        track_timestamped_models()
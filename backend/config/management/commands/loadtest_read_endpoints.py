@@ -0,0 +1,144 @@
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    "/api/search/?q=walnut",
+    "/api/search/?q=board status:active",
+    "/api/analytics/metrics/?key=projects.wip_by_stage",
+    "/api/analytics/metrics/?key=projects.throughput_30d",
+]
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the read-heavy endpoints against one or more running deployments "
+        "(e.g. the same build under a WSGI and an ASGI server) and compare latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            help="NAME=BASE_URL of a running deployment, e.g. wsgi=http://127.0.0.1:8000 (repeatable).",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            default=[],
+            help="Path (with query string) to request; repeatable. Defaults to search + metrics samples.",
+        )
+        parser.add_argument("--token", default="", help="JWT access token (skips the token request).")
+        parser.add_argument("--username", default="demouser", help="User to obtain a JWT for.")
+        parser.add_argument("--password", default="demo1234", help="Password for --username.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per path and target.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per path first.")
+        parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+
+    def handle(self, *args, **opts):
+        targets = []
+        for raw in opts["target"]:
+            name, sep, base_url = raw.partition("=")
+            if not sep or not base_url:
+                raise CommandError(f"--target must look like NAME=BASE_URL (got '{raw}').")
+            targets.append((name, base_url.rstrip("/")))
+
+        paths = opts["path"] or DEFAULT_PATHS
+        concurrency = max(1, opts["concurrency"])
+        total = max(1, opts["requests"])
+
+        rows = []
+        for name, base_url in targets:
+            token = opts["token"] or self._obtain_token(base_url, opts)
+            headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+
+            for path in paths:
+                url = base_url + path.replace(" ", "%20")
+                fetch = lambda _: self._timed_get(url, headers, opts["timeout"])  # noqa: E731
+
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    list(pool.map(fetch, range(max(0, opts["warmup"]))))
+                    started = time.perf_counter()
+                    samples = list(pool.map(fetch, range(total)))
+                    elapsed = time.perf_counter() - started
+
+                latencies = sorted(ms for ms, ok in samples if ok)
+                rows.append(
+                    {
+                        "target": name,
+                        "path": path,
+                        "ok": len(latencies),
+                        "errors": total - len(latencies),
+                        "p50": percentile(latencies, 50),
+                        "p95": percentile(latencies, 95),
+                        "p99": percentile(latencies, 99),
+                        "rps": total / elapsed if elapsed else 0.0,
+                    }
+                )
+
+        self._report(rows, [name for name, _ in targets])
+        self.stdout.write(self.style.SUCCESS("loadtest_read_endpoints complete"))
+
+    def _obtain_token(self, base_url, opts):
+        body = json.dumps({"username": opts["username"], "password": opts["password"]}).encode()
+        request = Request(
+            f"{base_url}/api/accounts/token/",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urlopen(request, timeout=opts["timeout"]) as resp:
+                return json.loads(resp.read())["access"]
+        except (HTTPError, URLError, KeyError, ValueError) as exc:
+            raise CommandError(f"Could not obtain a token from {base_url}: {exc}")
+
+    def _timed_get(self, url, headers, timeout):
+        started = time.perf_counter()
+        try:
+            with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+                resp.read()
+                ok = resp.status == 200
+        except (HTTPError, URLError, OSError):
+            ok = False
+        return (time.perf_counter() - started) * 1000, ok
+
+    def _report(self, rows, target_names):
+        self.stdout.write(
+            f"{'target':<10} {'ok':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}  path"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['target']:<10} {row['ok']:>6} {row['errors']:>5} {row['p50']:>9.1f} "
+                f"{row['p95']:>9.1f} {row['p99']:>9.1f} {row['rps']:>8.1f}  {row['path']}"
+            )
+
+        if len(target_names) < 2:
+            return
+        baseline = target_names[0]
+        p95 = {(row["target"], row["path"]): row["p95"] for row in rows}
+        self.stdout.write(f"\np95 relative to '{baseline}':")
+        for name in target_names[1:]:
+            for row in rows:
+                if row["target"] != name:
+                    continue
+                base = p95.get((baseline, row["path"])) or 0.0
+                change = f"{(row['p95'] - base) / base * 100:+.1f}%" if base else "n/a"
+                self.stdout.write(f"  {name:<10} {change:>8}  {row['path']}")
@@ -0,0 +1,73 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from makerfex_backend.profiling import FOLDED_SUFFIX, PROFILE_SUFFIX, profile_dir
+
+
+def read_folded(path: Path) -> Counter:
+    stacks = Counter()
+    for line in path.read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge saved request profiles (see makerfex_backend/profiling.py) into one flame-graph "
+        "folded file and report the hottest frames and the slowest SQL with its plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default="", help="Profile directory (default: REQUEST_PROFILING_DIR).")
+        parser.add_argument("--route", default="", help="Only profiles of this route, e.g. GlobalSearchView.get.")
+        parser.add_argument("--output", default="", help="Merged folded file (default: <dir>/merged.folded).")
+        parser.add_argument("--top", type=int, default=10, help="Hot frames / slow statements to list.")
+
+    def handle(self, *args, **opts):
+        directory = Path(opts["dir"]) if opts["dir"] else profile_dir()
+        if not directory.is_dir():
+            raise CommandError(f"No profile directory at {directory}.")
+
+        reports = []
+        stacks = Counter()
+        for path in sorted(directory.glob(f"*{PROFILE_SUFFIX}")):
+            report = json.loads(path.read_text())
+            if opts["route"] and report.get("route", report.get("name")) != opts["route"]:
+                continue
+            reports.append(report)
+            folded = path.with_suffix(FOLDED_SUFFIX)
+            if folded.exists():
+                stacks.update(read_folded(folded))
+
+        if not reports:
+            raise CommandError("No matching profiles.")
+
+        output = Path(opts["output"]) if opts["output"] else directory / "merged.folded"
+        output.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+
+        total_samples = sum(stacks.values())
+        self.stdout.write(self.style.SUCCESS(f"Merged {len(reports)} profile(s), {total_samples} samples -> {output}"))
+
+        # Self time: samples whose leaf is the frame.
+        leaves = Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        self.stdout.write("\nHot frames (self samples):")
+        for frame, count in leaves.most_common(opts["top"]):
+            self.stdout.write(f"  {count:>6}  {100 * count / total_samples:5.1f}%  {frame}")
+
+        slowest = sorted(
+            (dict(statement, profile=report["id"]) for report in reports for statement in report.get("slowest_sql", [])),
+            key=lambda statement: statement["ms"],
+            reverse=True,
+        )[: opts["top"]]
+        self.stdout.write("\nSlowest SQL:")
+        for statement in slowest:
+            self.stdout.write(f"  {statement['ms']:.1f}ms  [{statement['profile']}]  {statement['sql']}")
+            for line in statement.get("plan") or []:
+                self.stdout.write(f"      {line}")
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-19 16:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('config', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text="Lower-cased app_label.model_name, e.g. 'projects.project'.", max_length=100)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('shop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_versions', to='accounts.shop')),
+            ],
+            options={
+                'unique_together': {('shop', 'model_label')},
+            },
+        ),
+    ]
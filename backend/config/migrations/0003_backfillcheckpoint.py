@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-19 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0002_changeversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Backfill name, e.g. 'projects.station'.", max_length=100)),
+                ('scope', models.CharField(help_text="'all', or 'shop:<id>' for a per-shop partition.", max_length=50)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('processed', models.PositiveBigIntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['name', 'scope'],
+                'unique_together': {('name', 'scope')},
+            },
+        ),
+    ]
@@ -102,3 +102,65 @@ class IntegrationConfig(TimeStampedModel):
 
     def __str__(self):
         return f"{self.get_provider_display()} - {self.name} ({self.shop.slug})"
+
+
+class ChangeVersion(models.Model):
+    """
+    Monotonic per-(shop, model) change counter.
+
+    Bumped (after commit) whenever a tracked row is saved or deleted; read by
+    conditional GET support to build ETags without touching the data tables.
+    See makerfex_backend/versions.py.
+
+    Deliberately not a TimeStampedModel: it is bookkeeping, not domain data.
+    """
+    shop = models.ForeignKey(
+        Shop,
+        on_delete=models.CASCADE,
+        related_name="change_versions",
+    )
+    model_label = models.CharField(
+        max_length=100,
+        help_text="Lower-cased app_label.model_name, e.g. 'projects.project'.",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("shop", "model_label")
+
+    def __str__(self):
+        return f"{self.model_label}@{self.version} ({self.shop_id})"
+
+
+class BackfillCheckpoint(models.Model):
+    """
+    Progress of one backfill command over one scope ("all" or "shop:<id>").
+
+    Advanced in the same transaction as each chunk the backfill commits, so an
+    interrupted run resumes right after the last committed chunk. See
+    makerfex_backend/backfill.py.
+
+    Bookkeeping like ChangeVersion, so not a TimeStampedModel either.
+    """
+    name = models.CharField(
+        max_length=100,
+        help_text="Backfill name, e.g. 'projects.station'.",
+    )
+    scope = models.CharField(
+        max_length=50,
+        help_text="'all', or 'shop:<id>' for a per-shop partition.",
+    )
+    last_id = models.BigIntegerField(default=0)
+    processed = models.PositiveBigIntegerField(default=0)
+
+    started_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("name", "scope")
+        ordering = ["name", "scope"]
+
+    def __str__(self):
+        state = "done" if self.finished_at else f"after id {self.last_id}"
+        return f"{self.name} [{self.scope}] {state}"
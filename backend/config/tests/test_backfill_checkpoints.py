@@ -0,0 +1,91 @@
+# backend/config/tests/test_backfill_checkpoints.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from config.models import BackfillCheckpoint
+from makerfex_backend.backfill import map_in_processes
+from projects.management.commands import backfill_project_final_stage
+from projects.models import Project, ProjectStageTransition
+
+
+@pytest.fixture
+def unstaged_completed(demo_data):
+    """
+    Completed demo projects knocked out of their final stage.
+    """
+    completed = Project.objects.filter(status=Project.Status.COMPLETED, workflow__isnull=False)
+    ids = list(completed.order_by("id").values_list("id", flat=True))
+    assert len(ids) >= 3
+    completed.update(current_stage=None)
+    return ids
+
+
+@pytest.mark.django_db
+def test_interrupted_backfill_resumes_from_checkpoint(unstaged_completed, monkeypatch):
+    ids = unstaged_completed
+    original = backfill_project_final_stage.Command.process_chunk
+    calls = []
+
+    def flaky(self, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return original(self, rows)
+
+    monkeypatch.setattr(backfill_project_final_stage.Command, "process_chunk", flaky)
+    with pytest.raises(RuntimeError):
+        call_command("backfill_project_final_stage", "--batch-size", "2", stdout=StringIO())
+
+    # The first chunk (and its checkpoint) committed; the second rolled back.
+    checkpoint = BackfillCheckpoint.objects.get(name="projects.final_stage", scope="all")
+    assert (checkpoint.last_id, checkpoint.processed, checkpoint.finished_at) == (ids[1], 2, None)
+    assert Project.objects.filter(id__in=ids, current_stage__isnull=True).count() == len(ids) - 2
+
+    monkeypatch.setattr(backfill_project_final_stage.Command, "process_chunk", original)
+    out = StringIO()
+    call_command("backfill_project_final_stage", "--batch-size", "2", stdout=out)
+
+    assert f"resuming after id {ids[1]}" in out.getvalue()
+    assert f"Processed: {len(ids) - 2}" in out.getvalue()
+    checkpoint.refresh_from_db()
+    assert checkpoint.finished_at is not None and checkpoint.processed == len(ids)
+    assert not Project.objects.filter(id__in=ids, current_stage__is_final=False).exists()
+    assert not Project.objects.filter(id__in=ids, current_stage__isnull=True).exists()
+
+    # The repaired moves are logged at completion time.
+    project = Project.objects.filter(id__in=ids, completed_at__isnull=False).first()
+    move = ProjectStageTransition.objects.filter(project=project).latest("id")
+    assert (move.to_stage_id, move.entered_at) == (project.current_stage_id, project.completed_at)
+
+
+@pytest.mark.django_db
+def test_finished_or_dry_runs_start_over(unstaged_completed):
+    call_command("backfill_project_final_stage", "--dry-run", stdout=StringIO())
+    assert not BackfillCheckpoint.objects.exists()
+    assert Project.objects.filter(id__in=unstaged_completed, current_stage__isnull=True).count() == len(unstaged_completed)
+
+    call_command("backfill_project_final_stage", stdout=StringIO())
+    Project.objects.filter(id=unstaged_completed[0]).update(current_stage=None)
+
+    out = StringIO()
+    call_command("backfill_project_final_stage", stdout=out)
+    assert "resuming" not in out.getvalue()
+    assert "Processed: 1" in out.getvalue()
+
+
+
+@pytest.mark.django_db
+def test_workers_on_sqlite_run_in_process(unstaged_completed):
+    warnings = []
+    results = map_in_processes(abs, [-1, -2, 3], workers=4, warn=warnings.append)
+    assert list(results) == [1, 2, 3]
+    assert len(warnings) == 1 and warnings[0].startswith("SQLite:")
+
+    out = StringIO()
+    call_command("backfill_project_final_stage", "--workers", "4", stdout=out)
+    assert f"Processed: {len(unstaged_completed)}" in out.getvalue()
+    shop_ids = set(Project.objects.filter(id__in=unstaged_completed).values_list("shop_id", flat=True))
+    scopes = set(BackfillCheckpoint.objects.filter(name="projects.final_stage").values_list("scope", flat=True))
+    assert scopes == {f"shop:{shop_id}" for shop_id in shop_ids}
@@ -0,0 +1,100 @@
+# backend/config/tests/test_change_versions.py
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from accounts.models import Shop
+from inventory.models import Consumable, InventoryTransaction
+from inventory.services import apply_inventory_transaction
+from makerfex_backend.versions import bump_versions, get_tracked_models, get_versions
+from sales.models import SalesOrder, SalesOrderLine
+
+
+def test_timestamped_models_are_tracked_with_shop_paths():
+    tracked = get_tracked_models()
+    assert tracked["projects.project"] == "shop_id"
+    assert tracked["accounts.shop"] == "pk"
+    assert tracked["workflows.workflowstage"] == "workflow.shop_id"
+    assert tracked["sales.salesorderline"] == "shop_id"
+    assert "config.changeversion" not in tracked
+
+
+@pytest.mark.django_db
+def test_saves_bump_versions_after_commit(django_capture_on_commit_callbacks, django_assert_num_queries):
+    shop = Shop.objects.create(name="V", slug="versions-shop")
+    with django_capture_on_commit_callbacks(execute=True):
+        order = SalesOrder.objects.create(shop=shop)
+        SalesOrderLine.objects.create(order=order, description="Bowl", unit_price=Decimal("40.00"))
+        SalesOrderLine.objects.create(order=order, description="Board", unit_price=Decimal("80.00"))
+
+    with django_assert_num_queries(1):
+        versions = get_versions(shop.id, [SalesOrder, SalesOrderLine, "tasks.task"])
+    assert versions == {"sales.salesorder": 1, "sales.salesorderline": 2, "tasks.task": 0}
+
+
+@pytest.mark.django_db
+def test_inventory_transactions_bump_item_versions(django_capture_on_commit_callbacks):
+    shop = Shop.objects.create(name="I", slug="inventory-versions")
+    glue = Consumable.objects.create(shop=shop, name="Glue", quantity_on_hand=Decimal("10"))
+    before = get_versions(shop.id, [Consumable, InventoryTransaction])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        apply_inventory_transaction(
+            shop=shop,
+            inventory_type="consumable",
+            inventory_id=glue.id,
+            quantity_delta=Decimal("-1"),
+            reason=InventoryTransaction.Reason.CONSUME,
+            optimistic=True,
+        )
+
+    after = get_versions(shop.id, [Consumable, InventoryTransaction])
+    assert after["inventory.consumable"] == before["inventory.consumable"] + 1
+    assert after["inventory.inventorytransaction"] == before["inventory.inventorytransaction"] + 1
+
+
+@pytest.mark.django_db
+def test_cache_store_is_monotonic_across_eviction(settings, django_capture_on_commit_callbacks):
+    settings.CHANGE_VERSIONS_CACHE = "default"
+    cache.clear()
+    shop = Shop.objects.create(name="C", slug="cache-versions")
+
+    seeded = get_versions(shop.id, ["tasks.task"])["tasks.task"]
+    assert seeded > 0
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_versions(shop.id, "tasks.task")
+    assert get_versions(shop.id, ["tasks.task"])["tasks.task"] == seeded + 1
+
+    cache.clear()
+    assert get_versions(shop.id, ["tasks.task"])["tasks.task"] > seeded + 1
+
+
+@pytest.mark.django_db
+def test_parent_scoped_models_resolve_shop_once_per_parent(django_capture_on_commit_callbacks):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from makerfex_backend import versions
+    from workflows.models import Workflow, WorkflowStage
+
+    shop = Shop.objects.create(name="P", slug="parent-versions")
+    workflow = Workflow.objects.create(shop=shop, name="Flow")
+    for order in range(5):
+        WorkflowStage.objects.create(workflow_id=workflow.id, name=f"Stage {order}", order=order)
+    before = get_versions(shop.id, [WorkflowStage])["workflows.workflowstage"]
+    versions._parent_shops.clear()
+
+    # Parent not loaded on the instances: one lookup for all five saves.
+    stages = list(WorkflowStage.objects.filter(workflow=workflow))
+    with django_capture_on_commit_callbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+        for stage in stages:
+            stage.save()
+    parent_reads = [q for q in ctx.captured_queries if 'FROM "workflows_workflow"' in q["sql"]]
+    assert len(parent_reads) == 1
+    assert get_versions(shop.id, [WorkflowStage])["workflows.workflowstage"] == before + len(stages)
+
+    # Cascade delete: no per-stage parent reads.
+    with django_capture_on_commit_callbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+        workflow.delete()
+    assert not any('FROM "workflows_workflow"' in q["sql"] and "SELECT" in q["sql"] for q in ctx.captured_queries)
@@ -0,0 +1,103 @@
+# backend/config/tests/test_query_budget.py
+from decimal import Decimal
+
+import pytest
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+
+from accounts.models import Employee
+from inventory.models import InventoryTransaction, Material
+from inventory.services import apply_inventory_transaction
+from makerfex_backend.query_budget import QueryBudgetExceeded, duplicate_report, normalize_sql
+from projects.views import ProjectViewSet
+from workflows.models import Workflow
+
+
+def test_duplicate_report_groups_n_plus_one_patterns():
+    statements = [
+        'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (%s, %s, %s)',
+        'SELECT "b"."id" FROM "b" WHERE "b"."id" = %s',
+        'SELECT "b"."id" FROM "b" WHERE "b"."id" = %s',
+        'SELECT "b"."id"  FROM "b" WHERE "b"."id" = %s',
+        'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (%s)',
+    ]
+
+    assert normalize_sql(statements[0]) == 'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...)'
+    assert duplicate_report(statements) == [
+        (3, 'SELECT "b"."id" FROM "b" WHERE "b"."id" = %s'),
+        (2, 'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...)'),
+    ]
+
+
+@pytest.mark.django_db
+def test_request_over_budget_raises_with_report(auth_client, monkeypatch):
+    # Budgeted action within budget: passes (the suite runs in "raise" mode).
+    assert auth_client.get("/api/projects/?page_size=100").status_code == 200
+
+    monkeypatch.setattr(ProjectViewSet, "query_budgets", {"list": 2})
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        auth_client.get("/api/projects/?page_size=100")
+
+    message = str(excinfo.value)
+    assert "ProjectViewSet.list" in message
+    assert "(budget 2)" in message
+
+
+@pytest.mark.django_db
+def test_warn_mode_logs_instead_of_failing(auth_client, monkeypatch, settings, caplog):
+    settings.QUERY_BUDGET_MODE = "warn"
+    monkeypatch.setattr(ProjectViewSet, "query_budgets", {"list": 2})
+
+    with caplog.at_level("WARNING", logger="makerfex_backend.query_budget"):
+        assert auth_client.get("/api/projects/").status_code == 200
+    assert "ProjectViewSet.list" in caplog.text
+
+
+def _url_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def _budgeted_list_routes() -> dict:
+    """
+    {list route name: viewset} for every routed viewset declaring query_budgets.
+    """
+    routes = {}
+    for pattern in _url_patterns(get_resolver().url_patterns):
+        viewset = getattr(pattern.callback, "cls", None)
+        if getattr(viewset, "query_budgets", None) and (pattern.name or "").endswith("-list"):
+            routes[pattern.name] = viewset
+    return routes
+
+
+@pytest.mark.django_db
+def test_budgeted_viewsets_list_and_retrieve_within_budget(auth_client):
+    # The demo seed writes no ledger rows; give the ledger one to page and retrieve.
+    employee = Employee.objects.select_related("shop").get(user__username="demouser")
+    material = Material.objects.filter(shop=employee.shop).first()
+    apply_inventory_transaction(
+        shop=employee.shop,
+        inventory_type="material",
+        inventory_id=material.id,
+        quantity_delta=Decimal("1"),
+        reason=InventoryTransaction.Reason.ADJUSTMENT,
+    )
+
+    routes = _budgeted_list_routes()
+    assert "inventorytransaction-list" in routes
+    for name, viewset in routes.items():
+        resp = auth_client.get(reverse(name), {"page_size": 100})
+        assert resp.status_code == 200, name
+        rows = resp.data["results"] if isinstance(resp.data, dict) else resp.data
+        assert rows, f"{name} returned no rows to retrieve"
+
+        detail = reverse(name.removesuffix("-list") + "-detail", kwargs={"pk": rows[0]["id"]})
+        assert resolve(detail).func.cls is viewset, detail
+        assert auth_client.get(detail).status_code == 200, detail
+
+    # Budgeted extra actions.
+    workflow = Workflow.objects.filter(shop=employee.shop).first()
+    assert auth_client.get(f"/api/workflows/{workflow.id}/board/").status_code == 200
+    assert auth_client.get("/api/accounts/employees/me/").status_code == 200
@@ -0,0 +1,35 @@
+# backend/config/tests/test_request_profiling.py
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_profiled_route_writes_stacks_sql_and_plans(auth_client, settings, tmp_path):
+    settings.REQUEST_PROFILING_DIR = tmp_path
+    settings.REQUEST_PROFILING_ROUTES = ["ProjectViewSet.list"]
+    settings.REQUEST_PROFILING_INTERVAL_MS = 1
+
+    assert "X-Profile-Id" not in auth_client.get("/api/customers/")
+    resp = auth_client.get("/api/projects/?page_size=100&access_token=not-for-disk")
+    assert resp.status_code == 200
+
+    profile_id = resp["X-Profile-Id"]
+    raw = (tmp_path / f"{profile_id}.json").read_text()
+    assert "not-for-disk" not in raw
+    report = json.loads(raw)
+    assert (report["route"], report["path"]) == ("ProjectViewSet.list", "/api/projects/")
+    # Stack samples depend on timing; the SQL side is deterministic.
+    assert report["query_count"] > 0
+    assert report["query_count"] == sum(group["count"] for group in report["sql"])
+    assert any("projects_project" in group["sql"] for group in report["sql"])
+    assert report["slowest_sql"][0]["plan"]
+    assert (tmp_path / f"{profile_id}.folded").exists()
+
+    out = StringIO()
+    call_command("profile_report", dir=str(tmp_path), route="ProjectViewSet.list", stdout=out)
+    assert "Merged 1 profile(s)" in out.getvalue()
+    assert "Slowest SQL:" in out.getvalue()
+    assert (tmp_path / "merged.folded").exists()
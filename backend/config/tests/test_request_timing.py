@@ -0,0 +1,43 @@
+# backend/config/tests/test_request_timing.py
+import pytest
+
+from accounts.models import User
+from makerfex_backend.timing import route_timings
+
+
+@pytest.fixture
+def fresh_timings():
+    route_timings.reset()
+    yield route_timings
+    route_timings.reset()
+
+
+@pytest.mark.django_db
+def test_server_timing_header_breaks_down_request(auth_client):
+    resp = auth_client.get("/api/customers/")
+    assert resp.status_code == 200
+
+    metrics = {part.strip().split(";")[0]: part for part in resp["Server-Timing"].split(",")}
+    assert {"db", "tenant", "serialize", "total"} <= set(metrics)
+    assert 'queries"' in metrics["db"]
+
+
+@pytest.mark.django_db
+def test_route_percentiles_are_staff_only(auth_client, fresh_timings):
+    for _ in range(3):
+        auth_client.get("/api/customers/")
+    auth_client.get("/api/customers/?q=zzz")
+
+    User.objects.filter(username="demouser").update(is_staff=False)
+    assert auth_client.get("/api/perf/timings/").status_code == 403
+
+    User.objects.filter(username="demouser").update(is_staff=True)
+    data = auth_client.get("/api/perf/timings/").data
+    route = data["routes"]["CustomerViewSet.list"]
+    assert route["count"] == 4
+    assert route["total_ms"]["p50"] <= route["total_ms"]["p95"] <= route["total_ms"]["max"]
+    assert route["queries"]["max"] >= 1
+
+    assert auth_client.delete("/api/perf/timings/").status_code == 204
+    # Only the DELETE itself, recorded after the reset.
+    assert list(fresh_timings.snapshot()) == ["RequestTimingsView.delete"]
@@ -0,0 +1,141 @@
+# backend/config/tests/test_search_deadline.py
+import threading
+import time
+
+import pytest
+
+from makerfex_backend import search
+
+
+def _item(kind, pk):
+    return {"id": pk, "type": kind, "label": f"{kind} {pk}", "subtitle": "", "url": f"/{kind}s/{pk}/"}
+
+
+@pytest.fixture
+def slow_projects(monkeypatch, settings):
+    """
+    Categories that don't touch the DB (pool threads can't see the test
+    transaction); "projects" stalls like a huge description__icontains scan.
+    """
+    settings.SEARCH_DEADLINE_MS = 100
+    release = threading.Event()
+
+    def slow(params):
+        release.wait(5)
+        return [_item("project", 1)]
+
+    monkeypatch.setattr(
+        search,
+        "SEARCH_CATEGORIES",
+        {
+            "customers": lambda params: [_item("customer", 7)],
+            "projects": slow,
+            "workflows": lambda params: [_item("workflow", 3)],
+        },
+    )
+    yield
+    release.set()
+
+
+@pytest.mark.django_db
+def test_slow_category_is_dropped_at_deadline(auth_client, slow_projects):
+    started = time.monotonic()
+    resp = auth_client.get("/api/search/", {"q": "walnut"})
+    elapsed = time.monotonic() - started
+
+    assert resp.status_code == 200
+    assert [item["type"] for item in resp.data] == ["customer", "workflow"]
+    assert resp["X-Search-Partial"] == "projects"
+    assert elapsed < 2
+
+
+@pytest.mark.django_db
+def test_no_partial_header_when_every_category_finishes(auth_client, settings, monkeypatch):
+    settings.SEARCH_DEADLINE_MS = 1000
+    monkeypatch.setattr(search, "SEARCH_CATEGORIES", {"customers": lambda params: [_item("customer", 7)]})
+
+    resp = auth_client.get("/api/search/", {"q": "customer"})
+    assert resp.status_code == 200
+    assert [item["id"] for item in resp.data] == [7]
+    assert "X-Search-Partial" not in resp
+
+
+@pytest.fixture
+def pool_connections(monkeypatch):
+    """
+    Persistent, health-checked connections, with close() recorded (the
+    in-memory test database ignores it anyway).
+    """
+    from django.db import connections
+
+    monkeypatch.setitem(connections.settings["default"], "CONN_MAX_AGE", 60)
+    monkeypatch.setitem(connections.settings["default"], "CONN_HEALTH_CHECKS", True)
+    closed = []
+    monkeypatch.setattr(type(connections["default"]), "close", lambda self: closed.append(self.alias))
+    return closed
+
+
+def _open_connection():
+    from django.db import connection
+
+    with connection.cursor() as cursor:  # runs the health check, like a query would
+        cursor.execute("SELECT 1")
+    return connection.connection
+
+
+@pytest.mark.django_db
+def test_pool_threads_keep_their_connection_between_calls(pool_connections):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.db import connection
+
+    from makerfex_backend.async_views import pooled_connections
+
+    def fail():
+        connection.ensure_connection()
+        raise RuntimeError("category failed")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(pooled_connections(_open_connection)).result()
+        assert pool.submit(pooled_connections(_open_connection)).result() is first
+        assert pool_connections == []
+
+        with pytest.raises(RuntimeError):
+            pool.submit(pooled_connections(fail)).result()
+        assert pool_connections == ["default"]
+
+
+@pytest.mark.django_db
+def test_pool_threads_recycle_stale_connections(pool_connections, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.db import connections
+
+    from makerfex_backend.async_views import pooled_connections
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(pooled_connections(_open_connection)).result()
+
+        # The server dropped the idle connection: the next call replaces it.
+        monkeypatch.setattr(type(connections["default"]), "is_usable", lambda self: False)
+        pool.submit(pooled_connections(_open_connection)).result()
+        assert pool_connections == ["default"]
+
+
+
+@pytest.mark.django_db
+def test_pool_threads_drop_expired_connections(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.db import connections
+
+    from makerfex_backend.async_views import pooled_connections
+
+    # Default CONN_MAX_AGE = 0: the previous call's connection has expired.
+    closed = []
+    monkeypatch.setattr(type(connections["default"]), "close", lambda self: closed.append(self.alias))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(pooled_connections(_open_connection)).result()
+        assert closed == []
+        pool.submit(pooled_connections(_open_connection)).result()
+        assert closed == ["default"]
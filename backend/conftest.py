@@ -4,6 +4,15 @@ from django.core.management import call_command
 from rest_framework.test import APIClient
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """
+    Fail any request that runs more queries than its view's declared budget
+    (see makerfex_backend/query_budget.py).
+    """
+    settings.QUERY_BUDGET_MODE = "raise"
+
+
 @pytest.fixture
 def demo_data(db):
     """
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class CustomersConfig(AppConfig):
     name = 'customers'
+
+    def ready(self):
+        from customers.stats import connect_customer_stats
+
+        # Keep CustomerStats current on Project / SalesOrder writes (see customers/stats.py).
+        connect_customer_stats()
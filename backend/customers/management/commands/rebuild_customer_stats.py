@@ -0,0 +1,21 @@
+from customers.models import Customer
+from customers.stats import refresh_customer_stats
+from makerfex_backend.backfill import BackfillCommand
+
+
+class Command(BackfillCommand):
+    help = (
+        "Recompute CustomerStats (project count, order count, lifetime revenue, last order date) "
+        "for every customer. Chunked and resumable; each chunk is two grouped queries and one upsert."
+    )
+
+    backfill_name = "customers.stats"
+    success_message = "Customer stats rebuilt"
+    default_batch_size = 500
+    report_labels = {"updated": "Would write / Written"}
+
+    def get_queryset(self):
+        return Customer.objects.only("id", "shop_id")
+
+    def process_chunk(self, rows) -> dict:
+        return {"updated": refresh_customer_stats(customer.id for customer in rows)}
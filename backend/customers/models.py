@@ -62,3 +62,32 @@ class Customer(TimeStampedModel):
   def __str__(self):
     name = f"{self.first_name} {self.last_name}".strip()
     return f"{name} ({self.shop.slug})"
+
+
+class CustomerStats(models.Model):
+  """
+  Per-customer aggregates over projects and sales orders, so customer tables
+  can sort on them without joining and grouping Project / SalesOrder.
+
+  Kept current by customers/stats.py (signals on Project and SalesOrder
+  writes, in the writer's transaction); `manage.py rebuild_customer_stats`
+  recomputes them from scratch. A customer without a row has no projects or
+  orders yet.
+  """
+
+  customer = models.OneToOneField(
+    Customer,
+    on_delete=models.CASCADE,
+    primary_key=True,
+    related_name="stats",
+  )
+  project_count = models.PositiveIntegerField(default=0)
+  # Orders that happened: everything but drafts and cancellations.
+  order_count = models.PositiveIntegerField(default=0)
+  # Sum of paid orders' total_amount.
+  lifetime_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+  last_order_date = models.DateField(null=True, blank=True)
+  updated_at = models.DateTimeField(auto_now=True)
+
+  def __str__(self):
+    return f"Stats for customer {self.customer_id}"
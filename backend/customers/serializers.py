@@ -1,12 +1,20 @@
 # backend/customers/serializers.py
 from rest_framework import serializers
+
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
 from .models import Customer
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     photo_url = serializers.SerializerMethodField()
 
+    # CustomerStats aggregates, annotated by CustomerViewSet (absent on writes).
+    project_count = serializers.IntegerField(read_only=True)
+    order_count = serializers.IntegerField(read_only=True)
+    lifetime_revenue = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    last_order_date = serializers.DateField(read_only=True)
+
     class Meta:
         model = Customer
         fields = [
@@ -29,10 +37,18 @@ class CustomerSerializer(serializers.ModelSerializer):
             "is_vip",
             "notes",
             "source",
+            "project_count",
+            "order_count",
+            "lifetime_revenue",
+            "last_order_date",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "photo_url", "name"]
+        field_dependencies = {
+            "name": ["first_name", "last_name", "company_name"],
+            "photo_url": ["photo"],
+        }
 
     def get_name(self, obj):
         # Full display name (safe, presentation-focused)
@@ -0,0 +1,125 @@
+# backend/customers/stats.py
+"""
+Maintenance of CustomerStats (see customers/models.py).
+
+Rows are recomputed, not patched with deltas: refresh_customer_stats(ids)
+re-aggregates those customers' projects and orders in two grouped queries and
+upserts the results. Deltas would need the previous values of every changed
+field (status, total, customer, order date); recomputing a handful of
+customers is just as cheap and can't drift.
+
+connect_customer_stats() (called from CustomersConfig.ready) hooks Project and
+SalesOrder writes and refreshes, inside the writer's transaction, only the
+writes that can move a customer's numbers: a project created, deleted or
+given another customer; an order created, deleted or with a new customer,
+status, total_amount or order_date (previous values come from
+makerfex_backend/previous_values.py). A customer change refreshes the
+previous customer too. Bulk writes (bulk_create, queryset.update() of those
+fields) skip signals and must call refresh_customer_stats() or
+refresh_shop_customer_stats().
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.signals import post_delete, post_save
+
+from customers.models import Customer, CustomerStats
+from makerfex_backend.previous_values import has_changed, previous_values, track_previous_values
+from projects.models import Project
+from sales.models import NON_BOOKED_ORDER_STATUSES, REVENUE_ORDER_STATUSES, SalesOrder
+
+STATS_FIELDS = ["project_count", "order_count", "lifetime_revenue", "last_order_date", "updated_at"]
+
+
+def compute_customer_stats(customer_ids) -> list[CustomerStats]:
+    """
+    Unsaved CustomerStats for each existing customer in customer_ids.
+    """
+    ids = list(Customer.objects.filter(id__in=set(customer_ids)).values_list("id", flat=True))
+    if not ids:
+        return []
+
+    project_counts = dict(
+        Project.objects.filter(customer_id__in=ids)
+        .order_by()
+        .values("customer_id")
+        .annotate(n=Count("id"))
+        .values_list("customer_id", "n")
+    )
+    orders = {
+        row["customer_id"]: row
+        for row in SalesOrder.objects.filter(customer_id__in=ids)
+        .exclude(status__in=NON_BOOKED_ORDER_STATUSES)
+        .order_by()
+        .values("customer_id")
+        .annotate(
+            n=Count("id"),
+            revenue=Sum("total_amount", filter=Q(status__in=REVENUE_ORDER_STATUSES)),
+            last=Max("order_date"),
+        )
+    }
+
+    stats = []
+    for customer_id in ids:
+        order_row = orders.get(customer_id, {})
+        stats.append(
+            CustomerStats(
+                customer_id=customer_id,
+                project_count=project_counts.get(customer_id, 0),
+                order_count=order_row.get("n", 0),
+                lifetime_revenue=order_row.get("revenue") or Decimal("0"),
+                last_order_date=order_row.get("last"),
+            )
+        )
+    return stats
+
+
+def refresh_customer_stats(customer_ids) -> int:
+    """
+    Recompute and upsert the stats rows of customer_ids (ids of deleted
+    customers are ignored). Returns the number of rows written.
+    """
+    stats = compute_customer_stats(customer_id for customer_id in customer_ids if customer_id)
+    CustomerStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=["customer"],
+        update_fields=STATS_FIELDS,
+    )
+    return len(stats)
+
+
+def refresh_shop_customer_stats(shop_id, batch_size: int = 500) -> int:
+    """
+    Recompute every customer of one shop (after bulk imports).
+    """
+    ids = list(Customer.objects.filter(shop_id=shop_id).order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), batch_size):
+        refresh_customer_stats(ids[start : start + batch_size])
+    return len(ids)
+
+
+# Fields each source model feeds into CustomerStats.
+STATS_SOURCE_FIELDS = {
+    Project: ("customer_id",),
+    SalesOrder: ("customer_id", "status", "total_amount", "order_date"),
+}
+
+
+def _refresh_after_save(sender, instance, raw=False, **kwargs):
+    if raw or not has_changed(instance, STATS_SOURCE_FIELDS[sender]):
+        return
+    refresh_customer_stats({instance.customer_id, previous_values(instance).get("customer_id")})
+
+
+def _refresh_after_delete(sender, instance, **kwargs):
+    refresh_customer_stats({instance.customer_id})
+
+
+def connect_customer_stats():
+    for model, fields in STATS_SOURCE_FIELDS.items():
+        uid = f"customer-stats:{model._meta.label_lower}"
+        track_previous_values(model, fields)
+        post_save.connect(_refresh_after_save, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(_refresh_after_delete, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,45 @@
+# backend/customers/tests/test_customers_sparse_fields.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _list_sql(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+    assert resp.status_code == 200
+    sql = [q["sql"] for q in ctx.captured_queries if 'FROM "customers_customer"' in q["sql"]]
+    return resp.data["results"], sql[-1]
+
+
+@pytest.mark.django_db
+def test_fields_param_narrows_payload_and_selected_columns(auth_client):
+    rows, sql = _list_sql(auth_client, "/api/customers/?fields=id,name,email")
+
+    assert set(rows[0]) == {"id", "name", "email"}
+    # name reads first/last/company; everything else that is wide stays out of the SELECT.
+    assert '"customers_customer"."first_name"' in sql
+    assert '"customers_customer"."notes"' not in sql
+    assert '"customers_customer"."photo"' not in sql
+
+
+@pytest.mark.django_db
+def test_omit_param_drops_fields(auth_client):
+    rows, sql = _list_sql(auth_client, "/api/customers/?omit=photo,photo_url,notes")
+
+    assert "photo_url" not in rows[0]
+    assert "notes" not in rows[0]
+    assert "email" in rows[0]
+    assert '"customers_customer"."notes"' not in sql
+
+
+@pytest.mark.django_db
+def test_sparse_params_do_not_affect_writes(auth_client):
+    customer_id = auth_client.get("/api/customers/?fields=id").data["results"][0]["id"]
+    resp = auth_client.patch(
+        f"/api/customers/{customer_id}/?fields=id",
+        {"notes": "keep me"},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert resp.data["notes"] == "keep me"
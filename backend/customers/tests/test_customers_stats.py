@@ -0,0 +1,100 @@
+# backend/customers/tests/test_customers_stats.py
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Max, Q, Sum
+
+from customers import stats
+from customers.models import Customer, CustomerStats
+from projects.models import Project
+from sales.models import SalesOrder
+
+
+def _expected(customer):
+    orders = customer.sales_orders.exclude(status__in=["draft", "cancelled"])
+    agg = orders.aggregate(n=Count("id"), revenue=Sum("total_amount", filter=Q(status="paid")), last=Max("order_date"))
+    return {
+        "project_count": customer.projects.count(),
+        "order_count": agg["n"],
+        "lifetime_revenue": agg["revenue"] or Decimal("0.00"),
+        "last_order_date": agg["last"],
+    }
+
+
+def _stats(customer):
+    # No row yet means no projects or orders.
+    row = CustomerStats.objects.filter(customer=customer).first() or CustomerStats(customer=customer)
+    return {
+        "project_count": row.project_count,
+        "order_count": row.order_count,
+        "lifetime_revenue": row.lifetime_revenue,
+        "last_order_date": row.last_order_date,
+    }
+
+
+@pytest.mark.django_db
+def test_stats_follow_project_and_order_writes(demo_data):
+    customers = list(Customer.objects.all())
+    for customer in customers:
+        assert _stats(customer) == _expected(customer)
+
+    # Move a paid order to another customer: both sides are refreshed.
+    order = SalesOrder.objects.filter(status="paid", customer__isnull=False).first()
+    source = order.customer
+    target = next(customer for customer in customers if customer.pk != source.pk)
+    order.customer = target
+    order.save()
+    assert _stats(source) == _expected(source)
+    assert _stats(target) == _expected(target)
+
+    # The demo seed is random: either customer may have no projects.
+    project = Project.objects.filter(customer__isnull=False).first()
+    project.delete()
+    assert _stats(project.customer) == _expected(project.customer)
+
+
+@pytest.mark.django_db
+def test_rebuild_command_and_list_ordering(auth_client):
+    CustomerStats.objects.all().delete()
+    call_command("rebuild_customer_stats", stdout=StringIO())
+    for customer in Customer.objects.all():
+        assert _stats(customer) == _expected(customer)
+
+    rows = auth_client.get("/api/customers/?ordering=-lifetime_revenue&page_size=100").data["results"]
+    revenues = [Decimal(row["lifetime_revenue"]) for row in rows]
+    assert revenues == sorted(revenues, reverse=True)
+    assert {"project_count", "order_count", "last_order_date"} <= set(rows[0])
+
+    rows = auth_client.get("/api/customers/?ordering=project_count&page_size=100").data["results"]
+    counts = [row["project_count"] for row in rows]
+    assert counts == sorted(counts)
+
+
+@pytest.mark.django_db
+def test_stats_refresh_only_on_fields_they_read(demo_data, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(stats, "refresh_customer_stats", lambda ids: refreshed.append(set(ids) - {None}))
+
+    project = Project.objects.filter(customer__isnull=False).first()
+    project.name = "Renamed"
+    project.save()
+    order = SalesOrder.objects.filter(customer__isnull=False).first()
+    order.currency_code = "EUR"
+    order.save()
+    assert refreshed == []
+
+    order.total_amount += Decimal("1.00")
+    order.save()
+    assert refreshed == [{order.customer_id}]
+
+    other = Customer.objects.exclude(pk=project.customer_id).first()
+    previous = project.customer_id
+    project.customer = other
+    project.save()
+    assert refreshed[-1] == {previous, other.pk}
+
+    project.delete()
+    assert refreshed[-1] == {other.pk}
+    assert len(refreshed) == 3
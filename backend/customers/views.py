@@ -1,18 +1,28 @@
 # backend/customers/views.py
 
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
 from accounts.utils import get_shop_for_user
 from makerfex_backend.filters import QueryParamSearchFilter, is_truthy
-from makerfex_backend.mixins import ServerTableViewSetMixin, ShopScopedQuerysetMixin
+from makerfex_backend.mixins import (
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    SparseFieldsetViewSetMixin,
+)
 
 from .models import Customer
 from .serializers import CustomerSerializer
 
 
-class CustomerViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet):
+class CustomerViewSet(
+    SparseFieldsetViewSetMixin, ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet
+):
     """
     Customer API scoped to the current user's shop.
 
@@ -20,6 +30,7 @@ class CustomerViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets
       ?q=         free-text search
       ?ordering=  asc/desc sorting
       ?page= / ?page_size= pagination
+      ?fields= / ?omit= sparse fieldsets
     """
 
     permission_classes = [IsAuthenticated]
@@ -45,14 +56,30 @@ class CustomerViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets
         "is_vip",
         "created_at",
         "updated_at",
+        # CustomerStats aggregates (annotated in get_shop_queryset)
+        "project_count",
+        "order_count",
+        "lifetime_revenue",
+        "last_order_date",
     ]
 
     # Default ordering when no ?ordering= is provided
     ordering = ["-created_at"]
+    query_budgets = {"list": 5, "retrieve": 4}
 
-    
     def get_shop_queryset(self, shop):
-        qs = Customer.objects.filter(shop=shop)
+        # One LEFT JOIN to the maintained CustomerStats row; customers without
+        # one have no projects or orders yet.
+        qs = Customer.objects.filter(shop=shop).annotate(
+            project_count=Coalesce(F("stats__project_count"), 0),
+            order_count=Coalesce(F("stats__order_count"), 0),
+            lifetime_revenue=Coalesce(
+                F("stats__lifetime_revenue"),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+            last_order_date=F("stats__last_order_date"),
+        )
 
         if is_truthy(self.request.query_params.get("vip")):
             qs = qs.filter(is_vip=True)
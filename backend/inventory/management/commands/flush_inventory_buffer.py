@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import Shop
+from inventory.services import flush_pending_inventory
+
+
+class Command(BaseCommand):
+    help = "Apply buffered (write-behind) inventory deltas as ledger transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shop-id", type=int, default=0, help="Flush only one shop id (0 = all shops).")
+        parser.add_argument("--batch-size", type=int, default=100, help="Pending rows applied per DB transaction.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and flush every N seconds (0 = flush once and exit).",
+        )
+
+    def handle(self, *args, **opts):
+        shop = None
+        if opts["shop_id"]:
+            shop = Shop.objects.filter(id=opts["shop_id"]).first()
+            if not shop:
+                self.stderr.write(self.style.ERROR(f"Shop {opts['shop_id']} not found."))
+                return
+
+        interval = opts["interval"]
+        while True:
+            result = flush_pending_inventory(shop=shop, batch_size=max(1, opts["batch_size"]))
+            if result["rows"] or not interval:
+                self.stdout.write(
+                    f"Flushed {result['rows']} pending rows "
+                    f"({result['entries']} buffered entries -> {result['transactions']} transactions) "
+                    f"in {result['batches']} batches."
+                )
+            if not interval:
+                break
+            time.sleep(interval)
+
+        self.stdout.write(self.style.SUCCESS("flush_inventory_buffer complete"))
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-19 16:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('inventory', '0004_equipment_equipment_type'),
+        ('projects', '0007_alter_project_actual_hours_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingInventoryDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('inventory_type', models.CharField(choices=[('material', 'Material'), ('consumable', 'Consumable'), ('equipment', 'Equipment')], max_length=20)),
+                ('reason', models.CharField(choices=[('consume', 'Consume'), ('adjustment', 'Adjustment'), ('waste', 'Waste'), ('return', 'Return')], default='consume', max_length=20)),
+                ('quantity_delta', models.DecimalField(decimal_places=3, default=0, help_text='Sum of all buffered deltas for this key.', max_digits=10)),
+                ('entry_count', models.PositiveIntegerField(default=0, help_text='Number of buffered calls coalesced into this row.')),
+                ('consumable', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_deltas', to='inventory.consumable')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pending_inventory_deltas', to='accounts.employee')),
+                ('equipment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_deltas', to='inventory.equipment')),
+                ('material', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_deltas', to='inventory.material')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_inventory_deltas', to='projects.project')),
+                ('shop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_inventory_deltas', to='accounts.shop')),
+                ('station', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_inventory_deltas', to='accounts.station')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['shop', 'inventory_type'], name='inv_pending_shop_type_idx')],
+            },
+        ),
+    ]
@@ -237,4 +237,102 @@ class InventoryTransaction(TimeStampedModel):
 
     def __str__(self):
         target = self.material or self.consumable or self.equipment
-        return f"{self.get_reason_display()} {self.quantity_delta} {target}"
\ No newline at end of file
+        return f"{self.get_reason_display()} {self.quantity_delta} {target}"
+
+class PendingInventoryDelta(TimeStampedModel):
+    """
+    Write-behind buffer for high-frequency, small consumption deltas.
+
+    Buffered calls to apply_inventory_transaction() coalesce into one row per
+    (shop, item, project, station, reason, created_by) instead of writing a ledger row and
+    touching the item for every sheet of sandpaper. flush_inventory_buffer turns
+    each row into a single InventoryTransaction and deletes it.
+
+    Item read APIs overlay pending deltas on quantity_on_hand, so stock reads
+    stay consistent while entries wait to be flushed. The ledger
+    (/api/inventory/transactions/) only lists flushed transactions.
+    """
+
+    shop = models.ForeignKey(
+        Shop,
+        on_delete=models.CASCADE,
+        related_name="pending_inventory_deltas",
+    )
+
+    inventory_type = models.CharField(
+        max_length=20,
+        choices=InventoryTransaction.InventoryType.choices,
+    )
+
+    # Exactly ONE of these is set, based on inventory_type
+    material = models.ForeignKey(
+        "inventory.Material",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_deltas",
+    )
+    consumable = models.ForeignKey(
+        "inventory.Consumable",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_deltas",
+    )
+    equipment = models.ForeignKey(
+        "inventory.Equipment",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_deltas",
+    )
+
+    project = models.ForeignKey(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_inventory_deltas",
+    )
+    station = models.ForeignKey(
+        Station,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pending_inventory_deltas",
+    )
+
+    reason = models.CharField(
+        max_length=20,
+        choices=InventoryTransaction.Reason.choices,
+        default=InventoryTransaction.Reason.CONSUME,
+    )
+
+    quantity_delta = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        default=0,
+        help_text="Sum of all buffered deltas for this key.",
+    )
+    entry_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of buffered calls coalesced into this row.",
+    )
+
+    created_by = models.ForeignKey(
+        Employee,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pending_inventory_deltas",
+    )
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["shop", "inventory_type"], name="inv_pending_shop_type_idx"),
+        ]
+
+    def __str__(self):
+        target = self.material or self.consumable or self.equipment
+        return f"Pending {self.quantity_delta} {target} ({self.entry_count} entries)"
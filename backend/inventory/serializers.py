@@ -3,12 +3,16 @@
 from rest_framework import serializers
 
 from accounts.utils import get_shop_for_user
-from .models import Consumable, Equipment, InventoryTransaction, Material
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
+from .models import Consumable, Equipment, InventoryTransaction, Material, PendingInventoryDelta
 
 
-class InventoryItemBaseSerializer(serializers.ModelSerializer):
+class InventoryItemBaseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
 
+    # Buffered consumption not yet flushed to the ledger (annotated by the viewsets).
+    pending_quantity_delta = serializers.SerializerMethodField()
+
     class Meta:
         fields = [
             "id",
@@ -20,6 +24,7 @@ class InventoryItemBaseSerializer(serializers.ModelSerializer):
             "description",
             "unit_of_measure",
             "quantity_on_hand",
+            "pending_quantity_delta",
             "reorder_point",
             "unit_cost",
             "preferred_station",
@@ -27,7 +32,11 @@ class InventoryItemBaseSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "image_url"]
+        read_only_fields = ["id", "created_at", "updated_at", "image_url", "pending_quantity_delta"]
+        field_dependencies = {
+            "image_url": ["image"],
+            "pending_quantity_delta": [],
+        }
 
     def get_image_url(self, obj):
         request = self.context.get("request")
@@ -36,6 +45,20 @@ class InventoryItemBaseSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(url) if request else url
         return None
 
+    def get_pending_quantity_delta(self, obj):
+        pending = getattr(obj, "pending_quantity_delta", None)
+        return self.fields["quantity_on_hand"].to_representation(pending or 0)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Overlay buffered deltas so reads reflect everything already consumed.
+        pending = getattr(instance, "pending_quantity_delta", None)
+        if pending and "quantity_on_hand" in data:
+            data["quantity_on_hand"] = self.fields["quantity_on_hand"].to_representation(
+                instance.quantity_on_hand + pending
+            )
+        return data
+
     def validate(self, attrs):
         # No silent mutations: quantity_on_hand cannot be patched directly.
         if self.instance and "quantity_on_hand" in attrs:
@@ -66,7 +89,7 @@ class EquipmentSerializer(InventoryItemBaseSerializer):
         ]
 
 
-class InventoryTransactionSerializer(serializers.ModelSerializer):
+class InventoryTransactionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = InventoryTransaction
         fields = [
@@ -90,6 +113,28 @@ class InventoryTransactionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class PendingInventoryDeltaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PendingInventoryDelta
+        fields = [
+            "id",
+            "shop",
+            "inventory_type",
+            "material",
+            "consumable",
+            "equipment",
+            "project",
+            "station",
+            "reason",
+            "quantity_delta",
+            "entry_count",
+            "created_by",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class InventoryConsumeSerializer(serializers.Serializer):
     """
     Consume inventory (explicit mutation input).
@@ -112,6 +157,9 @@ class InventoryConsumeSerializer(serializers.Serializer):
     )
     bom_snapshot_id = serializers.IntegerField(required=False, allow_null=True)
 
+    # Write-behind: coalesce small deltas and let flush_inventory_buffer apply them.
+    buffered = serializers.BooleanField(required=False, default=False)
+
     def validate_quantity(self, value):
         if value <= 0:
             raise serializers.ValidationError("quantity must be > 0.")
@@ -1,9 +1,139 @@
 # backend/inventory/services.py
 
-from django.db import transaction
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError
 
-from inventory.models import InventoryTransaction, Material, Consumable, Equipment
+from makerfex_backend.versions import bump_versions
+from inventory.models import (
+    Consumable,
+    Equipment,
+    InventoryTransaction,
+    Material,
+    PendingInventoryDelta,
+)
+
+
+# Bounded retry for transient write conflicts (SQLite "database is locked",
+# Postgres deadlock / lock timeout). Both are surfaced as OperationalError;
+# see _is_contention() for which ones count.
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.01  # seconds; doubled per attempt, with jitter
+
+# Postgres SQLSTATEs worth retrying: deadlock_detected,
+# serialization_failure, lock_not_available.
+CONTENTION_SQLSTATES = {"40P01", "40001", "55P03"}
+
+# Buffered (write-behind) mode only accepts deltas up to this magnitude;
+# anything larger is applied directly.
+DEFAULT_BUFFER_MAX_ABS_DELTA = 5
+
+
+class InventoryContentionError(Exception):
+    """
+    Raised when an inventory write keeps conflicting with concurrent writers
+    after all retry attempts are exhausted.
+    """
+
+
+class _ContentionStats:
+    """
+    Process-local contention counters for inventory writes.
+
+    Cheap enough to keep always-on; read via get_contention_stats().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+_stats = _ContentionStats()
+
+
+def get_contention_stats() -> dict:
+    """
+    Return a copy of the inventory write counters:
+      transactions, optimistic, locking, retries, conflicts, failures, buffered
+    """
+    return _stats.snapshot()
+
+
+def reset_contention_stats():
+    _stats.reset()
+
+
+def _is_contention(exc: OperationalError) -> bool:
+    """
+    True for lock conflicts with other writers; False for every other
+    OperationalError (missing table, dropped connection, bad SQL, ...).
+    """
+    cause = exc.__cause__
+    sqlstate = getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)
+    if sqlstate:
+        return sqlstate in CONTENTION_SQLSTATES
+    return "database is locked" in str(exc) or "database table is locked" in str(exc)
+
+
+def _resolve_inventory_model(inventory_type):
+    if inventory_type == InventoryTransaction.InventoryType.MATERIAL:
+        return Material, "material"
+    if inventory_type == InventoryTransaction.InventoryType.CONSUMABLE:
+        return Consumable, "consumable"
+    if inventory_type == InventoryTransaction.InventoryType.EQUIPMENT:
+        return Equipment, "equipment"
+    raise ValidationError(f"Invalid inventory_type: {inventory_type}")
+
+
+def _lock_and_update(model, inventory_id, shop, quantity_delta):
+    """
+    Pessimistic path: SELECT ... FOR UPDATE, then write the new quantity.
+    """
+    try:
+        inventory_item = model.objects.select_for_update().get(
+            id=inventory_id,
+            shop=shop,
+        )
+    except model.DoesNotExist:
+        raise ValidationError("Inventory item not found for this shop.")
+
+    # Update quantity on hand (eager, but ledger remains source of truth)
+    inventory_item.quantity_on_hand += quantity_delta
+    inventory_item.save(update_fields=["quantity_on_hand"])
+    return inventory_item.id
+
+
+def _conditional_update(model, inventory_id, shop, quantity_delta):
+    """
+    Optimistic path: a single conditional UPDATE with F(), no prior SELECT.
+
+    The UPDATE's row lock is still held until commit, but it's taken at the
+    write itself rather than up front, and without the read round trip the
+    transaction holding it stays short.
+    """
+    updated = model.objects.filter(id=inventory_id, shop=shop).update(
+        quantity_on_hand=F("quantity_on_hand") + quantity_delta
+    )
+    if not updated:
+        raise ValidationError("Inventory item not found for this shop.")
+    return inventory_id
 
 
 def apply_inventory_transaction(
@@ -19,58 +149,221 @@ def apply_inventory_transaction(
     station=None,
     created_by=None,
     notes="",
+    optimistic=None,
+    max_attempts=None,
+    buffered=False,
 ):
     """
     Apply an inventory transaction and eagerly update quantity_on_hand.
 
     This is the ONLY place inventory quantities should change.
+
+    optimistic:
+      - False: lock the item row (select_for_update) before writing.
+      - True: conditional UPDATE ... SET quantity_on_hand = quantity_on_hand + delta.
+      - None: use settings.INVENTORY_OPTIMISTIC_UPDATES (default False).
+
+    Transient write conflicts are retried up to max_attempts times (with
+    jittered backoff) unless we're already inside an outer atomic block, in
+    which case the caller owns the transaction and the error is raised as-is.
+
+    buffered:
+      If True and the delta is small (see INVENTORY_BUFFER_MAX_ABS_DELTA) and
+      has no notes (a coalesced row can't keep per-entry notes), the delta is
+      coalesced into a PendingInventoryDelta row and a
+      PendingInventoryDelta is returned instead of an InventoryTransaction.
+      flush_pending_inventory() later applies it through this function.
     """
 
     if quantity_delta == 0:
         raise ValidationError("quantity_delta cannot be zero.")
 
     inventory_type = (inventory_type or "").lower()
+    model, fk_field = _resolve_inventory_model(inventory_type)
 
-    if inventory_type == InventoryTransaction.InventoryType.MATERIAL:
-        model = Material
-        fk_field = "material"
-    elif inventory_type == InventoryTransaction.InventoryType.CONSUMABLE:
-        model = Consumable
-        fk_field = "consumable"
-    elif inventory_type == InventoryTransaction.InventoryType.EQUIPMENT:
-        model = Equipment
-        fk_field = "equipment"
-    else:
-        raise ValidationError(f"Invalid inventory_type: {inventory_type}")
+    # BOM provenance and notes are per-entry, so those writes are never coalesced.
+    if buffered and not bom_snapshot_id and not notes:
+        max_abs = getattr(settings, "INVENTORY_BUFFER_MAX_ABS_DELTA", DEFAULT_BUFFER_MAX_ABS_DELTA)
+        if abs(quantity_delta) <= max_abs:
+            return _buffer_delta(
+                model=model,
+                fk_field=fk_field,
+                shop=shop,
+                inventory_type=inventory_type,
+                inventory_id=inventory_id,
+                quantity_delta=quantity_delta,
+                reason=reason,
+                project=project,
+                station=station,
+                created_by=created_by,
+            )
 
-    with transaction.atomic():
-        # Lock the row inside the transaction.
+    if optimistic is None:
+        optimistic = getattr(settings, "INVENTORY_OPTIMISTIC_UPDATES", False)
+    if max_attempts is None:
+        max_attempts = getattr(settings, "INVENTORY_WRITE_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+
+    # Retrying inside someone else's transaction can't help: the outer block is
+    # already broken once a statement fails.
+    in_outer_atomic = transaction.get_connection().in_atomic_block
+    if in_outer_atomic:
+        max_attempts = 1
+
+    write_quantity = _conditional_update if optimistic else _lock_and_update
+
+    _stats.incr("transactions")
+    _stats.incr("optimistic" if optimistic else "locking")
+
+    attempt = 0
+    while True:
+        attempt += 1
         try:
-            inventory_item = model.objects.select_for_update().get(
-                id=inventory_id,
-                shop=shop,
+            with transaction.atomic():
+                item_id = write_quantity(model, inventory_id, shop, quantity_delta)
+
+                txn_kwargs = {
+                    "shop": shop,
+                    "inventory_type": inventory_type,
+                    "quantity_delta": quantity_delta,
+                    "reason": reason,
+                    "project": project,
+                    "bom_snapshot_type": bom_snapshot_type or "",
+                    "bom_snapshot_id": bom_snapshot_id,
+                    "station": station,
+                    "created_by": created_by,
+                    "notes": notes,
+                }
+                txn_kwargs[f"{fk_field}_id"] = item_id
+
+                txn = InventoryTransaction.objects.create(**txn_kwargs)
+                if optimistic:
+                    # update() skips post_save, so bump the item's change version
+                    # here (the ledger row's create() bumps its own).
+                    bump_versions(shop.id, model)
+            return txn
+        except OperationalError as exc:
+            if not _is_contention(exc):
+                raise
+            _stats.incr("conflicts")
+            if attempt >= max_attempts:
+                _stats.incr("failures")
+                if in_outer_atomic:
+                    raise
+                raise InventoryContentionError(
+                    f"Inventory item is busy; gave up after {attempt} attempts."
+                ) from exc
+            _stats.incr("retries")
+            delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
+            time.sleep(delay + random.uniform(0, delay))
+
+
+# ---- Write-behind buffer ----------------------------------------------------
+
+
+def _buffer_delta(
+    *,
+    model,
+    fk_field,
+    shop,
+    inventory_type,
+    inventory_id,
+    quantity_delta,
+    reason,
+    project,
+    station,
+    created_by,
+):
+    """
+    Coalesce a delta into its (shop, item, project, station, reason,
+    created_by) row, so the flushed transaction is attributed to its writer.
+
+    The UPDATE ... SET quantity_delta = quantity_delta + x is atomic in the
+    database; only the first delta for a key pays for an INSERT.
+    """
+    if not model.objects.filter(id=inventory_id, shop=shop).exists():
+        raise ValidationError("Inventory item not found for this shop.")
+
+    _stats.incr("buffered")
+
+    key = {
+        "shop": shop,
+        "inventory_type": inventory_type,
+        f"{fk_field}_id": inventory_id,
+        "project": project,
+        "station": station,
+        "reason": reason,
+        "created_by": created_by,
+    }
+
+    with transaction.atomic():
+        pending_id = (
+            PendingInventoryDelta.objects.filter(**key)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if pending_id is not None:
+            updated = PendingInventoryDelta.objects.filter(id=pending_id).update(
+                quantity_delta=F("quantity_delta") + quantity_delta,
+                entry_count=F("entry_count") + 1,
             )
-        except model.DoesNotExist:
-            raise ValidationError("Inventory item not found for this shop.")
-
-        # Update quantity on hand (eager, but ledger remains source of truth)
-        inventory_item.quantity_on_hand += quantity_delta
-        inventory_item.save(update_fields=["quantity_on_hand"])
-
-        txn_kwargs = {
-            "shop": shop,
-            "inventory_type": inventory_type,
-            "quantity_delta": quantity_delta,
-            "reason": reason,
-            "project": project,
-            "bom_snapshot_type": bom_snapshot_type or "",
-            "bom_snapshot_id": bom_snapshot_id,
-            "station": station,
-            "created_by": created_by,
-            "notes": notes,
-        }
-        txn_kwargs[fk_field] = inventory_item
-
-        txn = InventoryTransaction.objects.create(**txn_kwargs)
-
-    return txn
+            if updated:
+                bump_versions(shop.id, PendingInventoryDelta)
+                return PendingInventoryDelta.objects.get(id=pending_id)
+            # Row was flushed between our SELECT and UPDATE; start a new one.
+
+        return PendingInventoryDelta.objects.create(
+            quantity_delta=quantity_delta,
+            entry_count=1,
+            **key,
+        )
+
+
+def flush_pending_inventory(*, shop=None, batch_size=100) -> dict:
+    """
+    Apply buffered deltas as real ledger transactions, one batch per DB transaction.
+
+    Each pending row becomes exactly one InventoryTransaction (rows that net to
+    zero are just dropped). Rows are locked while flushed, so a concurrent
+    buffered write either lands before the flush or starts a fresh row.
+
+    Returns counters: {"batches", "rows", "transactions", "entries"}.
+    """
+    result = {"batches": 0, "rows": 0, "transactions": 0, "entries": 0}
+
+    while True:
+        with transaction.atomic():
+            qs = PendingInventoryDelta.objects.select_related(
+                "shop", "project", "station", "created_by"
+            ).order_by("id")
+            if shop is not None:
+                qs = qs.filter(shop=shop)
+            if transaction.get_connection().features.has_select_for_update_skip_locked:
+                qs = qs.select_for_update(skip_locked=True, of=("self",))
+            rows = list(qs[:batch_size])
+            if not rows:
+                break
+
+            for row in rows:
+                if row.quantity_delta:
+                    item_id = row.material_id or row.consumable_id or row.equipment_id
+                    apply_inventory_transaction(
+                        shop=row.shop,
+                        inventory_type=row.inventory_type,
+                        inventory_id=item_id,
+                        quantity_delta=row.quantity_delta,
+                        reason=row.reason,
+                        project=row.project,
+                        station=row.station,
+                        created_by=row.created_by,
+                        notes=f"Coalesced {row.entry_count} buffered entries.",
+                    )
+                    result["transactions"] += 1
+                result["entries"] += row.entry_count
+
+            PendingInventoryDelta.objects.filter(id__in=[r.id for r in rows]).delete()
+
+        result["batches"] += 1
+        result["rows"] += len(rows)
+
+    return result
@@ -0,0 +1,78 @@
+# backend/inventory/tests/test_inventory_buffer.py
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from inventory.models import Consumable, InventoryTransaction, PendingInventoryDelta
+
+
+@pytest.mark.django_db
+def test_buffered_consumption_coalesces_and_overlays_reads(auth_client):
+    item = Consumable.objects.order_by("id").first()
+    start = item.quantity_on_hand
+
+    for _ in range(3):
+        resp = auth_client.post(
+            "/api/inventory/consume/",
+            {"inventory_type": "consumable", "inventory_id": item.id, "quantity": "0.5", "buffered": True},
+            format="json",
+        )
+        assert resp.status_code == 202
+
+    pending = PendingInventoryDelta.objects.get(consumable=item)
+    assert pending.entry_count == 3
+    assert pending.quantity_delta == Decimal("-1.5")
+    assert not InventoryTransaction.objects.filter(consumable=item).exists()
+
+    # Stored quantity is untouched, but reads overlay the pending delta.
+    item.refresh_from_db()
+    assert item.quantity_on_hand == start
+    detail = auth_client.get(f"/api/inventory/consumables/{item.id}/").data
+    assert Decimal(detail["quantity_on_hand"]) == start - Decimal("1.5")
+    assert Decimal(detail["pending_quantity_delta"]) == Decimal("-1.5")
+
+    call_command("flush_inventory_buffer")
+
+    assert not PendingInventoryDelta.objects.exists()
+    txn = InventoryTransaction.objects.get(consumable=item)
+    assert txn.quantity_delta == Decimal("-1.5")
+    item.refresh_from_db()
+    assert item.quantity_on_hand == start - Decimal("1.5")
+
+    detail = auth_client.get(f"/api/inventory/consumables/{item.id}/").data
+    assert Decimal(detail["quantity_on_hand"]) == start - Decimal("1.5")
+    assert Decimal(detail["pending_quantity_delta"]) == 0
+
+
+@pytest.mark.django_db
+def test_buffer_keeps_notes_and_writers_apart(demo_data):
+    from accounts.models import Employee, Shop
+    from inventory.services import apply_inventory_transaction
+
+    shop = Shop.objects.get(slug="silver-grain-woodworks")
+    item = Consumable.objects.filter(shop=shop).order_by("id").first()
+    first, second = Employee.objects.filter(shop=shop).order_by("id")[:2]
+
+    def consume(employee, notes=""):
+        return apply_inventory_transaction(
+            shop=shop,
+            inventory_type="consumable",
+            inventory_id=item.id,
+            quantity_delta=Decimal("-1"),
+            reason=InventoryTransaction.Reason.CONSUME,
+            created_by=employee,
+            notes=notes,
+            buffered=True,
+        )
+
+    # A delta with notes is written straight to the ledger.
+    txn = consume(first, notes="Dropped the bottle")
+    assert isinstance(txn, InventoryTransaction)
+    assert txn.notes == "Dropped the bottle"
+
+    consume(first)
+    consume(second)
+    consume(first)
+    rows = {row.created_by_id: row.entry_count for row in PendingInventoryDelta.objects.filter(consumable=item)}
+    assert rows == {first.id: 2, second.id: 1}
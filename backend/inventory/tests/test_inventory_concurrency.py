@@ -0,0 +1,142 @@
+# backend/inventory/tests/test_inventory_concurrency.py
+import threading
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from accounts.models import Shop
+from inventory.models import Consumable, InventoryTransaction
+from inventory.services import (
+    apply_inventory_transaction,
+    get_contention_stats,
+    reset_contention_stats,
+)
+
+
+THREADS = 8
+TXNS_PER_THREAD = 10
+
+
+def _hammer(shop, item_id, optimistic, errors):
+    try:
+        for _ in range(TXNS_PER_THREAD):
+            apply_inventory_transaction(
+                shop=shop,
+                inventory_type="consumable",
+                inventory_id=item_id,
+                quantity_delta=Decimal("-1"),
+                reason=InventoryTransaction.Reason.CONSUME,
+                optimistic=optimistic,
+                max_attempts=50,
+            )
+    except Exception as exc:  # surfaced to the main thread below
+        errors.append(exc)
+    finally:
+        connection.close()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("optimistic", [False, True])
+def test_concurrent_consumption_of_hot_item_is_lossless(optimistic):
+    shop = Shop.objects.create(name="Stress Shop", slug=f"stress-shop-{int(optimistic)}")
+    glue = Consumable.objects.create(shop=shop, name="Wood glue", quantity_on_hand=Decimal("1000"))
+    reset_contention_stats()
+
+    errors = []
+    threads = [
+        threading.Thread(target=_hammer, args=(shop, glue.id, optimistic, errors))
+        for _ in range(THREADS)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+    total = THREADS * TXNS_PER_THREAD
+    glue.refresh_from_db()
+    assert glue.quantity_on_hand == Decimal("1000") - total
+    assert InventoryTransaction.objects.filter(consumable=glue).count() == total
+
+    stats = get_contention_stats()
+    assert stats["transactions"] == total
+    assert stats.get("failures", 0) == 0
+    assert stats["optimistic" if optimistic else "locking"] == total
+
+
+@pytest.mark.django_db
+def test_optimistic_update_rejects_item_from_another_shop():
+    from django.core.exceptions import ValidationError
+
+    shop = Shop.objects.create(name="A", slug="shop-a")
+    other = Shop.objects.create(name="B", slug="shop-b")
+    item = Consumable.objects.create(shop=other, name="Sandpaper", quantity_on_hand=Decimal("5"))
+
+    with pytest.raises(ValidationError):
+        apply_inventory_transaction(
+            shop=shop,
+            inventory_type="consumable",
+            inventory_id=item.id,
+            quantity_delta=Decimal("-1"),
+            reason=InventoryTransaction.Reason.CONSUME,
+            optimistic=True,
+        )
+
+    item.refresh_from_db()
+    assert item.quantity_on_hand == Decimal("5")
+    assert not InventoryTransaction.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_only_lock_conflicts_are_retried(monkeypatch, settings):
+    from django.db import OperationalError, transaction
+
+    from inventory import services
+
+    shop = Shop.objects.create(name="Retry Shop", slug="retry-shop")
+    glue = Consumable.objects.create(shop=shop, name="Wood glue", quantity_on_hand=Decimal("10"))
+    calls = []
+
+    def failing_update(message):
+        def update(*args):
+            calls.append(message)
+            raise OperationalError(message)
+
+        return update
+
+    def consume(max_attempts=3):
+        return apply_inventory_transaction(
+            shop=shop,
+            inventory_type="consumable",
+            inventory_id=glue.id,
+            quantity_delta=Decimal("-1"),
+            reason=InventoryTransaction.Reason.CONSUME,
+            optimistic=True,
+            max_attempts=max_attempts,
+        )
+
+    reset_contention_stats()
+    monkeypatch.setattr(services, "_conditional_update", failing_update("no such table: inventory_consumable"))
+    with pytest.raises(OperationalError, match="no such table"):
+        consume()
+    assert len(calls) == 1
+    assert "conflicts" not in get_contention_stats()
+
+    calls.clear()
+    monkeypatch.setattr(services, "_conditional_update", failing_update("database is locked"))
+    monkeypatch.setattr(services, "RETRY_BASE_DELAY", 0)
+    with pytest.raises(services.InventoryContentionError):
+        consume()
+    assert len(calls) == 3
+    assert get_contention_stats()["conflicts"] == 3
+
+    # A single configured attempt still reports contention as such (409 in the
+    # views); only an outer transaction gets the raw error back.
+    settings.INVENTORY_WRITE_MAX_ATTEMPTS = 1
+    with pytest.raises(services.InventoryContentionError):
+        consume(max_attempts=None)
+    with pytest.raises(OperationalError, match="database is locked"):
+        with transaction.atomic():
+            consume()
@@ -0,0 +1,121 @@
+# backend/inventory/tests/test_inventory_fast_list.py
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from accounts.utils import get_shop_for_user
+from inventory.models import Material, PendingInventoryDelta
+from inventory.views import MaterialViewSet
+from makerfex_backend.mixins import FastListViewSetMixin
+from sales.models import SalesOrder, SalesOrderLine
+from sales.views import SalesOrderLineViewSet, SalesOrderViewSet
+
+MATERIAL_FIELDS = "id,name,sku,quantity_on_hand,pending_quantity_delta,reorder_point,unit_cost,is_active,updated_at"
+
+
+@pytest.fixture
+def bulk_rows(auth_client):
+    shop = get_shop_for_user(get_user_model().objects.get(username="demouser"))
+    Material.objects.bulk_create(
+        Material(
+            shop=shop,
+            name=f"Bench board {i:03d}",
+            sku=f"BB-{i:03d}",
+            quantity_on_hand=Decimal(i) / 8,
+            reorder_point=Decimal("2.5"),
+            unit_cost=Decimal(i) / 3 if i % 4 else None,
+        )
+        for i in range(150)
+    )
+    board = Material.objects.filter(shop=shop, sku="BB-007").get()
+    PendingInventoryDelta.objects.create(
+        shop=shop,
+        inventory_type="material",
+        material=board,
+        reason="consume",
+        quantity_delta=Decimal("-0.750"),
+    )
+
+    order = SalesOrder.objects.create(
+        shop=shop,
+        status=SalesOrder.Status.PAID,
+        order_date=date(2025, 3, 1),
+        subtotal_amount=Decimal("100.00"),
+        tax_amount=Decimal("8.25"),
+        total_amount=Decimal("108.25"),
+    )
+    SalesOrderLine.objects.bulk_create(
+        SalesOrderLine(
+            shop=shop,
+            order=order,
+            description=f"Line {i}",
+            quantity=Decimal("1.50"),
+            unit_price=Decimal(i) + Decimal("0.99"),
+            line_total=None if i % 5 == 0 else Decimal(i) * 2,
+        )
+        for i in range(120)
+    )
+    return auth_client
+
+
+def _serializer_path(monkeypatch, *viewsets):
+    for viewset in viewsets:
+        monkeypatch.setattr(viewset, "fast_list_fields", ())
+        monkeypatch.setattr(viewset, "fast_list_expressions", {})
+
+
+def _spy_fast_path(monkeypatch):
+    calls = []
+    original = FastListViewSetMixin.get_fast_list_rows
+
+    def spy(self, queryset, names):
+        calls.append(type(self).__name__)
+        return original(self, queryset, names)
+
+    monkeypatch.setattr(FastListViewSetMixin, "get_fast_list_rows", spy)
+    return calls
+
+
+URLS = [
+    f"/api/inventory/materials/?page_size=100&fields={MATERIAL_FIELDS}",
+    "/api/inventory/materials/?page_size=100&omit=image,image_url,description&ordering=-quantity_on_hand",
+    "/api/sales/lines/?page_size=100",
+    "/api/sales/orders/?omit=lines",
+]
+
+
+@pytest.mark.django_db
+def test_fast_list_matches_serializer_output(bulk_rows, monkeypatch):
+    client = bulk_rows
+    calls = _spy_fast_path(monkeypatch)
+    fast = [client.get(url) for url in URLS]
+    assert len(calls) == len(URLS)
+
+    monkeypatch.undo()
+    _serializer_path(monkeypatch, MaterialViewSet, SalesOrderLineViewSet, SalesOrderViewSet)
+    slow = [client.get(url) for url in URLS]
+
+    for url, fast_resp, slow_resp in zip(URLS, fast, slow):
+        assert fast_resp.status_code == slow_resp.status_code == 200, url
+        assert json.loads(fast_resp.content) == json.loads(slow_resp.content), url
+        # Same key order as the serializer, not just the same values.
+        assert list(json.loads(fast_resp.content)["results"][0]) == list(
+            json.loads(slow_resp.content)["results"][0]
+        ), url
+
+    rows = {r["sku"]: r for r in json.loads(fast[0].content)["results"]}
+    assert rows["BB-007"]["pending_quantity_delta"] == "-0.750"
+    assert Decimal(rows["BB-007"]["quantity_on_hand"]) == Decimal("0.125")
+
+
+@pytest.mark.django_db
+def test_fast_list_falls_back_for_method_fields(bulk_rows, monkeypatch):
+    calls = _spy_fast_path(monkeypatch)
+    resp = bulk_rows.get("/api/inventory/materials/?page_size=5")
+    assert resp.status_code == 200
+    assert "image_url" in resp.data["results"][0]
+    assert calls == []
+
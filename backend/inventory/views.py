@@ -10,11 +10,13 @@
 from typing import Optional
 
 from rest_framework import status, viewsets
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils.dateparse import parse_date, parse_datetime
 from datetime import datetime, time
 from django.utils import timezone
@@ -23,9 +25,14 @@ from django.utils import timezone
 from accounts.models import Employee
 from accounts.utils import get_shop_for_user
 from makerfex_backend.filters import QueryParamSearchFilter, parse_bool
-from makerfex_backend.mixins import ServerTableViewSetMixin, ShopScopedQuerysetMixin
+from makerfex_backend.mixins import (
+    FastListViewSetMixin,
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    SparseFieldsetViewSetMixin,
+)
 
-from .models import Consumable, Equipment, InventoryTransaction, Material
+from .models import Consumable, Equipment, InventoryTransaction, Material, PendingInventoryDelta
 from .serializers import (
     ConsumableSerializer,
     EquipmentSerializer,
@@ -33,8 +40,35 @@ from .serializers import (
     InventoryConsumeSerializer,
     InventoryTransactionSerializer,
     MaterialSerializer,
+    PendingInventoryDeltaSerializer,
 )
-from .services import apply_inventory_transaction
+from .services import InventoryContentionError, apply_inventory_transaction
+
+
+class InventoryBusy(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Inventory item is busy; please retry."
+    default_code = "inventory_busy"
+
+
+def _with_pending_overlay(qs, fk_field):
+    """
+    Annotate pending_quantity_delta: the sum of buffered (not yet flushed)
+    deltas for each item. Serializers overlay it on quantity_on_hand.
+    """
+    pending = (
+        PendingInventoryDelta.objects.filter(**{fk_field: OuterRef("pk")})
+        .order_by()
+        .values(fk_field)
+        .annotate(total=Sum("quantity_delta"))
+        .values("total")
+    )
+    return qs.annotate(
+        pending_quantity_delta=Coalesce(
+            Subquery(pending, output_field=DecimalField(max_digits=10, decimal_places=3)),
+            Value(0, output_field=DecimalField(max_digits=10, decimal_places=3)),
+        )
+    )
 
 
 def _get_employee(shop, user) -> Optional[Employee]:
@@ -43,12 +77,50 @@ def _get_employee(shop, user) -> Optional[Employee]:
     return Employee.objects.filter(shop=shop, user=user).first()
 
 
-class InventoryBaseViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet):
+# Columns whose raw value is already the API representation (fast list path).
+INVENTORY_ITEM_FAST_FIELDS = (
+    "id",
+    "shop",
+    "name",
+    "sku",
+    "description",
+    "unit_of_measure",
+    "reorder_point",
+    "unit_cost",
+    "preferred_station",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+class InventoryBaseViewSet(
+    SparseFieldsetViewSetMixin,
+    ServerTableViewSetMixin,
+    FastListViewSetMixin,
+    ShopScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "post", "put", "patch", "delete", "head", "options"]
 
     filter_backends = [QueryParamSearchFilter, OrderingFilter]
     ordering = ["name"]
+    query_budgets = {"list": 8, "retrieve": 7}
+
+    # image_url needs the storage backend, so it keeps the serializer path.
+    fast_list_fields = INVENTORY_ITEM_FAST_FIELDS
+    fast_list_expressions = {
+        # Same overlay the serializer applies in to_representation().
+        "quantity_on_hand": ExpressionWrapper(
+            F("quantity_on_hand") + F("pending_quantity_delta"),
+            output_field=DecimalField(max_digits=10, decimal_places=3),
+        ),
+        "pending_quantity_delta": ExpressionWrapper(
+            F("pending_quantity_delta"),
+            output_field=DecimalField(max_digits=10, decimal_places=3),
+        ),
+    }
 
     def destroy(self, request, *args, **kwargs):
         obj = self.get_object()
@@ -70,6 +142,8 @@ class InventoryBaseViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, vie
 class MaterialViewSet(InventoryBaseViewSet):
     serializer_class = MaterialSerializer
     queryset = Material.objects.all()
+    etag_models = (Material, PendingInventoryDelta)
+    fast_list_fields = INVENTORY_ITEM_FAST_FIELDS + ("material_type",)
 
     search_fields = ["name", "sku", "description"]
     ordering_fields = [
@@ -84,7 +158,7 @@ class MaterialViewSet(InventoryBaseViewSet):
     ]
 
     def get_shop_queryset(self, shop):
-        qs = Material.objects.filter(shop=shop)
+        qs = _with_pending_overlay(Material.objects.filter(shop=shop), "material")
         qp = self.request.query_params
 
         is_active = parse_bool(qp.get("is_active"))
@@ -109,6 +183,8 @@ class MaterialViewSet(InventoryBaseViewSet):
 class ConsumableViewSet(InventoryBaseViewSet):
     serializer_class = ConsumableSerializer
     queryset = Consumable.objects.all()
+    etag_models = (Consumable, PendingInventoryDelta)
+    fast_list_fields = INVENTORY_ITEM_FAST_FIELDS + ("consumable_type",)
 
     search_fields = ["name", "sku", "description"]
     ordering_fields = [
@@ -123,7 +199,7 @@ class ConsumableViewSet(InventoryBaseViewSet):
     ]
 
     def get_shop_queryset(self, shop):
-        qs = Consumable.objects.filter(shop=shop)
+        qs = _with_pending_overlay(Consumable.objects.filter(shop=shop), "consumable")
         qp = self.request.query_params
 
         is_active = parse_bool(qp.get("is_active"))
@@ -147,6 +223,13 @@ class ConsumableViewSet(InventoryBaseViewSet):
 class EquipmentViewSet(InventoryBaseViewSet):
     serializer_class = EquipmentSerializer
     queryset = Equipment.objects.all()
+    etag_models = (Equipment, PendingInventoryDelta)
+    fast_list_fields = INVENTORY_ITEM_FAST_FIELDS + (
+        "equipment_type",
+        "serial_number",
+        "purchase_date",
+        "warranty_expiration",
+    )
 
     search_fields = ["name", "sku", "description"]
     ordering_fields = [
@@ -161,7 +244,7 @@ class EquipmentViewSet(InventoryBaseViewSet):
     ]
 
     def get_shop_queryset(self, shop):
-        qs = Equipment.objects.filter(shop=shop)
+        qs = _with_pending_overlay(Equipment.objects.filter(shop=shop), "equipment")
         qp = self.request.query_params
 
         is_active = parse_bool(qp.get("is_active"))
@@ -182,14 +265,29 @@ class EquipmentViewSet(InventoryBaseViewSet):
         return qs
 
 
-class InventoryTransactionViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+class InventoryTransactionViewSet(
+    SparseFieldsetViewSetMixin,
+    ServerTableViewSetMixin,
+    FastListViewSetMixin,
+    ShopScopedQuerysetMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    """
+    The inventory ledger. Buffered deltas (PendingInventoryDelta) show up here
+    only once flush_inventory_buffer has turned them into transactions; until
+    then they're visible as pending_quantity_delta on the item endpoints.
+    """
+
     permission_classes = [IsAuthenticated]
     serializer_class = InventoryTransactionSerializer
     queryset = InventoryTransaction.objects.all()
+    etag_models = (InventoryTransaction,)
+    fast_list_fields = tuple(InventoryTransactionSerializer.Meta.fields)
 
     filter_backends = [OrderingFilter]
     ordering_fields = ["created_at", "quantity_delta", "reason"]
     ordering = ["-created_at"]
+    query_budgets = {"list": 7, "retrieve": 6}
 
     def get_shop_queryset(self, shop):
         qs = InventoryTransaction.objects.filter(shop=shop)
@@ -300,6 +398,7 @@ class InventoryConsumeView(APIView):
 
         bom_snapshot_type = data.get("bom_snapshot_type") or ""
         bom_snapshot_id = data.get("bom_snapshot_id")
+        buffered = data.get("buffered", False)
 
         created_by = _get_employee(shop, request.user)
 
@@ -352,19 +451,27 @@ class InventoryConsumeView(APIView):
             else:
                 raise ValidationError({"bom_snapshot_type": "Invalid bom_snapshot_type."})
 
-        txn = apply_inventory_transaction(
-            shop=shop,
-            inventory_type=inventory_type,
-            inventory_id=inventory_id,
-            quantity_delta=quantity_delta,
-            reason=InventoryTransaction.Reason.CONSUME,
-            created_by=created_by,
-            project=project,
-            station=station,
-            notes=notes,
-            bom_snapshot_type=bom_snapshot_type,
-            bom_snapshot_id=bom_snapshot_id,
-        )
+        try:
+            txn = apply_inventory_transaction(
+                shop=shop,
+                inventory_type=inventory_type,
+                inventory_id=inventory_id,
+                quantity_delta=quantity_delta,
+                reason=InventoryTransaction.Reason.CONSUME,
+                created_by=created_by,
+                project=project,
+                station=station,
+                notes=notes,
+                bom_snapshot_type=bom_snapshot_type,
+                bom_snapshot_id=bom_snapshot_id,
+                buffered=buffered,
+            )
+        except InventoryContentionError as exc:
+            raise InventoryBusy(str(exc))
+
+        if isinstance(txn, PendingInventoryDelta):
+            out = PendingInventoryDeltaSerializer(txn, context={"request": request}).data
+            return Response({"detail": "Inventory consumption queued.", "pending": out}, status=status.HTTP_202_ACCEPTED)
 
         out = InventoryTransactionSerializer(txn, context={"request": request}).data
         return Response({"detail": "Inventory consumed.", "transaction": out}, status=status.HTTP_200_OK)
@@ -410,19 +517,22 @@ class InventoryAdjustView(APIView):
             if not station:
                 raise ValidationError({"station_id": "Invalid station."})
 
-        txn = apply_inventory_transaction(
-            shop=shop,
-            inventory_type=inventory_type,
-            inventory_id=inventory_id,
-            quantity_delta=quantity_delta,
-            reason=reason,
-            created_by=created_by,
-            project=project,
-            station=station,
-            notes=notes,
-            bom_snapshot_type=bom_snapshot_type,
-            bom_snapshot_id=bom_snapshot_id,
-        )
+        try:
+            txn = apply_inventory_transaction(
+                shop=shop,
+                inventory_type=inventory_type,
+                inventory_id=inventory_id,
+                quantity_delta=quantity_delta,
+                reason=reason,
+                created_by=created_by,
+                project=project,
+                station=station,
+                notes=notes,
+                bom_snapshot_type=bom_snapshot_type,
+                bom_snapshot_id=bom_snapshot_id,
+            )
+        except InventoryContentionError as exc:
+            raise InventoryBusy(str(exc))
 
         out = InventoryTransactionSerializer(txn, context={"request": request}).data
         return Response({"detail": "Inventory adjusted.", "transaction": out}, status=status.HTTP_200_OK)
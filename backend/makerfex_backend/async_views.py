@@ -0,0 +1,103 @@
+# backend/makerfex_backend/async_views.py
+"""
+Helpers for the plain (non-DRF) async views served under ASGI.
+
+DRF's APIView is sync-only, so the async read endpoints are ordinary Django
+coroutine views that authenticate with the same JWTs and fan their
+independent queries out with gather_in_threads().
+
+Django's async ORM (`async for`, aget(), acount(), ...) still hands every
+query to the single thread-sensitive executor, so awaiting several querysets
+"concurrently" runs them one after another. gather_in_threads() instead runs
+each sync callable on its own worker thread (and DB connection), which is what
+actually overlaps the round trips.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+def authenticate_jwt(request, *, allow_query_token=False):
+    """
+    JWT from the Authorization header. Returns a user or None.
+
+    allow_query_token also accepts ?access_token=, for EventSource clients
+    that can't send headers. Tokens in URLs end up in access logs (and saved
+    profiles), so only the SSE stream opts in.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header:
+        raw = auth.get_raw_token(header)
+    else:
+        raw = request.GET.get("access_token") if allow_query_token else None
+    if not raw:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+
+
+def pooled_connections(func):
+    """
+    Wrap a callable that runs on a long-lived pool thread.
+
+    Pool threads never see request_started/request_finished, so each call
+    starts with close_old_connections(): a connection past CONN_MAX_AGE, or
+    one that fails its CONN_HEALTH_CHECKS check (idle timeout, DB restart),
+    is dropped and reopened instead of failing the call. With CONN_MAX_AGE =
+    0 every call connects afresh; set it (with CONN_HEALTH_CHECKS) to keep
+    pool connections between searches. A call that fails also drops the
+    thread's connections.
+    """
+
+    def run():
+        close_old_connections()
+        try:
+            return func()
+        except Exception:
+            for conn in connections.all(initialized_only=True):
+                conn.close()
+            raise
+
+    return run
+
+
+async def gather_in_threads(calls: dict, *, parallel=None, timeout=None) -> dict:
+    """
+    Await {name: zero-arg sync callable} concurrently -> {name: result}.
+
+    parallel=True (settings.ASYNC_READ_PARALLEL_QUERIES by default) gives each
+    call its own worker thread and connection. With False they share the
+    request's thread-sensitive executor (needed when the caller's connection
+    holds an open transaction the workers could not see, e.g. in tests).
+
+    With timeout (seconds), calls still running when it expires are left out
+    of the result; their threads finish in the background and are discarded.
+    """
+    if parallel is None:
+        parallel = settings.ASYNC_READ_PARALLEL_QUERIES
+    if parallel:
+        tasks = {
+            name: asyncio.ensure_future(sync_to_async(pooled_connections(call), thread_sensitive=False)())
+            for name, call in calls.items()
+        }
+    else:
+        tasks = {name: asyncio.ensure_future(sync_to_async(call)()) for name, call in calls.items()}
+    if not tasks:
+        return {}
+
+    if timeout is None:
+        await asyncio.gather(*tasks.values())
+    else:
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+    return {name: task.result() for name, task in tasks.items() if task.done() and not task.cancelled()}
@@ -0,0 +1,240 @@
+# backend/makerfex_backend/backfill.py
+"""
+Shared runner for data backfill management commands.
+
+A backfill is a BackfillCommand subclass that names itself (the checkpoint
+key), returns the rows still to fix from get_queryset() and fixes one chunk
+of them in process_chunk(). The base class does the rest:
+
+  - keyset chunking on the primary key (id > last_id ORDER BY id LIMIT n), so
+    every chunk costs the same however far into the table the run is;
+  - one transaction per chunk, committed together with its BackfillCheckpoint
+    row, so an interrupted run resumes right after the last committed chunk;
+  - optional fan-out of shops to worker processes (--workers), each shop with
+    its own checkpoint;
+  - a progress/throughput line per chunk and a summary at the end.
+
+--dry-run runs every chunk and rolls it back; no checkpoint is written.
+"""
+
+import importlib
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from config.models import BackfillCheckpoint
+
+SCOPE_ALL = "all"
+
+# Options forwarded to worker processes (the rest, e.g. stdout, don't pickle).
+PARTITION_OPTIONS = ("dry_run", "limit", "batch_size", "restart")
+
+
+def shop_scope(shop_id) -> str:
+    return f"shop:{shop_id}"
+
+
+def _call_in_worker(func, item):
+    """
+    Worker-process entry point for map_in_processes().
+    """
+    django.setup()  # no-op when the worker was forked from a set-up process
+    return func(item)
+
+
+def map_in_processes(func, items, workers: int, warn=None):
+    """
+    Yield func(item) for each item, in order, from up to `workers` worker
+    processes (func must be picklable: a module-level function or a
+    functools.partial of one).
+
+    Runs in this process when one worker is enough, and on SQLite, where
+    parallel writers would only fail with "database is locked"; warn(message)
+    is called when that downgrade happens.
+    """
+    items = list(items)
+    workers = min(workers, len(items))
+    if workers > 1 and connection.vendor == "sqlite":
+        if warn:
+            warn("SQLite: running one after another instead of in worker processes.")
+        workers = 1
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    # Forked workers must open their own connections, not share ours.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_call_in_worker, [func] * len(items), items)
+
+
+def _run_partition(command_module: str, options: dict, shop_id):
+    """
+    Run one shop's partition of a backfill (in a worker process).
+    """
+    command = importlib.import_module(command_module).Command()
+    return command.run_partition(options, shop_id=shop_id)
+
+
+class BackfillCommand(BaseCommand):
+    """
+    Base class for chunked, resumable backfills. Subclasses set backfill_name
+    and implement get_queryset() and process_chunk().
+    """
+
+    backfill_name = ""
+    shop_field = "shop_id"
+    default_batch_size = 1000
+    success_message = "Backfill complete"
+    # process_chunk() counter key -> summary label, in report order.
+    report_labels = {"updated": "Updated"}
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Do not write changes; only report.")
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=0,
+            help="Stop after this many rows (per shop with --workers; 0 = no limit). The checkpoint stays open.",
+        )
+        parser.add_argument("--shop-id", type=int, default=0, help="Process only one shop id (0 = all shops).")
+        parser.add_argument(
+            "--batch-size", type=int, default=self.default_batch_size, help="Rows per chunk / transaction."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes to fan shops out to (1 = one pass over all shops in this process).",
+        )
+        parser.add_argument(
+            "--restart", action="store_true", help="Ignore an unfinished checkpoint and start from the lowest id."
+        )
+
+    def get_queryset(self):
+        """
+        Rows still to process. Must yield model instances; ordering is applied
+        by the runner.
+        """
+        raise NotImplementedError
+
+    def process_chunk(self, rows) -> dict:
+        """
+        Fix one chunk (runs inside the chunk's transaction). Returns counters,
+        e.g. {"updated": 3, "skipped": 1}.
+        """
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        partition_options = {key: options[key] for key in PARTITION_OPTIONS}
+
+        if options["shop_id"]:
+            results = [self.run_partition(partition_options, shop_id=options["shop_id"])]
+        elif options["workers"] > 1:
+            results = self._fan_out(partition_options, options["workers"])
+        else:
+            results = [self.run_partition(partition_options)]
+
+        processed = sum(result["processed"] for result in results)
+        counts = Counter()
+        for result in results:
+            counts.update(result["counts"])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(self.success_message))
+        self.stdout.write(f"Dry run: {options['dry_run']}")
+        self.stdout.write(f"Processed: {processed}")
+        for key, label in self.report_labels.items():
+            self.stdout.write(f"{label}: {counts.get(key, 0)}")
+        self.stdout.write(f"Elapsed: {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.0f} rows/s)")
+
+    def _fan_out(self, options: dict, workers: int) -> list:
+        shop_ids = list(
+            self.get_queryset().order_by(self.shop_field).values_list(self.shop_field, flat=True).distinct()
+        )
+        run = partial(_run_partition, type(self).__module__, options)
+        return list(map_in_processes(run, shop_ids, workers, warn=self.stdout.write))
+
+    def _open_checkpoint(self, scope: str, restart: bool) -> BackfillCheckpoint:
+        now = timezone.now()
+        checkpoint, created = BackfillCheckpoint.objects.get_or_create(
+            name=self.backfill_name,
+            scope=scope,
+            defaults={"started_at": now, "updated_at": now},
+        )
+        if not created and (restart or checkpoint.finished_at):
+            checkpoint.last_id = 0
+            checkpoint.processed = 0
+            checkpoint.started_at = now
+            checkpoint.updated_at = now
+            checkpoint.finished_at = None
+            checkpoint.save()
+        return checkpoint
+
+    def run_partition(self, options: dict, shop_id=None) -> dict:
+        """
+        Run the backfill over one scope (one shop, or everything) from its
+        checkpoint. Returns {"processed": n, "counts": {...}} for this run.
+        """
+        scope = shop_scope(shop_id) if shop_id else SCOPE_ALL
+        dry_run = options["dry_run"]
+        limit = max(0, options["limit"])
+        batch_size = max(1, options["batch_size"])
+
+        qs = self.get_queryset()
+        if shop_id:
+            qs = qs.filter(**{self.shop_field: shop_id})
+
+        checkpoint = None if dry_run else self._open_checkpoint(scope, options["restart"])
+        last_id = checkpoint.last_id if checkpoint else 0
+        if last_id:
+            self.stdout.write(f"[{scope}] resuming after id {last_id}")
+
+        processed = 0
+        counts = Counter()
+        chunk_no = 0
+        exhausted = False
+        started = time.perf_counter()
+
+        while True:
+            size = batch_size if not limit else min(batch_size, limit - processed)
+            if size <= 0:
+                break
+
+            with transaction.atomic():
+                rows = list(qs.filter(pk__gt=last_id).order_by("pk")[:size])
+                if rows:
+                    chunk_counts = self.process_chunk(rows) or {}
+                    last_id = rows[-1].pk
+                    if dry_run:
+                        transaction.set_rollback(True)
+                    else:
+                        BackfillCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                            last_id=last_id,
+                            processed=F("processed") + len(rows),
+                            updated_at=timezone.now(),
+                        )
+            if not rows:
+                exhausted = True
+                break
+
+            processed += len(rows)
+            counts.update(chunk_counts)
+            chunk_no += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"[{scope}] chunk {chunk_no}: processed {processed}, last id {last_id}, "
+                f"{processed / elapsed if elapsed else 0:.0f} rows/s"
+            )
+
+        if checkpoint and exhausted:
+            BackfillCheckpoint.objects.filter(pk=checkpoint.pk).update(finished_at=timezone.now())
+
+        return {"processed": processed, "counts": dict(counts)}
@@ -0,0 +1,353 @@
+# backend/makerfex_backend/changes.py
+"""
+Incremental change feed for Kanban boards (and anything else that polls lists).
+
+Instead of re-fetching whole task/project lists to notice moves, clients keep
+an opaque cursor and ask for rows changed since it:
+
+  GET /api/changes/?models=tasks.task,projects.project&workflow=3
+    -> {"cursor": "...", "changes": {"tasks.task": [...], ...},
+        "versions": {...}, "has_more": false}
+
+  GET /api/changes/?cursor=<cursor>&models=...&wait=5     (long-poll)
+  GET /api/changes/stream/?cursor=<cursor>&models=...      (SSE, serve via ASGI)
+
+The first call (no cursor) returns an empty change set and a cursor at "now";
+load the board with the regular list endpoints, then follow the feed.
+
+Rows come from an indexed (shop, updated_at, id) scan and are serialized with
+the same serializers as the list endpoints (so ?fields= works here too).
+Rows written in the last CHANGE_FEED_SETTLE_SECONDS are held back so a slow
+transaction committing an older updated_at can't slip behind the cursor.
+
+Deletes don't show up in an updated_at scan (projects archive, tasks can't be
+deleted); "versions" still moves, so clients can fall back to a full refetch
+when it changes without any rows.
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.utils import get_shop_for_user
+from makerfex_backend.async_views import authenticate_jwt
+from makerfex_backend.renderers import FastJSONRenderer
+from makerfex_backend.serializers import parse_field_list
+from makerfex_backend.versions import get_versions
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from projects.views import project_table_queryset
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from tasks.views import task_table_queryset
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 500
+
+
+# label -> how to scan and serialize changed rows of that model.
+# "queryset" is the list endpoint's own base queryset (joins and annotations
+# its serializer reads); "filters" maps accepted query params to ORM lookups.
+CHANGE_FEED_SOURCES = {
+    "projects.project": {
+        "model": Project,
+        "queryset": project_table_queryset,
+        "serializer": ProjectSerializer,
+        "filters": {"workflow": "workflow_id", "stage": "current_stage_id"},
+    },
+    "tasks.task": {
+        "model": Task,
+        "queryset": task_table_queryset,
+        "serializer": TaskSerializer,
+        "filters": {"workflow": "stage__workflow_id", "stage": "stage_id", "project": "project_id"},
+    },
+}
+
+
+def encode_cursor(positions: dict) -> str:
+    raw = json.dumps(
+        {label: [ts.isoformat(), pk] for label, (ts, pk) in positions.items()},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> dict:
+    """
+    Cursor -> {label: (updated_at, id)}. Raises ValidationError on garbage.
+    """
+    if not value:
+        return {}
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {}
+        for label, (ts, pk) in data.items():
+            parsed = parse_datetime(ts)
+            if parsed is None:
+                raise ValueError(ts)
+            positions[label] = (parsed, int(pk))
+        return positions
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def parse_models(value) -> list[str]:
+    labels = [label.lower() for label in parse_field_list(value)] or sorted(CHANGE_FEED_SOURCES)
+    unknown = [label for label in labels if label not in CHANGE_FEED_SOURCES]
+    if unknown:
+        raise ValidationError({"models": f"Unsupported model(s): {', '.join(unknown)}."})
+    return labels
+
+
+def parse_filters(params) -> dict:
+    """
+    {param: id} for the filter params present (?workflow=, ?stage=, ...).
+    Raises ValidationError on non-numeric ids.
+    """
+    names = {param for source in CHANGE_FEED_SOURCES.values() for param in source["filters"]}
+    filters = {}
+    for param in sorted(names):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            filters[param] = int(value)
+        except ValueError:
+            raise ValidationError({param: "Expected an id."})
+    return filters
+
+
+def fetch_changes(*, shop, request, labels, cursor: dict, filters=None, limit=DEFAULT_LIMIT) -> dict:
+    """
+    One pass over the feed: rows of each model changed after its cursor
+    position, oldest first, up to `limit` per model, narrowed by filters
+    (see parse_filters()).
+    """
+    # Versions first: any bump they include was committed before the scan.
+    versions = get_versions(shop.id, [CHANGE_FEED_SOURCES[label]["model"] for label in labels])
+    horizon = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    filters = filters or {}
+    positions = dict(cursor)
+    changes = {}
+    has_more = False
+
+    for label in labels:
+        source = CHANGE_FEED_SOURCES[label]
+        position = positions.get(label)
+        if position is None:
+            # No cursor yet: start at "now" (the client just loaded the list).
+            positions[label] = (horizon, 0)
+            changes[label] = []
+            continue
+
+        since, since_id = position
+        qs = (
+            source["queryset"](shop)
+            .filter(updated_at__lte=horizon)
+            .filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=since_id))
+            .order_by("updated_at", "id")
+        )
+        for param, lookup in source["filters"].items():
+            if param in filters:
+                qs = qs.filter(**{lookup: filters[param]})
+
+        rows = list(qs[: limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+        if rows:
+            positions[label] = (rows[-1].updated_at, rows[-1].id)
+        changes[label] = source["serializer"](rows, many=True, context={"request": request}).data
+
+    return {
+        "cursor": encode_cursor(positions),
+        "changes": changes,
+        "versions": versions,
+        "has_more": has_more,
+    }
+
+
+def _has_rows(result) -> bool:
+    return bool(result) and any(result["changes"].values())
+
+
+class ChangeFollower:
+    """
+    Follows the feed for one client: poll() rescans only when the shop's
+    version counters move, plus one rescan a settle window after each change
+    (rows written just before a scan are held back by the horizon, yet their
+    bump is already counted as seen).
+    """
+
+    def __init__(self, *, shop, request, labels, cursor, filters=None, limit=DEFAULT_LIMIT):
+        self.shop = shop
+        self.request = request
+        self.labels = labels
+        self.cursor = cursor
+        self.filters = filters
+        self.limit = limit
+        self.models = [CHANGE_FEED_SOURCES[label]["model"] for label in labels]
+        self.seen = None
+        self.rescan_at = None
+
+    def poll(self):
+        """
+        One step. Returns a fetch_changes() result when a scan ran, else None.
+        """
+        now = time.monotonic()
+        due = self.rescan_at is not None and now >= self.rescan_at
+        if self.seen is not None and not due:
+            if get_versions(self.shop.id, self.models) == self.seen:
+                return None
+
+        result = fetch_changes(
+            shop=self.shop,
+            request=self.request,
+            labels=self.labels,
+            cursor=self.cursor,
+            filters=self.filters,
+            limit=self.limit,
+        )
+        self.cursor = decode_cursor(result["cursor"])
+        if result["has_more"]:
+            self.rescan_at = now
+        elif result["versions"] != self.seen:
+            self.rescan_at = now + settings.CHANGE_FEED_SETTLE_SECONDS
+        else:
+            self.rescan_at = None
+        self.seen = result["versions"]
+        return result
+
+
+def _parse_limit(value):
+    try:
+        return max(1, min(int(value), MAX_LIMIT))
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+
+
+class ChangeFeedView(APIView):
+    """
+    Incremental change feed (see module docstring). ?wait=<seconds> long-polls:
+    the request is held until something changes or the wait expires. Each
+    waiting client ties up a sync worker, so waits are capped short
+    (CHANGE_FEED_MAX_WAIT_SECONDS); clients that want to sit on the feed use
+    the SSE stream, which is served by the event loop under ASGI.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        shop = get_shop_for_user(request.user)
+        if not shop:
+            return Response({"detail": "Current user has no shop configured."}, status=400)
+
+        labels = parse_models(request.query_params.get("models"))
+        cursor = decode_cursor(request.query_params.get("cursor"))
+        filters = parse_filters(request.query_params)
+        limit = _parse_limit(request.query_params.get("limit"))
+        try:
+            wait = min(float(request.query_params.get("wait") or 0), settings.CHANGE_FEED_MAX_WAIT_SECONDS)
+        except ValueError:
+            wait = 0
+
+        follower = ChangeFollower(
+            shop=shop, request=request, labels=labels, cursor=cursor, filters=filters, limit=limit
+        )
+        result = follower.poll()
+        if wait <= 0 or not cursor:
+            return Response(result)
+
+        # Long-poll: hold the request until rows show up or the wait expires.
+        deadline = time.monotonic() + wait
+        while not _has_rows(result) and time.monotonic() < deadline:
+            time.sleep(settings.CHANGE_FEED_POLL_SECONDS)
+            result = follower.poll() or result
+        return Response(result)
+
+
+# ---- Server-sent events (ASGI) ------------------------------------------------
+
+
+def _sse(event, data, event_id=None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def change_stream(request):
+    """
+    SSE variant of the change feed. Emits a "changes" event whenever rows move
+    (id: carries the cursor, so EventSource reconnects resume via Last-Event-ID)
+    and a comment heartbeat otherwise. Streams end after
+    CHANGE_FEED_STREAM_SECONDS; clients simply reconnect.
+
+    Needs an ASGI server: under WSGI a streaming async response is buffered.
+    """
+    user = await sync_to_async(authenticate_jwt)(request, allow_query_token=True)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    shop = await sync_to_async(get_shop_for_user)(user)
+    if not shop:
+        return JsonResponse({"detail": "Current user has no shop configured."}, status=400)
+
+    drf_request = Request(request)
+    drf_request.user = user
+    try:
+        labels = parse_models(request.GET.get("models"))
+        cursor = decode_cursor(request.GET.get("cursor") or request.headers.get("Last-Event-ID"))
+        filters = parse_filters(request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    limit = _parse_limit(request.GET.get("limit"))
+    follower = ChangeFollower(
+        shop=shop, request=drf_request, labels=labels, cursor=cursor, filters=filters, limit=limit
+    )
+    poll = sync_to_async(follower.poll)
+    renderer = FastJSONRenderer()
+
+    async def events():
+        deadline = time.monotonic() + settings.CHANGE_FEED_STREAM_SECONDS
+        last_beat = time.monotonic()
+        result = await poll()
+        # Always emit the first scan: it hands a cursor-less client its cursor.
+        emit = True
+        while True:
+            if result is not None and (emit or _has_rows(result)):
+                yield _sse("changes", renderer.render(result).decode(), event_id=result["cursor"])
+                last_beat = time.monotonic()
+            emit = False
+            if time.monotonic() >= deadline:
+                return
+            if not (result and result["has_more"]):
+                await asyncio.sleep(settings.CHANGE_FEED_POLL_SECONDS)
+            result = await poll()
+            if result is None and time.monotonic() - last_beat >= settings.CHANGE_FEED_HEARTBEAT_SECONDS:
+                last_beat = time.monotonic()
+                yield ": keepalive\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -4,20 +4,38 @@ Reusable backend mixins for canonical server-driven tables and tenant scoping.
 
 These are opt-in guardrails:
 - ServerTableViewSetMixin: ensures ?q= search + ?ordering= sorting are always available
-  without clobbering any existing filter_backends.
+  without clobbering any existing filter_backends, and answers conditional GETs
+  (If-None-Match -> 304) for viewsets that declare etag_models.
 - ShopScopedQuerysetMixin: ensures tenant safety by scoping all queries to the current
-  user's shop via get_shop_for_user(request.user), returning an empty queryset if no
+  user's shop via get_request_shop(request), returning an empty queryset if no
   shop is resolved.
+- SparseFieldsetViewSetMixin: when ?fields= / ?omit= narrow the response, defer() the
+  columns no serialized field reads (pairs with SparseFieldsetSerializerMixin).
+- FastListViewSetMixin: serve list pages straight from .values() rows rendered by
+  FastJSONRenderer when every serialized field is a plain column.
 
 No UI changes. No new query params. No behavior changes unless a viewset opts in.
 """
 
 from __future__ import annotations
 
+import hashlib
+from decimal import Decimal
+
+from django.db.models import DecimalField
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework.filters import OrderingFilter
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
-from accounts.utils import get_shop_for_user
+from accounts.utils import get_request_shop
 from makerfex_backend.filters import QueryParamSearchFilter
+from makerfex_backend.renderers import FastJSONRenderer
+from makerfex_backend.serializers import has_sparse_params
+from makerfex_backend.versions import get_versions
 
 
 class ServerTableViewSetMixin:
@@ -27,6 +45,9 @@ class ServerTableViewSetMixin:
   - ?q= free-text search via QueryParamSearchFilter
   - ?ordering= sorting via DRF OrderingFilter
   - pagination handled via DRF settings (page/page_size)
+  - conditional GET: list/retrieve responses carry a weak ETag derived from the
+    shop's change versions for etag_models plus the normalized query params;
+    a matching If-None-Match returns 304 before the queryset is evaluated.
 
   This mixin is append-only with respect to filter_backends: it will preserve any
   filter backends already configured on the viewset and add required ones if missing.
@@ -38,11 +59,16 @@ class ServerTableViewSetMixin:
       search_fields = ["name", "email"]
       ordering_fields = ["id", "name", "created_at"]
       ordering = ("name", "id")
+      etag_models = (Customer,)  # anything whose change alters the response
   """
 
   # Stable default ordering; override in subclasses when needed.
   ordering = ("-id",)
 
+  # Models (or "app.model" labels) whose per-shop change version feeds the ETag.
+  # Include related models rendered in the payload. Empty disables ETags.
+  etag_models = ()
+
   # Required filter backends for the canonical contract.
   required_filter_backends = (QueryParamSearchFilter, OrderingFilter)
 
@@ -71,6 +97,67 @@ class ServerTableViewSetMixin:
       queryset = backend_cls().filter_queryset(self.request, queryset, self)
     return queryset
 
+  def get_etag_models(self):
+    return self.etag_models
+
+  def get_etag(self, request) -> str | None:
+    """
+    Weak ETag for this GET, or None when conditional GET doesn't apply.
+
+    Costs one read of the version counters, independent of page size (the
+    shop lookup is shared with get_queryset via get_request_shop).
+    """
+    models = self.get_etag_models()
+    if not models or request.method not in ("GET", "HEAD"):
+      return None
+    shop = get_request_shop(request)
+    if not shop:
+      return None
+
+    versions = sorted(get_versions(shop.id, models).items())
+    params = sorted(
+      (key, value) for key in request.query_params for value in request.query_params.getlist(key)
+    )
+    key = repr((
+      type(self).__name__,
+      getattr(self, "action", None),
+      sorted(self.kwargs.items()),
+      shop.id,
+      request.user.pk,
+      getattr(request, "accepted_media_type", ""),
+      params,
+      versions,
+    ))
+    return 'W/"%s"' % hashlib.sha1(key.encode()).hexdigest()
+
+  def _etag_matches(self, request, etag) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+      return False
+    if header.strip() == "*":
+      return True
+    # Weak comparison (RFC 9110 13.1.2): opaque-tags compared without W/.
+    opaque = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque for candidate in parse_etags(header))
+
+  def _conditional_response(self, handler, request, *args, **kwargs):
+    etag = self.get_etag(request)
+    if etag and self._etag_matches(request, etag):
+      response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+      response = handler(request, *args, **kwargs)
+      if not etag or response.status_code != status.HTTP_200_OK:
+        return response
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+  def list(self, request, *args, **kwargs):
+    return self._conditional_response(super().list, request, *args, **kwargs)
+
+  def retrieve(self, request, *args, **kwargs):
+    return self._conditional_response(super().retrieve, request, *args, **kwargs)
+
 
 class ShopScopedQuerysetMixin:
   """
@@ -89,7 +176,7 @@ class ShopScopedQuerysetMixin:
   """
 
   def get_shop(self):
-    return get_shop_for_user(self.request.user)
+    return get_request_shop(self.request)
 
   def get_shop_queryset(self, shop):
     raise NotImplementedError("Implement get_shop_queryset(shop)")
@@ -105,3 +192,153 @@ class ShopScopedQuerysetMixin:
         "ShopScopedQuerysetMixin requires either a queryset attribute or an overridden get_queryset()."
       )
     return self.get_shop_queryset(shop)
+
+
+class SparseFieldsetViewSetMixin:
+  """
+  Opt-in mixin that keeps queryset width in line with ?fields= / ?omit=.
+
+  The serializer (a SparseFieldsetSerializerMixin) decides which fields are
+  emitted; this mixin asks it which model fields those read and defer()s the
+  remaining non-relational columns (long text, image paths, ...). Relations are
+  never deferred, so select_related() keeps working.
+
+  Only GET/HEAD requests are narrowed; writes always load full rows.
+
+  Usage:
+
+    class CustomerViewSet(SparseFieldsetViewSetMixin, ServerTableViewSetMixin, ...):
+      ...
+  """
+
+  def get_serialized_field_names(self) -> set[str]:
+    """
+    Top-level field names the response serializer will emit for this request.
+    Handy for deciding which nested relations are worth prefetching.
+    """
+    return set(self.get_serializer().fields)
+
+  def get_deferred_field_names(self, queryset) -> list[str]:
+    request = getattr(self, "request", None)
+    if request is None or request.method not in ("GET", "HEAD") or not has_sparse_params(request):
+      return []
+
+    serializer = self.get_serializer()
+    get_required = getattr(serializer, "get_required_model_fields", None)
+    required = get_required() if get_required else None
+    if required is None:
+      return []
+
+    deferred = []
+    for field in queryset.model._meta.concrete_fields:
+      if field.primary_key or field.is_relation:
+        continue
+      if field.name in required or field.attname in required:
+        continue
+      deferred.append(field.name)
+    return deferred
+
+  def filter_queryset(self, queryset):
+    queryset = super().filter_queryset(queryset)
+    deferred = self.get_deferred_field_names(queryset)
+    if deferred:
+      queryset = queryset.defer(*deferred)
+    return queryset
+
+
+class FastListViewSetMixin:
+  """
+  Opt-in high-throughput list path.
+
+  ModelSerializer converts every row field by field, which dominates CPU time on
+  100-row pages. When every field the serializer would emit for this request is
+  listed in fast_list_fields (plain columns / annotations / FK ids whose raw DB
+  value *is* the API representation), list() instead paginates a .values()
+  queryset and lets FastJSONRenderer encode Decimal/date values directly.
+
+  Anything else (method fields, nested serializers, file URLs) falls back to the
+  regular serializer path, so responses are identical either way. ?fields= /
+  ?omit= are honoured through the serializer's field selection.
+
+  fast_list_expressions maps an output field name to a query expression, for
+  columns whose representation is computed (e.g. quantity_on_hand + pending).
+
+  Usage:
+
+    class SalesOrderLineViewSet(FastListViewSetMixin, SparseFieldsetViewSetMixin, ...):
+      fast_list_fields = ("id", "order", "quantity", "unit_price", "line_total")
+
+  Place it after ServerTableViewSetMixin in the bases so conditional GET still
+  wraps the fast path.
+  """
+
+  fast_list_fields: tuple[str, ...] = ()
+  fast_list_expressions: dict = {}
+
+  def get_renderers(self):
+    # FastJSONRenderer renders serializer output identically, so swap it in for
+    # every response of an opted-in viewset rather than only the fast ones.
+    renderers = super().get_renderers()
+    return [
+      FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+      for renderer in renderers
+    ]
+
+  def get_fast_list_field_names(self) -> list[str] | None:
+    """
+    Ordered output field names for the fast path, or None to use the serializer.
+    """
+    if not self.fast_list_fields and not self.fast_list_expressions:
+      return None
+    if getattr(self, "action", None) != "list" or self.request.method not in ("GET", "HEAD"):
+      return None
+
+    names = list(self.get_serializer().fields)
+    supported = set(self.fast_list_fields) | set(self.fast_list_expressions)
+    if not names or any(name not in supported for name in names):
+      return None
+    return names
+
+  def get_fast_list_rows(self, queryset, names):
+    expressions = {
+      f"_fast_{name}": expr
+      for name, expr in self.fast_list_expressions.items()
+      if name in names
+    }
+    plain = [name for name in names if name not in self.fast_list_expressions]
+    return queryset.values(*plain, **expressions)
+
+  def _fast_expression_converter(self, name):
+    # Computed decimals aren't quantized by every backend (SQLite returns "0"
+    # for Coalesce(..., 0)); match the serializer's fixed decimal places.
+    output_field = getattr(self.fast_list_expressions[name], "output_field", None)
+    if isinstance(output_field, DecimalField):
+      exponent = Decimal(1).scaleb(-output_field.decimal_places)
+      return lambda value: None if value is None else Decimal(value).quantize(exponent)
+    return None
+
+  def _reshape_fast_rows(self, rows, names):
+    # .values() puts expression aliases last; restore names and serializer order.
+    if not any(name in self.fast_list_expressions for name in names):
+      return list(rows)
+    columns = []
+    for name in names:
+      if name in self.fast_list_expressions:
+        columns.append((name, f"_fast_{name}", self._fast_expression_converter(name)))
+      else:
+        columns.append((name, name, None))
+    return [
+      {name: convert(row[key]) if convert else row[key] for name, key, convert in columns}
+      for row in rows
+    ]
+
+  def list(self, request, *args, **kwargs):
+    names = self.get_fast_list_field_names()
+    if names is None:
+      return super().list(request, *args, **kwargs)
+
+    queryset = self.get_fast_list_rows(self.filter_queryset(self.get_queryset()), names)
+    page = self.paginate_queryset(queryset)
+    if page is not None:
+      return self.get_paginated_response(self._reshape_fast_rows(page, names))
+    return Response(self._reshape_fast_rows(queryset, names))
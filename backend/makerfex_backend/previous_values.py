@@ -0,0 +1,55 @@
+# backend/makerfex_backend/previous_values.py
+"""
+Previous column values of a row being saved, read once per save.
+
+post_save handlers that only need to act when some fields changed (customer
+stats, sales rollups) register those fields with track_previous_values(). A
+single pre_save handler per model then reads every registered field in one
+SELECT and leaves the values on the instance, where has_changed() and
+previous_values() find them. New rows (and raw fixture loads) have no
+previous values.
+"""
+
+from django.db.models.signals import pre_save
+
+_tracked_fields: dict = {}
+
+
+def track_previous_values(model, fields):
+    """
+    Read fields of model's rows before each save (idempotent; fields
+    registered by several callers are read once).
+    """
+    tracked = _tracked_fields.setdefault(model, [])
+    tracked.extend(field for field in fields if field not in tracked)
+    pre_save.connect(
+        _remember_previous_values,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"previous-values:{model._meta.label_lower}",
+    )
+
+
+def _remember_previous_values(sender, instance, raw=False, **kwargs):
+    instance._previous_values = None
+    if raw or not instance.pk:
+        return
+    instance._previous_values = sender.objects.filter(pk=instance.pk).values(*_tracked_fields[sender]).first()
+
+
+def previous_values(instance) -> dict:
+    """
+    {field: value} of the tracked fields before the current save; empty for
+    new rows.
+    """
+    return getattr(instance, "_previous_values", None) or {}
+
+
+def has_changed(instance, fields) -> bool:
+    """
+    Whether the current save is a new row or changes any of fields.
+    """
+    previous = getattr(instance, "_previous_values", None)
+    if previous is None:
+        return True
+    return any(previous[field] != getattr(instance, field) for field in fields)
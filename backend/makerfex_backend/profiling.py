@@ -0,0 +1,308 @@
+# backend/makerfex_backend/profiling.py
+"""
+Opt-in sampling profiler for API requests.
+
+A profiled request gets a sampler thread that snapshots the request thread's
+Python stack every REQUEST_PROFILING_INTERVAL_MS, plus an execute_wrapper
+that records every SQL statement with its duration. When the response is
+ready, the slowest statements are EXPLAINed on the same connection and the
+profile is written to REQUEST_PROFILING_DIR as:
+
+  <id>.json    route, timings, SQL grouped by statement, slowest SQL + plans
+  <id>.folded  collapsed stacks ("frame;frame;frame count"), loadable by
+               flamegraph.pl, speedscope, inferno, ...
+
+`manage.py profile_report` merges saved profiles (optionally for one route)
+into a single folded file and lists the slowest SQL across them.
+
+Which requests are profiled (both default to nothing):
+
+  REQUEST_PROFILING_ROUTES       route labels, as in Server-Timing /
+                                 /api/perf/timings/ ("GlobalSearchView.get",
+                                 "AnalyticsMetricView.get", ...)
+  REQUEST_PROFILING_SAMPLE_RATE  fraction (0-1) of all other requests
+
+Profiled responses carry an X-Profile-Id header naming the files. Only the
+request thread is sampled: work handed to other threads (search's category
+pool, async views' worker threads) shows up as the request thread waiting.
+Profiler can also be used directly around any block (management commands,
+metric computations): `with Profiler() as profiler: ...; profiler.save("name")`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from makerfex_backend.timing import route_label
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MS = 5
+DEFAULT_SLOW_SQL = 5
+
+_UNSAFE_NAME = re.compile(r"[^\w.-]+")
+
+# Profiles are kept as <id>.json + <id>.folded under profile_dir().
+PROFILE_SUFFIX = ".json"
+FOLDED_SUFFIX = ".folded"
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "REQUEST_PROFILING_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def folded_stack(frame) -> str:
+    """
+    Root-to-leaf "module:function;module:function" for frame and its callers.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+_switch_lock = threading.Lock()
+_switch_users = 0
+_switch_default = None
+
+
+def _acquire_switch_interval(interval: float):
+    """
+    Shorten the GIL switch interval (5ms by default) to the sampling interval
+    while any profiler runs; otherwise a busy request thread starves the
+    sampler and short requests come back with no samples.
+    """
+    global _switch_users, _switch_default
+    with _switch_lock:
+        if _switch_users == 0:
+            _switch_default = sys.getswitchinterval()
+        _switch_users += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+
+def _release_switch_interval():
+    global _switch_users
+    with _switch_lock:
+        _switch_users -= 1
+        if _switch_users == 0:
+            sys.setswitchinterval(_switch_default)
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float, stacks: Counter):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = stacks
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[folded_stack(frame)] += 1
+
+
+class _SQLRecorder:
+    def __init__(self, alias: str, statements: list):
+        self.alias = alias
+        self.statements = statements
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append(
+                {
+                    "alias": self.alias,
+                    "sql": sql,
+                    "params": None if many else params,
+                    "ms": (time.perf_counter() - started) * 1000,
+                }
+            )
+
+
+def explain(alias: str, sql: str, params) -> list[str] | None:
+    """
+    The database's plan for sql (EXPLAIN / EXPLAIN QUERY PLAN), one row per
+    line, or None when it can't be explained.
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params or ())
+            return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+    except DatabaseError:
+        return None
+
+
+def group_statements(statements) -> list[dict]:
+    """
+    Statements grouped by SQL text, slowest total first.
+    """
+    groups = {}
+    for statement in statements:
+        group = groups.setdefault(statement["sql"], {"sql": statement["sql"], "count": 0, "total_ms": 0.0})
+        group["count"] += 1
+        group["total_ms"] += statement["ms"]
+    return sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)
+
+
+class Profiler:
+    """
+    Sample the current thread's stack and record its SQL while active.
+    """
+
+    def __init__(self, interval_ms: float | None = None):
+        self.interval_ms = interval_ms or getattr(settings, "REQUEST_PROFILING_INTERVAL_MS", DEFAULT_INTERVAL_MS)
+        self.stacks = Counter()
+        self.statements = []
+        self.elapsed_ms = 0.0
+        self._recorders = []
+        self._sampler = None
+        self._started = None
+
+    def start(self):
+        for alias in connections:
+            recorder = _SQLRecorder(alias, self.statements)
+            connections[alias].execute_wrappers.append(recorder)
+            self._recorders.append((connections[alias], recorder))
+        self._sampler = _StackSampler(threading.get_ident(), self.interval_ms / 1000, self.stacks)
+        _acquire_switch_interval(self.interval_ms / 1000)
+        self._started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self._sampler.stopped.set()
+        self._sampler.join()
+        _release_switch_interval()
+        for connection, recorder in self._recorders:
+            connection.execute_wrappers.remove(recorder)
+        self._recorders = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def slowest_sql(self, limit: int | None = None) -> list[dict]:
+        """
+        The slowest individual statements, each with its EXPLAIN plan.
+        """
+        limit = limit or getattr(settings, "REQUEST_PROFILING_SLOW_SQL", DEFAULT_SLOW_SQL)
+        slowest = sorted(self.statements, key=lambda statement: statement["ms"], reverse=True)[:limit]
+        return [
+            {
+                "sql": statement["sql"],
+                "ms": round(statement["ms"], 3),
+                "plan": explain(statement["alias"], statement["sql"], statement["params"]),
+            }
+            for statement in slowest
+        ]
+
+    def report(self, **meta) -> dict:
+        return {
+            **meta,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "interval_ms": self.interval_ms,
+            "samples": sum(self.stacks.values()),
+            "query_count": len(self.statements),
+            "query_ms": round(sum(statement["ms"] for statement in self.statements), 3),
+            "sql": [
+                {**group, "total_ms": round(group["total_ms"], 3)} for group in group_statements(self.statements)
+            ],
+            "slowest_sql": self.slowest_sql(),
+        }
+
+    def save(self, name: str, **meta) -> str:
+        """
+        Write <id>.json and <id>.folded to profile_dir(); returns the id.
+        """
+        safe_name = _UNSAFE_NAME.sub("_", name)
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name}-{uuid.uuid4().hex[:8]}"
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        report = self.report(id=profile_id, name=name, **meta)
+        (directory / f"{profile_id}{PROFILE_SUFFIX}").write_text(json.dumps(report, indent=2, default=str))
+        (directory / f"{profile_id}{FOLDED_SUFFIX}").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        )
+        logger.info(
+            "Profiled %s in %.1fms: %d samples, %d queries (%.1fms) -> %s",
+            name,
+            self.elapsed_ms,
+            report["samples"],
+            report["query_count"],
+            report["query_ms"],
+            profile_id,
+        )
+        return profile_id
+
+
+def should_profile(route: str | None) -> bool:
+    if route and route in getattr(settings, "REQUEST_PROFILING_ROUTES", ()):
+        return True
+    rate = getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 0)
+    return bool(rate) and random.random() < rate
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile the requests selected by REQUEST_PROFILING_ROUTES /
+    REQUEST_PROFILING_SAMPLE_RATE (see module docstring).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler = getattr(request, "_profiler", None)
+            if profiler is not None:
+                profiler.stop()
+        if profiler is None:
+            return response
+
+        profile_id = profiler.save(
+            request._profile_route,
+            route=request._profile_route,
+            method=request.method,
+            # No query string: it can carry tokens (?access_token= on the change stream).
+            path=request.path,
+            status=response.status_code,
+        )
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        route = route_label(request, view_func)
+        if should_profile(route):
+            request._profile_route = route or "request"
+            request._profiler = Profiler().start()
+        return None
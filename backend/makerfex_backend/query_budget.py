@@ -0,0 +1,183 @@
+# backend/makerfex_backend/query_budget.py
+"""
+Per-action query budgets for API views.
+
+A view declares how many SQL queries one request to an action may run, either
+for several actions at once with a class attribute or on a single method:
+
+  class ProjectViewSet(...):
+      query_budgets = {"list": 8, "retrieve": 8}
+
+      @query_budget(6)
+      @action(detail=True, methods=["post"])
+      def transition(self, request, pk=None): ...
+
+QueryBudgetMiddleware counts every query a budgeted request runs (middleware,
+authentication and the view itself). What happens when a request goes over
+depends on settings.QUERY_BUDGET_MODE:
+
+  - "off" (default): nothing is counted.
+  - "warn": the overrun is logged with the duplicated-SQL report.
+  - "raise": QueryBudgetExceeded is raised, which the test client re-raises,
+    so a test that hits an N+1 fails with the report in its message.
+
+The report groups queries by normalized SQL (parameters and IN lists
+collapsed) and lists the patterns that ran more than once, most frequent
+first; those are almost always the N+1.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_WARN = "warn"
+MODE_RAISE = "raise"
+
+# Duplicated patterns shown in a report.
+REPORT_PATTERNS = 5
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    A request ran more queries than its action's budget allows.
+    """
+
+
+def query_budget(max_queries: int):
+    """
+    Decorator: cap the queries one request to this view method may run.
+    Stacks with @action in either order.
+    """
+
+    def decorate(func):
+        func.query_budget = max_queries
+        return func
+
+    return decorate
+
+
+def get_query_budget(view_cls, action: str | None) -> int | None:
+    """
+    Budget for action on view_cls: query_budgets[action] first, then a
+    @query_budget on the method. None when the action has no budget.
+    """
+    if not action:
+        return None
+    budgets = getattr(view_cls, "query_budgets", None) or {}
+    if action in budgets:
+        return budgets[action]
+    return getattr(getattr(view_cls, action, None), "query_budget", None)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Parameterized SQL with IN lists and whitespace collapsed, so the same
+    query for different rows maps to one pattern.
+    """
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("IN (...)", sql)).strip()
+
+
+def duplicate_report(statements, limit: int = REPORT_PATTERNS) -> list[tuple[int, str]]:
+    """
+    [(count, pattern)] for normalized statements that ran more than once,
+    most frequent first.
+    """
+    counts = Counter(normalize_sql(sql) for sql in statements)
+    return [(count, pattern) for pattern, count in counts.most_common() if count > 1][:limit]
+
+
+def format_overrun(label: str, budget: int, statements) -> str:
+    lines = [f"{label} ran {len(statements)} queries (budget {budget})."]
+    duplicates = duplicate_report(statements)
+    if duplicates:
+        lines.append("Duplicated SQL:")
+        lines.extend(f"  {count}x {pattern}" for count, pattern in duplicates)
+    return "\n".join(lines)
+
+
+class _QueryRecorder:
+    """
+    execute_wrapper that keeps the SQL of every statement it sees.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+
+def _view_action(view_func, method: str) -> str | None:
+    # ViewSet.as_view() records its method -> action map; plain APIViews
+    # dispatch straight to the handler named after the method.
+    actions = getattr(view_func, "actions", None)
+    if actions is not None:
+        return actions.get(method)
+    return method
+
+
+class QueryBudgetMiddleware:
+    """
+    Enforce query budgets declared on views (see module docstring). A no-op
+    unless QUERY_BUDGET_MODE is "warn" or "raise".
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = getattr(settings, "QUERY_BUDGET_MODE", MODE_OFF)
+        if mode not in (MODE_WARN, MODE_RAISE):
+            return self.get_response(request)
+
+        # Queries on other threads' connections (search's worker pool) aren't seen.
+        recorders = []
+        for alias in connections:
+            conn, recorder = connections[alias], _QueryRecorder()
+            conn.execute_wrappers.append(recorder)
+            recorders.append((conn, recorder))
+        request._query_budget_recorders = recorders
+        try:
+            response = self.get_response(request)
+        finally:
+            for conn, recorder in recorders:
+                conn.execute_wrappers.remove(recorder)
+
+        budget = getattr(request, "_query_budget", None)
+        if budget is None:
+            return response
+
+        statements = [sql for _, recorder in recorders for sql in recorder.statements]
+        if len(statements) > budget:
+            label = f"{request.method} {request.path} [{request._query_budget_label}]"
+            message = format_overrun(label, budget, statements)
+            if mode == MODE_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorders = getattr(request, "_query_budget_recorders", None)
+        view_cls = getattr(view_func, "cls", None)
+        if recorders is None or view_cls is None:
+            return None
+
+        action = _view_action(view_func, request.method.lower())
+        budget = get_query_budget(view_cls, action)
+        if budget is None:
+            return None
+        request._query_budget = budget
+        request._query_budget_label = f"{view_cls.__name__}.{action}"
+        return None
@@ -0,0 +1,72 @@
+# backend/makerfex_backend/renderers.py
+"""
+Faster JSON rendering for large list responses.
+
+FastJSONRenderer is a drop-in JSONRenderer whose encoder understands the raw
+values a .values() queryset yields (Decimal, datetime, date, time, UUID) and
+renders them exactly like the DRF serializer fields would:
+
+  Decimal   -> "12.500"  (string, as COERCE_DECIMAL_TO_STRING)
+  datetime  -> "2025-01-01T10:00:00Z"  (converted to the current time zone)
+  date      -> "2025-01-01"
+
+orjson (pinned in requirements.txt) is used for compact output; if it isn't
+installed the stdlib json encoder is used instead. Pretty-printed responses (?indent / browsable API) always
+go through DRF's own rendering.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:  # optional dependency
+  import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+  orjson = None
+
+
+def _format_datetime(value: datetime.datetime) -> str:
+  # Mirrors serializers.DateTimeField.to_representation (ISO 8601, "Z" for UTC).
+  if timezone.is_aware(value):
+    value = timezone.localtime(value)
+  text = value.isoformat()
+  if text.endswith("+00:00"):
+    text = text[:-6] + "Z"
+  return text
+
+
+class FastJSONEncoder(JSONEncoder):
+  def default(self, obj):
+    if isinstance(obj, decimal.Decimal):
+      return format(obj, "f")
+    if isinstance(obj, datetime.datetime):
+      return _format_datetime(obj)
+    return super().default(obj)
+
+
+_fallback_encoder = FastJSONEncoder()
+
+
+def _orjson_default(obj):
+  return _fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+  encoder_class = FastJSONEncoder
+
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if data is None:
+      return b""
+    if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+      return super().render(data, accepted_media_type, renderer_context)
+    # Datetimes pass through to _orjson_default so time zone handling matches DRF.
+    return orjson.dumps(
+      data,
+      default=_orjson_default,
+      option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
@@ -1,8 +1,15 @@
 import re
 import difflib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import partial
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.db.models import Q
+from django.http import JsonResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -12,6 +19,9 @@ from projects.models import Project
 from inventory.models import Material, Consumable, Equipment
 from workflows.models import Workflow
 
+from .async_views import authenticate_jwt, gather_in_threads, pooled_connections
+from .timing import timed
+
 
 def parse_query(raw_q: str):
     """
@@ -82,569 +92,605 @@ def parse_query(raw_q: str):
     return base_q, filters
 
 
-class GlobalSearchView(APIView):
-    permission_classes = [IsAuthenticated]
+def resolve_search_shop(user):
+    """
+    Try multiple ways to resolve the current user's shop.
 
-    def get_shop(self, user):
-        """
-        Try multiple ways to resolve the current user's shop.
-
-        Makerfex likely uses something like:
-          user -> employee -> shop
-
-        We'll try:
-          - user.shop
-          - user.employee.shop
-          - user.profile.shop
-        and fall back to None if nothing is found.
-        """
-        # 1) Direct FK: user.shop
-        try:
-            if getattr(user, "shop", None):
-                return user.shop
-        except Exception:
-            pass
-
-        # 2) Employee relation: user.employee.shop
-        try:
-            employee = getattr(user, "employee", None)
-            if employee and getattr(employee, "shop", None):
-                return employee.shop
-        except Exception:
-            pass
-
-        # 3) Profile-style relation: user.profile.shop
-        try:
-            profile = getattr(user, "profile", None)
-            if profile and getattr(profile, "shop", None):
-                return profile.shop
-        except Exception:
-            pass
-
-        return None
+    Makerfex likely uses something like:
+      user -> employee -> shop
 
-    def get(self, request):
-        user = request.user
-        shop = self.get_shop(user)
+    We'll try:
+      - user.shop
+      - user.employee.shop
+      - user.profile.shop
+    and fall back to None if nothing is found.
+    """
+    # 1) Direct FK: user.shop
+    try:
+        if getattr(user, "shop", None):
+            return user.shop
+    except Exception:
+        pass
+
+    # 2) Employee relation: user.employee.shop
+    try:
+        employee = getattr(user, "employee", None)
+        if employee and getattr(employee, "shop", None):
+            return employee.shop
+    except Exception:
+        pass
+
+    # 3) Profile-style relation: user.profile.shop
+    try:
+        profile = getattr(user, "profile", None)
+        if profile and getattr(profile, "shop", None):
+            return profile.shop
+    except Exception:
+        pass
+
+    return None
+
+
+@dataclass
+class SearchParams:
+    """
+    Everything a search category needs, resolved once per request so the
+    categories can run independently (sequentially, in threads, or async).
+    """
 
+    q: str = ""
+    shop: object = None
+    customer: str = ""
+    project: str = ""
+    inventory: str = ""
+    workflow: str = ""
+    status: str = ""
+    price_value: str | None = None
+    price_op: str | None = None
+
+    @property
+    def restrict_by_shop(self) -> bool:
         # If we can resolve a shop, we restrict by it.
         # If not, we still return results (dev-friendly).
-        restrict_by_shop = shop is not None
-
-        raw_q_param = (request.query_params.get("q") or "").strip()
-        base_q, op_filters = parse_query(raw_q_param)
-
-        # Allow explicit query params to override parsed operators (future-safe)
-        customer_filter = (
-            request.query_params.get("customer")
-            or op_filters.get("customer", "")
-        ).strip()
-        project_filter = (
-            request.query_params.get("project")
-            or op_filters.get("project", "")
-        ).strip()
-        inventory_filter = (
-            request.query_params.get("inventory")
-            or op_filters.get("inventory", "")
-        ).strip()
-        workflow_filter = (
-            request.query_params.get("workflow")
-            or op_filters.get("workflow", "")
-        ).strip()
-        status_filter = (
-            request.query_params.get("status")
-            or op_filters.get("status", "")
-        ).strip()
-
-        price_value = (
-            request.query_params.get("price")
-            or op_filters.get("price_value")
-        )
-        price_op = (
-            request.query_params.get("price_op")
-            or op_filters.get("price_op")
-        )
-
-        q = base_q  # base free-text portion
-
-        # ---- Helper: price lookup mapping ----
-        def apply_price_filter(qs, field_name):
-            if price_value and price_op in (">", "<", ">=", "<=", "="):
-                lookup_map = {
-                    ">": "gt",
-                    "<": "lt",
-                    ">=": "gte",
-                    "<=": "lte",
-                    "=": "exact",
-                }
-                lookup = lookup_map[price_op]
-                qs = qs.filter(**{f"{field_name}__{lookup}": price_value})
-            return qs
-
-        results = []
-        seen = set()  # (type, id-like) to avoid duplicates
-
-        # ==========================
-        #        CUSTOMERS
-        # ==========================
-        customer_qs = Customer.objects.all()
-        if restrict_by_shop:
-            customer_qs = customer_qs.filter(shop=shop)
+        return self.shop is not None
 
+    def base_qs(self, model_cls, active_only=True):
+        qs = model_cls.objects.all()
+        if self.restrict_by_shop:
+            qs = qs.filter(shop=self.shop)
         # Only filter is_active if it exists
-        if hasattr(Customer, "is_active"):
+        if active_only and hasattr(model_cls, "is_active"):
             try:
-                customer_qs = customer_qs.filter(is_active=True)
+                qs = qs.filter(is_active=True)
             except Exception:
                 pass
+        return qs
+
+    def apply_price_filter(self, qs, field_name):
+        if self.price_value and self.price_op in (">", "<", ">=", "<=", "="):
+            lookup_map = {
+                ">": "gt",
+                "<": "lt",
+                ">=": "gte",
+                "<=": "lte",
+                "=": "exact",
+            }
+            lookup = lookup_map[self.price_op]
+            qs = qs.filter(**{f"{field_name}__{lookup}": self.price_value})
+        return qs
+
+
+def build_search_params(query_params, shop) -> SearchParams:
+    raw_q_param = (query_params.get("q") or "").strip()
+    base_q, op_filters = parse_query(raw_q_param)
+
+    # Allow explicit query params to override parsed operators (future-safe)
+    def pick(name):
+        return (query_params.get(name) or op_filters.get(name, "")).strip()
+
+    return SearchParams(
+        q=base_q,  # base free-text portion
+        shop=shop,
+        customer=pick("customer"),
+        project=pick("project"),
+        inventory=pick("inventory"),
+        workflow=pick("workflow"),
+        status=pick("status"),
+        price_value=query_params.get("price") or op_filters.get("price_value"),
+        price_op=query_params.get("price_op") or op_filters.get("price_op"),
+    )
 
-        if q:
-            customer_qs = customer_qs.filter(
-                Q(first_name__icontains=q)
-                | Q(last_name__icontains=q)
-                | Q(email__icontains=q)
-                | Q(company_name__icontains=q)
-            )
 
-        if customer_filter:
-            customer_qs = customer_qs.filter(
-                Q(first_name__icontains=customer_filter)
-                | Q(last_name__icontains=customer_filter)
-                | Q(email__icontains=customer_filter)
-                | Q(company_name__icontains=customer_filter)
-            )
+# ==========================
+#        CATEGORIES
+# ==========================
+# Each category takes SearchParams and returns a list of result dicts. They
+# share no state, so callers are free to run them concurrently.
 
-        customer_qs = customer_qs.order_by("last_name", "first_name")[:5]
 
-        for cust in customer_qs:
-            full_name = f"{cust.first_name} {cust.last_name}".strip()
-            subtitle = cust.email or cust.company_name or ""
-            key = ("customer", cust.id)
-            if key in seen:
-                continue
-            seen.add(key)
-            results.append(
-                {
-                    "id": cust.id,
-                    "type": "customer",
-                    "label": full_name or "Customer",
-                    "subtitle": subtitle,
-                    "url": f"/customers/{cust.id}/",
-                }
-            )
+def search_customers(params: SearchParams) -> list[dict]:
+    q = params.q
+    customer_qs = params.base_qs(Customer)
 
-        # ==========================
-        #          PROJECTS
-        # ==========================
-        project_qs = Project.objects.all()
-        if restrict_by_shop:
-            project_qs = project_qs.filter(shop=shop)
+    if q:
+        customer_qs = customer_qs.filter(
+            Q(first_name__icontains=q)
+            | Q(last_name__icontains=q)
+            | Q(email__icontains=q)
+            | Q(company_name__icontains=q)
+        )
 
-        if hasattr(Project, "is_active"):
-            try:
-                project_qs = project_qs.filter(is_active=True)
-            except Exception:
-                pass
+    if params.customer:
+        customer_qs = customer_qs.filter(
+            Q(first_name__icontains=params.customer)
+            | Q(last_name__icontains=params.customer)
+            | Q(email__icontains=params.customer)
+            | Q(company_name__icontains=params.customer)
+        )
 
-        if q:
-            project_qs = project_qs.filter(
-                Q(name__icontains=q)
-                | Q(description__icontains=q)
-                | Q(reference_code__icontains=q)
-            )
+    results = []
+    for cust in customer_qs.order_by("last_name", "first_name")[:5]:
+        full_name = f"{cust.first_name} {cust.last_name}".strip()
+        results.append(
+            {
+                "id": cust.id,
+                "type": "customer",
+                "label": full_name or "Customer",
+                "subtitle": cust.email or cust.company_name or "",
+                "url": f"/customers/{cust.id}/",
+            }
+        )
+    return results
 
-        if project_filter:
-            project_qs = project_qs.filter(
-                Q(name__icontains=project_filter)
-                | Q(reference_code__icontains=project_filter)
-            )
 
-        if status_filter and hasattr(Project, "status"):
-            project_qs = project_qs.filter(status__icontains=status_filter)
+def _project_subtitle(proj) -> str:
+    subtitle_parts = []
+    if getattr(proj, "reference_code", None):
+        subtitle_parts.append(proj.reference_code)
+    if getattr(proj, "status", None):
+        subtitle_parts.append(proj.status)
+    return " · ".join(subtitle_parts)
 
-        # Using estimated_hours as numeric field for price-style filtering
-        project_qs = apply_price_filter(project_qs, "estimated_hours")
 
-        if hasattr(Project, "updated_at"):
-            project_qs = project_qs.order_by("-updated_at")
-        else:
-            project_qs = project_qs.order_by("-id")
-
-        project_qs = project_qs[:5]
-
-        for proj in project_qs:
-            label = proj.name or "Project"
-            subtitle_parts = []
-            if getattr(proj, "reference_code", None):
-                subtitle_parts.append(proj.reference_code)
-            if getattr(proj, "status", None):
-                subtitle_parts.append(proj.status)
-            subtitle = " · ".join(subtitle_parts)
-            key = ("project", proj.id)
-            if key in seen:
-                continue
-            seen.add(key)
-            results.append(
-                {
-                    "id": proj.id,
-                    "type": "project",
-                    "label": label,
-                    "subtitle": subtitle,
-                    "url": f"/projects/{proj.id}/",
-                }
-            )
+def search_projects(params: SearchParams) -> list[dict]:
+    q = params.q
+    project_qs = params.base_qs(Project)
 
-        # ==========================
-        #    INVENTORY (Materials / Consumables / Equipment)
-        # ==========================
-
-        def base_inventory_qs(model_cls):
-            qs = model_cls.objects.all()
-            if restrict_by_shop:
-                qs = qs.filter(shop=shop)
-            if hasattr(model_cls, "is_active"):
-                try:
-                    qs = qs.filter(is_active=True)
-                except Exception:
-                    pass
-            if q:
-                qs = qs.filter(
-                    Q(name__icontains=q)
-                    | Q(sku__icontains=q)
-                    | Q(description__icontains=q)
-                )
-            if inventory_filter:
-                qs = qs.filter(
-                    Q(name__icontains=inventory_filter)
-                    | Q(sku__icontains=inventory_filter)
-                )
-            qs = apply_price_filter(qs, "unit_cost")
-            return qs.order_by("name")[:5]
+    if q:
+        project_qs = project_qs.filter(
+            Q(name__icontains=q)
+            | Q(description__icontains=q)
+            | Q(reference_code__icontains=q)
+        )
 
-        inventory_items = []
+    if params.project:
+        project_qs = project_qs.filter(
+            Q(name__icontains=params.project)
+            | Q(reference_code__icontains=params.project)
+        )
 
-        for item in base_inventory_qs(Material):
-            key = ("inventory", f"material-{item.id}")
-            if key in seen:
-                continue
-            seen.add(key)
-            inventory_items.append(
-                {
-                    "id": item.id,
-                    "type": "inventory",
-                    "label": getattr(item, "name", "") or "Material",
-                    "subtitle": getattr(item, "sku", "") or "",
-                    "url": f"/inventory/materials/{item.id}/",
-                }
+    if params.status and hasattr(Project, "status"):
+        project_qs = project_qs.filter(status__icontains=params.status)
+
+    # Using estimated_hours as numeric field for price-style filtering
+    project_qs = params.apply_price_filter(project_qs, "estimated_hours")
+
+    if hasattr(Project, "updated_at"):
+        project_qs = project_qs.order_by("-updated_at")
+    else:
+        project_qs = project_qs.order_by("-id")
+
+    return [
+        {
+            "id": proj.id,
+            "type": "project",
+            "label": proj.name or "Project",
+            "subtitle": _project_subtitle(proj),
+            "url": f"/projects/{proj.id}/",
+        }
+        for proj in project_qs[:5]
+    ]
+
+
+# (model, type prefix, detail URL segment, fallback label)
+INVENTORY_SEARCH_MODELS = [
+    (Material, "material", "materials", "Material"),
+    (Consumable, "consumable", "consumables", "Consumable"),
+    (Equipment, "equipment", "equipment", "Equipment"),
+]
+
+
+def search_inventory(params: SearchParams) -> list[dict]:
+    q = params.q
+    inventory_items = []
+
+    for model_cls, _, segment, fallback in INVENTORY_SEARCH_MODELS:
+        qs = params.base_qs(model_cls)
+        if q:
+            qs = qs.filter(
+                Q(name__icontains=q)
+                | Q(sku__icontains=q)
+                | Q(description__icontains=q)
+            )
+        if params.inventory:
+            qs = qs.filter(
+                Q(name__icontains=params.inventory)
+                | Q(sku__icontains=params.inventory)
             )
+        qs = params.apply_price_filter(qs, "unit_cost")
 
-        for item in base_inventory_qs(Consumable):
-            key = ("inventory", f"consumable-{item.id}")
-            if key in seen:
-                continue
-            seen.add(key)
+        for item in qs.order_by("name")[:5]:
             inventory_items.append(
                 {
                     "id": item.id,
                     "type": "inventory",
-                    "label": getattr(item, "name", "") or "Consumable",
+                    "label": getattr(item, "name", "") or fallback,
                     "subtitle": getattr(item, "sku", "") or "",
-                    "url": f"/inventory/consumables/{item.id}/",
+                    "url": f"/inventory/{segment}/{item.id}/",
                 }
             )
 
-        for item in base_inventory_qs(Equipment):
-            key = ("inventory", f"equipment-{item.id}")
-            if key in seen:
+    # Cap inventory slice
+    return inventory_items[:5]
+
+
+def search_workflows(params: SearchParams) -> list[dict]:
+    q = params.q
+    wf_qs = params.base_qs(Workflow)
+
+    if q:
+        wf_qs = wf_qs.filter(
+            Q(name__icontains=q)
+            | Q(description__icontains=q)
+        )
+    if params.workflow:
+        wf_qs = wf_qs.filter(name__icontains=params.workflow)
+
+    return [
+        {
+            "id": wf.id,
+            "type": "workflow",
+            "label": getattr(wf, "name", "") or "Workflow",
+            "subtitle": getattr(wf, "description", "") or "",
+            "url": f"/workflows/{wf.id}/",
+        }
+        for wf in wf_qs.order_by("name")[:5]
+    ]
+
+
+# name -> category, in result order.
+SEARCH_CATEGORIES = {
+    "customers": search_customers,
+    "projects": search_projects,
+    "inventory": search_inventory,
+    "workflows": search_workflows,
+}
+
+
+# ==========================
+#   CONCURRENT EXECUTION
+# ==========================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool shared by all search requests, so concurrent typeahead
+    traffic can't spawn unbounded threads (or DB connections).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SEARCH_MAX_WORKERS,
+                    thread_name_prefix="search",
+                )
+    return _executor
+
+
+def search_deadline_seconds() -> float | None:
+    deadline_ms = settings.SEARCH_DEADLINE_MS
+    return deadline_ms / 1000 if deadline_ms else None
+
+
+def run_search_categories(params: SearchParams) -> tuple[dict, list[str]]:
+    """
+    Run every category on the search pool under one latency budget
+    (SEARCH_DEADLINE_MS, queueing included).
+
+    Returns ({name: results} for categories that finished in time, [names of
+    the ones that didn't]). Late categories keep their worker until their query
+    returns, but the response no longer waits for them. With no budget the
+    categories run inline on the request thread.
+    """
+    timeout = search_deadline_seconds()
+    if timeout is None:
+        return {name: category(params) for name, category in SEARCH_CATEGORIES.items()}, []
+
+    executor = get_search_executor()
+    futures = {
+        name: executor.submit(pooled_connections(partial(category, params)))
+        for name, category in SEARCH_CATEGORIES.items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    by_category = {}
+    partial_names = []
+    for name, future in futures.items():
+        if future.done():
+            by_category[name] = future.result()
+        else:
+            # Not started yet? Then it never will be.
+            future.cancel()
+            partial_names.append(name)
+    return by_category, partial_names
+
+
+def _with_partial_header(response, partial_names):
+    if partial_names:
+        response["X-Search-Partial"] = ",".join(partial_names)
+    return response
+
+
+# ==========================
+#   FUZZY FALLBACK (if no results)
+# ==========================
+
+
+def _recent_candidates(params: SearchParams, model_cls):
+    qs = params.base_qs(model_cls, active_only=False)
+    if hasattr(model_cls, "updated_at"):
+        return qs.order_by("-updated_at")[:100]
+    return qs.order_by("-id")[:100]
+
+
+def fuzzy_search(params: SearchParams) -> list[dict]:
+    q = params.q
+    raw_q = q.strip().lower()
+    if not raw_q or len(raw_q) < 3:
+        return []
+
+    fuzzy_results = []
+
+    # ---- Customers ----
+    cust_labels = []
+    cust_index = {}
+    for c in _recent_candidates(params, Customer):
+        label = f"{c.first_name} {c.last_name}".strip() or (
+            c.email or c.company_name or f"Customer {c.id}"
+        )
+        label_l = label.strip()
+        if not label_l:
+            continue
+        cust_labels.append(label_l)
+        cust_index[label_l] = c
+
+    for match in difflib.get_close_matches(q, cust_labels, n=5, cutoff=0.45):
+        c = cust_index[match]
+        ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
+        fuzzy_results.append(
+            {
+                "id": c.id,
+                "type": "customer",
+                "label": match,
+                "subtitle": c.email or c.company_name or "",
+                "url": f"/customers/{c.id}/",
+                "_fuzzy_score": int(ratio * 70),
+            }
+        )
+
+    # ---- Projects ----
+    proj_labels = []
+    proj_index = {}
+    for p in _recent_candidates(params, Project):
+        label = (p.name or "").strip() or (
+            p.reference_code or f"Project {p.id}"
+        )
+        if not label:
+            continue
+        proj_labels.append(label)
+        proj_index[label] = p
+
+    for match in difflib.get_close_matches(q, proj_labels, n=5, cutoff=0.45):
+        p = proj_index[match]
+        ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
+        fuzzy_results.append(
+            {
+                "id": p.id,
+                "type": "project",
+                "label": match,
+                "subtitle": _project_subtitle(p),
+                "url": f"/projects/{p.id}/",
+                "_fuzzy_score": int(ratio * 70),
+            }
+        )
+
+    # ---- Inventory (Materials, Consumables, Equipment) ----
+    for model_cls, prefix, _, _ in INVENTORY_SEARCH_MODELS:
+        inv_candidates = params.base_qs(model_cls, active_only=False).order_by("-id")[:100]
+
+        labels = []
+        index = {}
+        for it in inv_candidates:
+            label = (getattr(it, "name", "") or "").strip()
+            if not label:
                 continue
-            seen.add(key)
-            inventory_items.append(
+            labels.append(label)
+            index[label] = it
+
+        for match in difflib.get_close_matches(q, labels, n=5, cutoff=0.45):
+            it = index[match]
+            ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
+            fuzzy_results.append(
                 {
-                    "id": item.id,
+                    "id": it.id,
                     "type": "inventory",
-                    "label": getattr(item, "name", "") or "Equipment",
-                    "subtitle": getattr(item, "sku", "") or "",
-                    "url": f"/inventory/equipment/{item.id}/",
+                    "label": match,
+                    "subtitle": getattr(it, "sku", "") or "",
+                    "url": f"/inventory/{prefix}s/{it.id}/",
+                    "_fuzzy_score": int(ratio * 60),
                 }
             )
 
-        # Cap inventory slice
-        results.extend(inventory_items[:5])
+    # ---- Workflows ----
+    wf_candidates = params.base_qs(Workflow, active_only=False).order_by("name")[:100]
+
+    wf_labels = []
+    wf_index = {}
+    for w in wf_candidates:
+        label = (getattr(w, "name", "") or "").strip()
+        if not label:
+            continue
+        wf_labels.append(label)
+        wf_index[label] = w
+
+    for match in difflib.get_close_matches(q, wf_labels, n=5, cutoff=0.45):
+        w = wf_index[match]
+        ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
+        fuzzy_results.append(
+            {
+                "id": w.id,
+                "type": "workflow",
+                "label": match,
+                "subtitle": getattr(w, "description", "") or "",
+                "url": f"/workflows/{w.id}/",
+                "_fuzzy_score": int(ratio * 50),
+            }
+        )
 
-        # ==========================
-        #          WORKFLOWS
-        # ==========================
-        wf_qs = Workflow.objects.all()
-        if restrict_by_shop:
-            wf_qs = wf_qs.filter(shop=shop)
-        if hasattr(Workflow, "is_active"):
-            try:
-                wf_qs = wf_qs.filter(is_active=True)
-            except Exception:
-                pass
+    return fuzzy_results
 
-        if q:
-            wf_qs = wf_qs.filter(
-                Q(name__icontains=q)
-                | Q(description__icontains=q)
-            )
-        if workflow_filter:
-            wf_qs = wf_qs.filter(name__icontains=workflow_filter)
 
-        wf_qs = wf_qs.order_by("name")[:5]
+# ==========================
+#      RELEVANCE SCORING
+# ==========================
 
-        for wf in wf_qs:
-            key = ("workflow", wf.id)
+
+def type_boost(item_type: str) -> int:
+    """
+    Prefer customers > projects > inventory > workflows
+    so that people and active work float to the top.
+    """
+    return {
+        "customer": 30,
+        "project": 20,
+        "inventory": 10,
+        "workflow": 5,
+    }.get((item_type or "").lower(), 0)
+
+
+def compute_score(item: dict, raw_q: str) -> int:
+    """
+    Scoring:
+      - exact label match: 100
+      - startswith label: 80
+      - contains in label: 60
+      - contains in subtitle: 40
+    plus:
+      - type-based boost
+      - any fuzzy bonus (_fuzzy_score)
+    """
+    base = 0
+    label = (item.get("label") or "").lower()
+    subtitle = (item.get("subtitle") or "").lower()
+    t = item.get("type")
+
+    if raw_q:
+        if label == raw_q:
+            base = 100
+        elif label.startswith(raw_q):
+            base = 80
+        elif raw_q in label:
+            base = 60
+        elif raw_q in subtitle:
+            base = 40
+
+    fuzzy_bonus = int(item.get("_fuzzy_score", 0))
+    return base + type_boost(t) + fuzzy_bonus
+
+
+def rank_results(results: list[dict], q: str) -> list[dict]:
+    raw_q = q.strip().lower()
+
+    # Attach scores
+    for item in results:
+        item["_score"] = compute_score(item, raw_q)
+
+    # Sort by score descending
+    results.sort(key=lambda r: r.get("_score", 0), reverse=True)
+
+    # Cap to 15 before returning
+    trimmed = results[:15]
+
+    # Strip internal scoring fields before sending to client
+    for item in trimmed:
+        item.pop("_score", None)
+        item.pop("_fuzzy_score", None)
+    return trimmed
+
+
+def finish_search(params: SearchParams, by_category: dict, partial_names=()) -> list[dict]:
+    """
+    Merge per-category results (in SEARCH_CATEGORIES order), run the fuzzy
+    fallback when nothing matched, and rank.
+    """
+    results = []
+    seen = set()  # (type, id-like) to avoid duplicates
+    for name in SEARCH_CATEGORIES:
+        for item in by_category.get(name) or []:
+            key = (item["type"], item["url"])
             if key in seen:
                 continue
             seen.add(key)
-            results.append(
-                {
-                    "id": wf.id,
-                    "type": "workflow",
-                    "label": getattr(wf, "name", "") or "Workflow",
-                    "subtitle": getattr(wf, "description", "") or "",
-                    "url": f"/workflows/{wf.id}/",
-                }
-            )
+            results.append(item)
 
-        # ==========================
-        #   FUZZY FALLBACK (if no results)
-        # ==========================
-        raw_q = q.strip().lower()
-
-        def add_fuzzy_results():
-            fuzzy_results = []
-
-            if not raw_q or len(raw_q) < 3:
-                return []
-
-            # ---- Customers ----
-            cust_candidates = Customer.objects.all()
-            if restrict_by_shop:
-                cust_candidates = cust_candidates.filter(shop=shop)
-            if hasattr(Customer, "updated_at"):
-                cust_candidates = cust_candidates.order_by("-updated_at")[:100]
-            else:
-                cust_candidates = cust_candidates.order_by("-id")[:100]
-
-            cust_labels = []
-            cust_index = {}
-            for c in cust_candidates:
-                label = f"{c.first_name} {c.last_name}".strip() or (
-                    c.email or c.company_name or f"Customer {c.id}"
-                )
-                label_l = label.strip()
-                if not label_l:
-                    continue
-                cust_labels.append(label_l)
-                cust_index[label_l] = c
-
-            for match in difflib.get_close_matches(q, cust_labels, n=5, cutoff=0.45):
-                c = cust_index[match]
-                key = ("customer", c.id)
-                if key in seen:
-                    continue
-                seen.add(key)
-                ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
-                fuzzy_results.append(
-                    {
-                        "id": c.id,
-                        "type": "customer",
-                        "label": match,
-                        "subtitle": c.email or c.company_name or "",
-                        "url": f"/customers/{c.id}/",
-                        "_fuzzy_score": int(ratio * 70),
-                    }
-                )
+    # Only run fuzzy fallback if we have a base query and no normal matches
+    # (a category that missed the deadline may well have had some).
+    if params.q and len(results) == 0 and not partial_names:
+        results.extend(fuzzy_search(params))
 
-            # ---- Projects ----
-            proj_candidates = Project.objects.all()
-            if restrict_by_shop:
-                proj_candidates = proj_candidates.filter(shop=shop)
-            if hasattr(Project, "updated_at"):
-                proj_candidates = proj_candidates.order_by("-updated_at")[:100]
-            else:
-                proj_candidates = proj_candidates.order_by("-id")[:100]
-
-            proj_labels = []
-            proj_index = {}
-            for p in proj_candidates:
-                label = (p.name or "").strip() or (
-                    p.reference_code or f"Project {p.id}"
-                )
-                if not label:
-                    continue
-                proj_labels.append(label)
-                proj_index[label] = p
-
-            for match in difflib.get_close_matches(q, proj_labels, n=5, cutoff=0.45):
-                p = proj_index[match]
-                key = ("project", p.id)
-                if key in seen:
-                    continue
-                seen.add(key)
-                ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
-                subtitle_parts = []
-                if getattr(p, "reference_code", None):
-                    subtitle_parts.append(p.reference_code)
-                if getattr(p, "status", None):
-                    subtitle_parts.append(p.status)
-                subtitle = " · ".join(subtitle_parts)
-                fuzzy_results.append(
-                    {
-                        "id": p.id,
-                        "type": "project",
-                        "label": match,
-                        "subtitle": subtitle,
-                        "url": f"/projects/{p.id}/",
-                        "_fuzzy_score": int(ratio * 70),
-                    }
-                )
+    return rank_results(results, params.q)
 
-            # ---- Inventory (Materials, Consumables, Equipment) ----
-            def fuzzy_inventory(model_cls, prefix):
-                local_results = []
-                inv_candidates = model_cls.objects.all()
-                if restrict_by_shop:
-                    inv_candidates = inv_candidates.filter(shop=shop)
-                inv_candidates = inv_candidates.order_by("-id")[:100]
-
-                labels = []
-                index = {}
-                for it in inv_candidates:
-                    label = (getattr(it, "name", "") or "").strip()
-                    if not label:
-                        continue
-                    labels.append(label)
-                    index[label] = it
-
-                for match in difflib.get_close_matches(q, labels, n=5, cutoff=0.45):
-                    it = index[match]
-                    key = ("inventory", f"{prefix}-{it.id}")
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
-                    local_results.append(
-                        {
-                            "id": it.id,
-                            "type": "inventory",
-                            "label": match,
-                            "subtitle": getattr(it, "sku", "") or "",
-                            "url": f"/inventory/{prefix}s/{it.id}/",
-                            "_fuzzy_score": int(ratio * 60),
-                        }
-                    )
-                return local_results
-
-            fuzzy_results.extend(fuzzy_inventory(Material, "material"))
-            fuzzy_results.extend(fuzzy_inventory(Consumable, "consumable"))
-            fuzzy_results.extend(fuzzy_inventory(Equipment, "equipment"))
-
-            # ---- Workflows ----
-            wf_candidates = Workflow.objects.all()
-            if restrict_by_shop:
-                wf_candidates = wf_candidates.filter(shop=shop)
-            wf_candidates = wf_candidates.order_by("name")[:100]
-
-            wf_labels = []
-            wf_index = {}
-            for w in wf_candidates:
-                label = (getattr(w, "name", "") or "").strip()
-                if not label:
-                    continue
-                wf_labels.append(label)
-                wf_index[label] = w
-
-            for match in difflib.get_close_matches(q, wf_labels, n=5, cutoff=0.45):
-                w = wf_index[match]
-                key = ("workflow", w.id)
-                if key in seen:
-                    continue
-                seen.add(key)
-                ratio = SequenceMatcher(None, q.lower(), match.lower()).ratio()
-                fuzzy_results.append(
-                    {
-                        "id": w.id,
-                        "type": "workflow",
-                        "label": match,
-                        "subtitle": getattr(w, "description", "") or "",
-                        "url": f"/workflows/{w.id}/",
-                        "_fuzzy_score": int(ratio * 50),
-                    }
-                )
 
-            return fuzzy_results
-
-        # Only run fuzzy fallback if we have a base query and no normal matches
-        if q and len(results) == 0:
-            results.extend(add_fuzzy_results())
-
-        # ==========================
-        #      RELEVANCE SCORING
-        # ==========================
-
-        raw_q = q.strip().lower()
-
-        def type_boost(item_type: str) -> int:
-            """
-            Prefer customers > projects > inventory > workflows
-            so that people and active work float to the top.
-            """
-            return {
-                "customer": 30,
-                "project": 20,
-                "inventory": 10,
-                "workflow": 5,
-            }.get((item_type or "").lower(), 0)
-
-        def compute_score(item: dict) -> int:
-            """
-            Scoring:
-              - exact label match: 100
-              - startswith label: 80
-              - contains in label: 60
-              - contains in subtitle: 40
-            plus:
-              - type-based boost
-              - any fuzzy bonus (_fuzzy_score)
-            """
-            base = 0
-            label = (item.get("label") or "").lower()
-            subtitle = (item.get("subtitle") or "").lower()
-            t = item.get("type")
-
-            if raw_q:
-                if label == raw_q:
-                    base = 100
-                elif label.startswith(raw_q):
-                    base = 80
-                elif raw_q in label:
-                    base = 60
-                elif raw_q in subtitle:
-                    base = 40
-                else:
-                    base = 0
-            else:
-                base = 0
-
-            fuzzy_bonus = int(item.get("_fuzzy_score", 0))
-            return base + type_boost(t) + fuzzy_bonus
-
-        # Attach scores
-        for item in results:
-            item["_score"] = compute_score(item)
-
-        # Sort by score descending
-        results.sort(key=lambda r: r.get("_score", 0), reverse=True)
-
-        # Cap to 15 before returning
-        trimmed = results[:15]
-
-        # Strip internal scoring fields before sending to client
-        for item in trimmed:
-            item.pop("_score", None)
-            item.pop("_fuzzy_score", None)
-
-        return Response(trimmed, status=200)
+class GlobalSearchView(APIView):
+    """
+    Typeahead search across customers, projects, inventory and workflows.
+
+    Categories run concurrently under SEARCH_DEADLINE_MS; any that miss it are
+    left out and named in the X-Search-Partial response header.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_shop(self, user):
+        with timed("tenant"):
+            return resolve_search_shop(user)
+
+    def get(self, request):
+        params = build_search_params(request.query_params, self.get_shop(request.user))
+        by_category, partial_names = run_search_categories(params)
+        response = Response(finish_search(params, by_category, partial_names), status=200)
+        return _with_partial_header(response, partial_names)
+
+
+async def global_search_async(request):
+    """
+    ASGI-native GlobalSearchView: same parameters, response and deadline, but
+    the categories are fanned out from the event loop (see async_views).
+    """
+    user = await sync_to_async(authenticate_jwt)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    shop = await sync_to_async(resolve_search_shop)(user)
+    params = build_search_params(request.GET, shop)
+    by_category = await gather_in_threads(
+        {name: partial(category, params) for name, category in SEARCH_CATEGORIES.items()},
+        timeout=search_deadline_seconds(),
+    )
+    partial_names = [name for name in SEARCH_CATEGORIES if name not in by_category]
+    results = await sync_to_async(finish_search)(params, by_category, partial_names)
+    return _with_partial_header(JsonResponse(results, safe=False), partial_names)
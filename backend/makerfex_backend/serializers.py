@@ -0,0 +1,164 @@
+# backend/makerfex_backend/serializers.py
+"""
+Reusable serializer building blocks for server-driven tables.
+
+SparseFieldsetSerializerMixin lets a list/detail response carry only what the
+client renders:
+
+  ?fields=id,name,status      whitelist of top-level fields
+  ?omit=description,notes     drop top-level fields
+  ?expand=material_snapshots  opt into heavy fields listed in Meta.expandable_fields
+
+Expandable fields are left out by default; views can expand them for detail
+actions via serializer context (context["expand"] = "__all__" or a list).
+
+Only applies to the top-level serializer of a safe (GET/HEAD) request; nested
+serializers and write payloads are untouched.
+"""
+
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from makerfex_backend.timing import timed
+
+EXPAND_ALL = "__all__"
+
+
+def parse_field_list(value) -> list[str]:
+  """
+  Parse "a,b , c" -> ["a", "b", "c"] (order preserved, blanks dropped).
+  """
+  if not value:
+    return []
+  return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def get_requested_fields(request) -> list[str]:
+  if request is None:
+    return []
+  return parse_field_list(request.query_params.get("fields"))
+
+
+def get_requested_omit(request) -> list[str]:
+  if request is None:
+    return []
+  return parse_field_list(request.query_params.get("omit"))
+
+
+def has_sparse_params(request) -> bool:
+  if request is None:
+    return False
+  qp = request.query_params
+  return bool(qp.get("fields") or qp.get("omit"))
+
+
+def get_requested_expand(request) -> list[str]:
+  if request is None:
+    return []
+  return parse_field_list(request.query_params.get("expand"))
+
+
+class SparseFieldsetSerializerMixin:
+  """
+  Mixin for ModelSerializers used by server-driven table endpoints.
+
+  Meta options:
+    expandable_fields: fields only serialized when expanded (?expand= / context)
+    field_dependencies: {method_field_name: [model field names it reads]}, used by
+      SparseFieldsetViewSetMixin to defer() columns no serialized field needs.
+      A SerializerMethodField without an entry disables narrowing.
+  """
+
+  def _is_top_level(self) -> bool:
+    parent = self.parent
+    if parent is None:
+      return True
+    return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+  def _sparse_request(self):
+    request = self.context.get("request")
+    if request is None or request.method not in ("GET", "HEAD"):
+      return None
+    return request
+
+  def get_expanded_field_names(self) -> set[str]:
+    expandable = set(getattr(self.Meta, "expandable_fields", ()))
+    if not expandable:
+      return set()
+
+    if self.context.get("request") is None:
+      # Internal use (no request): keep the full representation.
+      return expandable
+
+    expand = self.context.get("expand") or ()
+    if expand == EXPAND_ALL:
+      return expandable
+
+    requested = set(expand)
+    request = self._sparse_request()
+    if request is not None:
+      requested.update(get_requested_expand(request))
+      # Naming an expandable field in ?fields= implies expanding it.
+      requested.update(get_requested_fields(request))
+    return expandable & requested
+
+  def get_sparse_field_names(self, available) -> list[str] | None:
+    """
+    Return the top-level field names to serialize, or None for "all".
+    """
+    request = self._sparse_request()
+    requested = get_requested_fields(request) if request is not None else []
+    requested = [name for name in requested if name in available]
+    return requested or None
+
+  def get_fields(self):
+    fields = super().get_fields()
+    if not self._is_top_level():
+      return fields
+
+    expandable = set(getattr(self.Meta, "expandable_fields", ()))
+    expanded = self.get_expanded_field_names()
+    for name in expandable - expanded:
+      fields.pop(name, None)
+
+    keep = self.get_sparse_field_names(fields)
+    if keep is not None:
+      keep = set(keep) | expanded
+      for name in list(fields):
+        if name not in keep:
+          fields.pop(name)
+
+    request = self._sparse_request()
+    if request is not None:
+      for name in get_requested_omit(request):
+        fields.pop(name, None)
+
+    return fields
+
+  def to_representation(self, instance):
+    # Shows up as "serialize" in the Server-Timing header (nested calls count once).
+    with timed("serialize"):
+      return super().to_representation(instance)
+
+  def get_required_model_fields(self) -> set[str] | None:
+    """
+    Model field names (first path segment) the serialized fields read, or None
+    if that can't be determined safely.
+    """
+    dependencies = getattr(self.Meta, "field_dependencies", {})
+    required: set[str] = set()
+    for name, field in self.fields.items():
+      if isinstance(field, serializers.SerializerMethodField):
+        if name not in dependencies:
+          return None
+        required.update(dependencies[name])
+        continue
+      if isinstance(field, serializers.BaseSerializer):
+        # Nested reverse relations (lines, stages, snapshots) load via the pk.
+        continue
+      source = getattr(field, "source", None) or name
+      if source == "*":
+        return None
+      required.add(source.split(".")[0])
+    return required
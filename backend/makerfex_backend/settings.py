@@ -61,6 +61,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "makerfex_backend.timing.RequestTimingMiddleware",
+    "makerfex_backend.profiling.RequestProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -69,6 +71,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "makerfex_backend.query_budget.QueryBudgetMiddleware",
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -172,4 +175,81 @@ SPECTACULAR_SETTINGS = {
 }
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / "media"
+
+# Inventory writes
+# - INVENTORY_OPTIMISTIC_UPDATES: use conditional F() updates instead of row locks
+#   in apply_inventory_transaction (see inventory/services.py).
+# - INVENTORY_WRITE_MAX_ATTEMPTS: bounded retry for transient write conflicts.
+# - INVENTORY_BUFFER_MAX_ABS_DELTA: largest delta accepted by buffered (write-behind)
+#   consumption; flushed by `manage.py flush_inventory_buffer`.
+INVENTORY_OPTIMISTIC_UPDATES = False
+INVENTORY_WRITE_MAX_ATTEMPTS = 5
+INVENTORY_BUFFER_MAX_ABS_DELTA = 5
+
+# Per-shop change versions (makerfex_backend/versions.py).
+# - CHANGE_VERSIONS_CACHE: cache alias holding the counters; must be shared by all
+#   workers (e.g. Redis). None keeps them in the config.ChangeVersion table.
+CHANGE_VERSIONS_CACHE = None
+
+# Change feed (makerfex_backend/changes.py)
+# - CHANGE_FEED_SETTLE_SECONDS: rows younger than this are held back for the next
+#   scan, so late-committing transactions can't slip behind a cursor.
+# - CHANGE_FEED_POLL_SECONDS: how often long-poll/SSE requests check versions.
+# - CHANGE_FEED_MAX_WAIT_SECONDS: cap for ?wait= on the long-poll endpoint. A
+#   waiting long-poll holds a sync worker, so keep it short; long-lived
+#   listeners belong on the SSE stream.
+# - CHANGE_FEED_HEARTBEAT_SECONDS / CHANGE_FEED_STREAM_SECONDS: SSE keepalive
+#   interval and stream lifetime (clients reconnect with Last-Event-ID).
+CHANGE_FEED_SETTLE_SECONDS = 1
+CHANGE_FEED_POLL_SECONDS = 1
+CHANGE_FEED_MAX_WAIT_SECONDS = 5
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+CHANGE_FEED_STREAM_SECONDS = 300
+
+# Async read views (makerfex_backend/async_views.py)
+# - ASYNC_READ_VIEWS: serve /api/search/ and /api/analytics/metrics/ with the
+#   coroutine views, which fan their independent queries out concurrently. Turn
+#   on for ASGI deployments; under WSGI each request pays an event-loop hop.
+# - ASYNC_READ_PARALLEL_QUERIES: run each fanned-out query on its own worker
+#   thread/connection. False keeps them on the request's thread (no overlap).
+ASYNC_READ_VIEWS = False
+ASYNC_READ_PARALLEL_QUERIES = True
+
+# Global search (makerfex_backend/search.py)
+# - SEARCH_DEADLINE_MS: latency budget for all categories together; categories
+#   that miss it are dropped and listed in X-Search-Partial. 0 runs them inline,
+#   one after another, with no budget.
+# - SEARCH_MAX_WORKERS: size of the shared category pool (and so the number of
+#   extra DB connections search can hold per process). Pool threads follow
+#   DATABASES CONN_MAX_AGE / CONN_HEALTH_CHECKS: with the default max age of 0
+#   each category reconnects.
+SEARCH_DEADLINE_MS = 150
+SEARCH_MAX_WORKERS = 8
+
+# Request timing (makerfex_backend/timing.py)
+# - REQUEST_TIMING: add Server-Timing headers (db / tenant / serialize / total) and
+#   keep per-route latency windows, reported at /api/perf/timings/ (staff only).
+# - REQUEST_TIMING_WINDOW: requests kept per route (per process) for percentiles.
+REQUEST_TIMING = True
+REQUEST_TIMING_WINDOW = 500
+
+# Sampling profiler (makerfex_backend/profiling.py)
+# - REQUEST_PROFILING_ROUTES: route labels to always profile, e.g.
+#   ["GlobalSearchView.get", "AnalyticsMetricView.get"].
+# - REQUEST_PROFILING_SAMPLE_RATE: fraction (0-1) of other requests to profile.
+# - REQUEST_PROFILING_INTERVAL_MS: stack sampling interval.
+# - REQUEST_PROFILING_SLOW_SQL: slowest statements EXPLAINed per profile.
+# - REQUEST_PROFILING_DIR: where <id>.json / <id>.folded profiles are written
+#   (merge them with `manage.py profile_report`).
+REQUEST_PROFILING_ROUTES = []
+REQUEST_PROFILING_SAMPLE_RATE = 0
+REQUEST_PROFILING_INTERVAL_MS = 5
+REQUEST_PROFILING_SLOW_SQL = 5
+REQUEST_PROFILING_DIR = BASE_DIR / "profiles"
+
+# Query budgets (makerfex_backend/query_budget.py)
+# - QUERY_BUDGET_MODE: what a request over its view's declared query budget does:
+#   "off" (not counted), "warn" (logged with the duplicated SQL) or "raise"
+#   (QueryBudgetExceeded; the test suite runs in this mode).
+QUERY_BUDGET_MODE = "off"
@@ -0,0 +1,236 @@
+# backend/makerfex_backend/timing.py
+"""
+Per-request timing: Server-Timing headers and rolling per-route percentiles.
+
+RequestTimingMiddleware times each request and breaks it down into:
+
+  db         queries on the request thread's connections (count + time)
+  tenant     shop resolution (get_shop_for_user and friends)
+  serialize  top-level serializer to_representation (includes any queries
+             it triggers, which therefore also show up under db)
+  total      the whole middleware chain
+
+Code elsewhere adds a phase with `with timed("tenant"): ...`; outside a timed
+request that's a no-op. The breakdown goes out as a Server-Timing header
+(visible in the browser's network panel):
+
+  Server-Timing: db;dur=4.1;desc="8 queries", tenant;dur=0.6, serialize;dur=3.2, total;dur=11.9
+
+and every request is also added to an in-process rolling window per route
+("ProjectViewSet.list", "GlobalSearchView.get", or the URL name for function
+views). GET /api/perf/timings/ (staff only) reports p50/p95/p99 per route;
+DELETE clears the windows. Each worker process keeps its own windows.
+
+Queries run on other threads (search's category pool) aren't counted under db.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Server-Timing metric names, in header order (total is always last).
+PHASES = ("db", "tenant", "serialize")
+
+DEFAULT_WINDOW = 500
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Accumulated seconds per phase (and the query count) for one request.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.open_phases = set()
+
+    def add(self, phase: str, seconds: float):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: time every statement on the wrapped connection.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds["db"] += time.perf_counter() - started
+            self.queries += 1
+
+
+class timed:
+    """
+    Context manager adding the enclosed block's wall time to phase of the
+    current request. Re-entrant blocks of the same phase count once.
+    """
+
+    __slots__ = ("phase", "timings", "started")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        timings = _current.get()
+        if timings is not None and self.phase in timings.open_phases:
+            timings = None  # nested in the same phase: the outer block counts it
+        self.timings = timings
+        if timings is not None:
+            timings.open_phases.add(self.phase)
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings.add(self.phase, time.perf_counter() - self.started)
+            self.timings.open_phases.discard(self.phase)
+        return False
+
+
+def percentile(values, pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted, non-empty sequence.
+    """
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def _summary(values) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class RouteTimingStore:
+    """
+    Thread-safe rolling window of (total_ms, db_ms, queries) samples per route.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+
+    def record(self, route: str, total_ms: float, db_ms: float, queries: int):
+        window = getattr(settings, "REQUEST_TIMING_WINDOW", DEFAULT_WINDOW)
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None or samples.maxlen != window:
+                samples = self._samples[route] = deque(samples or (), maxlen=window)
+            samples.append((total_ms, db_ms, queries))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            copies = {route: list(samples) for route, samples in self._samples.items()}
+        return {
+            route: {
+                "count": len(samples),
+                "total_ms": _summary([sample[0] for sample in samples]),
+                "db_ms": _summary([sample[1] for sample in samples]),
+                "queries": _summary([sample[2] for sample in samples]),
+            }
+            for route, samples in sorted(copies.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+route_timings = RouteTimingStore()
+
+
+def server_timing_header(timings: RequestTimings, total_seconds: float) -> str:
+    parts = []
+    for phase in PHASES:
+        ms = timings.seconds[phase] * 1000
+        if phase == "db":
+            parts.append(f'db;dur={ms:.1f};desc="{timings.queries} queries"')
+        elif ms:
+            parts.append(f"{phase};dur={ms:.1f}")
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def route_label(request, view_func) -> str | None:
+    """
+    "ViewSet.action" / "APIView.method", or the URL name for function views.
+    """
+    view_cls = getattr(view_func, "cls", None)
+    method = request.method.lower()
+    if view_cls is not None:
+        actions = getattr(view_func, "actions", None)
+        action = actions.get(method) if actions is not None else method
+        return f"{view_cls.__name__}.{action or method}"
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else None
+
+
+class RequestTimingMiddleware:
+    """
+    Time each request (see module docstring). Disabled by REQUEST_TIMING = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "REQUEST_TIMING", True):
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        wrapped = [connections[alias] for alias in connections]
+        for conn in wrapped:
+            conn.execute_wrappers.append(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            total = time.perf_counter() - started
+            for conn in wrapped:
+                conn.execute_wrappers.remove(timings)
+            _current.reset(token)
+
+        response["Server-Timing"] = server_timing_header(timings, total)
+        route = getattr(request, "_timing_route", None)
+        if route:
+            route_timings.record(route, total * 1000, timings.seconds["db"] * 1000, timings.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timing_route = route_label(request, view_func)
+        return None
+
+
+class RequestTimingsView(APIView):
+    """
+    Rolling per-route latency percentiles for this process (staff only).
+    DELETE starts new windows.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "window": getattr(settings, "REQUEST_TIMING_WINDOW", DEFAULT_WINDOW),
+                "routes": route_timings.snapshot(),
+            }
+        )
+
+    def delete(self, request):
+        route_timings.reset()
+        return Response(status=204)
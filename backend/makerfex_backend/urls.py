@@ -3,8 +3,18 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from .search import GlobalSearchView
-from analytics.views import AnalyticsMetricView
+from .changes import ChangeFeedView, change_stream
+from .search import GlobalSearchView, global_search_async
+from .timing import RequestTimingsView
+from analytics.views import AnalyticsMetricView, analytics_metrics_async
+
+# Read-heavy endpoints with an ASGI-native implementation (see settings.ASYNC_READ_VIEWS).
+if settings.ASYNC_READ_VIEWS:
+    metrics_view = analytics_metrics_async
+    search_view = global_search_async
+else:
+    metrics_view = AnalyticsMetricView.as_view()
+    search_view = GlobalSearchView.as_view()
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -20,12 +30,15 @@ urlpatterns = [
     # Global dashboard metrics endpoint
     path(
         "api/analytics/metrics/",
-        AnalyticsMetricView.as_view(),
+        metrics_view,
         name="dashboard-metric",
     ),
 
     # Domain APIs
-    path("api/search/", GlobalSearchView.as_view(), name="global-search"),
+    path("api/search/", search_view, name="global-search"),
+    path("api/changes/", ChangeFeedView.as_view(), name="change-feed"),
+    path("api/changes/stream/", change_stream, name="change-stream"),
+    path("api/perf/timings/", RequestTimingsView.as_view(), name="request-timings"),
     path("api/accounts/", include("accounts.urls")),
     path("api/customers/", include("customers.urls")),
     path("api/workflows/", include("workflows.urls")),
@@ -0,0 +1,266 @@
+# backend/makerfex_backend/versions.py
+"""
+Per-shop, per-model change versions.
+
+A shared invalidation primitive: every TimeStampedModel has a monotonic counter
+per shop that is bumped whenever one of its rows is saved or deleted. Anything
+that caches (ETags, search, metrics, counts) compares counters instead of
+re-querying data:
+
+  versions = get_versions(shop.id, [Project, Customer])
+  # {"projects.project": 12, "customers.customer": 3}
+
+Storage:
+  - default: config.ChangeVersion rows (one indexed query per get_versions()).
+  - settings.CHANGE_VERSIONS_CACHE = "<cache alias>": counters live in that
+    (shared) cache instead, read with a single get_many(). Missing counters are
+    seeded from the clock, so an evicted/flushed counter never reuses a value.
+
+Bumps are applied after the surrounding transaction commits, so no counter row
+lock is held while the domain write is open.
+
+Writes that bypass save()/delete() (queryset.update(), bulk_create(), F()
+expressions) must call bump_versions() themselves.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+# label -> dotted path from an instance to its shop id (see track_model_versions).
+_tracked: dict[str, str] = {}
+
+
+def model_label(model) -> str:
+  """
+  "projects.project" for a model class/instance; strings pass through lower-cased.
+  """
+  if isinstance(model, str):
+    return model.lower()
+  return model._meta.label_lower
+
+
+def _version_model():
+  return apps.get_model("config", "ChangeVersion")
+
+
+def _version_cache():
+  alias = getattr(settings, "CHANGE_VERSIONS_CACHE", None)
+  return caches[alias] if alias else None
+
+
+def _cache_key(shop_id, label) -> str:
+  return f"makerfex:changever:{shop_id}:{label}"
+
+
+def _clock_seed() -> int:
+  # Microseconds: larger than any counter value handed out before an eviction.
+  return time.time_ns() // 1000
+
+
+def _bump_cached(cache, shop_id, label):
+  key = _cache_key(shop_id, label)
+  try:
+    cache.incr(key)
+  except ValueError:
+    if not cache.add(key, _clock_seed() + 1, timeout=None):
+      cache.incr(key)
+
+
+def _bump_db(shop_id, label):
+  ChangeVersion = _version_model()
+  filters = {"shop_id": shop_id, "model_label": label}
+  if ChangeVersion.objects.filter(**filters).update(version=F("version") + 1):
+    return
+  if not apps.get_model("accounts", "Shop").objects.filter(pk=shop_id).exists():
+    # Rows deleted along with their shop: nothing left to version.
+    return
+  try:
+    with transaction.atomic():
+      ChangeVersion.objects.create(version=1, **filters)
+  except IntegrityError:
+    # A concurrent first bump won the insert.
+    ChangeVersion.objects.filter(**filters).update(version=F("version") + 1)
+
+
+def _apply_bumps(keys):
+  cache = _version_cache()
+  for key in sorted(keys):
+    try:
+      if cache is not None:
+        _bump_cached(cache, *key)
+      else:
+        _bump_db(*key)
+    except Exception:
+      # The domain write already committed; never surface this to the caller
+      # (it would look like the write failed and invite a retry).
+      logger.warning("Change-version bump for %s failed.", key, exc_info=True)
+
+
+def bump_versions(shop_id, *models):
+  """
+  Mark the given models as changed for shop_id once the current transaction
+  commits (immediately in autocommit mode). Callbacks registered inside a
+  rolled-back transaction/savepoint are discarded along with the write.
+  """
+  if not shop_id or not models:
+    return
+  keys = {(shop_id, model_label(m)) for m in models}
+  transaction.on_commit(partial(_apply_bumps, keys))
+
+
+def get_versions(shop_id, models) -> dict[str, int]:
+  """
+  Current counters for models, in one cache or DB round trip.
+
+  With the DB store never-bumped models read as 0; with the cache store they
+  are seeded on first read.
+  """
+  labels = [model_label(m) for m in models]
+  versions = dict.fromkeys(labels, 0)
+  if not shop_id or not labels:
+    return versions
+
+  cache = _version_cache()
+  if cache is None:
+    rows = _version_model().objects.filter(shop_id=shop_id, model_label__in=labels).values_list(
+      "model_label", "version"
+    )
+    versions.update(rows)
+    return versions
+
+  keys = {_cache_key(shop_id, label): label for label in labels}
+  found = cache.get_many(list(keys))
+  missing = [key for key in keys if key not in found]
+  if missing:
+    seed = _clock_seed()
+    for key in missing:
+      cache.add(key, seed, timeout=None)
+    found.update(cache.get_many(missing))
+  for key, label in keys.items():
+    versions[label] = found.get(key, 0)
+  return versions
+
+
+# (parent model label, parent pk) -> shop id, for models scoped through a
+# parent. Parents never move between shops, so entries don't go stale.
+_PARENT_SHOP_CACHE_SIZE = 10000
+_parent_shops: dict[tuple[str, object], int] = {}
+_parent_shops_lock = threading.Lock()
+
+
+def _parent_shop_id(parent_model, parent_pk, shop_attname: str):
+  key = (model_label(parent_model), parent_pk)
+  shop_id = _parent_shops.get(key)
+  if shop_id is not None:
+    return shop_id
+  shop_id = parent_model._base_manager.filter(pk=parent_pk).values_list(shop_attname, flat=True).first()
+  if shop_id is not None:
+    with _parent_shops_lock:
+      if len(_parent_shops) >= _PARENT_SHOP_CACHE_SIZE:
+        _parent_shops.clear()
+      _parent_shops[key] = shop_id
+  return shop_id
+
+
+def _shop_id_resolver(model, shop_attr: str):
+  """
+  instance -> shop id for shop_attr. For "parent.shop_id" paths this reads
+  the parent's FK id and looks its shop up once per parent (or uses the
+  parent if it's already loaded) instead of lazy-loading the parent row on
+  every save/delete, which made cascade deletes N+1.
+  """
+  head, _, rest = shop_attr.partition(".")
+  if not rest:
+    return lambda instance: getattr(instance, head, None)
+
+  field = model._meta.get_field(head)
+
+  def resolve(instance):
+    if field.is_cached(instance):
+      parent = field.get_cached_value(instance)
+      return getattr(parent, rest, None) if parent is not None else None
+    parent_pk = getattr(instance, field.attname)
+    if parent_pk is None:
+      return None
+    return _parent_shop_id(field.related_model, parent_pk, rest)
+
+  return resolve
+
+
+def track_model_versions(model, shop_attr: str = "shop_id"):
+  """
+  Bump model's counter on post_save/post_delete.
+
+  shop_attr is a dotted attribute path from an instance to its shop id, e.g.
+  "workflow.shop_id" for models scoped through a parent.
+  """
+  resolve_shop_id = _shop_id_resolver(model, shop_attr)
+
+  def _on_change(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+      return
+    bump_versions(resolve_shop_id(instance), sender)
+
+  label = model_label(model)
+  _tracked[label] = shop_attr
+  uid = f"makerfex-versions:{label}"
+  post_save.connect(_on_change, sender=model, weak=False, dispatch_uid=uid)
+  post_delete.connect(_on_change, sender=model, weak=False, dispatch_uid=uid)
+
+
+def shop_path_for_model(model, depth: int = 2) -> str | None:
+  """
+  Dotted path from an instance of model to its shop id, or None.
+
+  Prefers a direct FK to Shop; otherwise follows forward FKs (up to depth hops)
+  to a model that has one, e.g. WorkflowStage -> "workflow.shop_id".
+  """
+  Shop = apps.get_model("accounts", "Shop")
+  if model is Shop:
+    return "pk"
+
+  fks = [f for f in model._meta.concrete_fields if f.many_to_one or f.one_to_one]
+  for field in sorted(fks, key=lambda f: f.name != "shop"):
+    if field.related_model is Shop:
+      return field.attname
+  if depth > 1:
+    for field in fks:
+      parent = shop_path_for_model(field.related_model, depth - 1)
+      if parent and parent != "pk":
+        return f"{field.name}.{parent}"
+  return None
+
+
+def track_timestamped_models():
+  """
+  Track every concrete TimeStampedModel whose rows resolve to a shop.
+  Called once from the config app's ready().
+  """
+  from accounts.models import TimeStampedModel
+
+  for model in apps.get_models():
+    if not issubclass(model, TimeStampedModel):
+      continue
+    shop_attr = shop_path_for_model(model)
+    if shop_attr:
+      track_model_versions(model, shop_attr)
+
+
+def get_tracked_models() -> dict[str, str]:
+  """
+  {model label: shop path} for every model with a change version.
+  """
+  return dict(_tracked)
@@ -37,7 +37,14 @@ class ProductTemplateViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, v
     queryset = ProductTemplate.objects.all()
 
     http_method_names = ["get", "post", "put", "patch", "delete", "head", "options"]
-    ...
+
+    search_fields = ["name", "slug", "description"]
+    ordering_fields = ["id", "name", "base_price", "estimated_hours", "is_active", "created_at", "updated_at"]
+    ordering = ("name", "id")
+    query_budgets = {"list": 5, "retrieve": 4}
+
+    def get_shop_queryset(self, shop):
+        return ProductTemplate.objects.filter(shop=shop)
 
     def perform_create(self, serializer):
         shop = get_shop_for_user(self.request.user)
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Project
+from .models import Project, ProjectStageTransition
 
 
 @admin.register(Project)
@@ -40,3 +40,13 @@ class ProjectAdmin(admin.ModelAdmin):
     return "—"
 
   photo_thumb.short_description = "Photo"
+
+
+@admin.register(ProjectStageTransition)
+class ProjectStageTransitionAdmin(admin.ModelAdmin):
+  list_display = ("project", "from_stage", "to_stage", "entered_at", "workflow", "shop")
+  list_filter = ("shop", "workflow")
+  search_fields = ("project__name", "project__reference_code")
+  date_hierarchy = "entered_at"
+  # Append-only history.
+  readonly_fields = ("shop", "project", "workflow", "from_stage", "to_stage", "entered_at")
@@ -1,63 +1,66 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Q, Subquery
 
+from makerfex_backend.backfill import BackfillCommand
+from makerfex_backend.versions import bump_versions
 from projects.models import Project
-
-
-class Command(BaseCommand):
-    help = "For completed projects, set current_stage to the workflow final stage if missing."
-
-    def add_arguments(self, parser):
-        parser.add_argument("--dry-run", action="store_true")
-        parser.add_argument("--shop-id", type=int, default=0)
-        parser.add_argument("--limit", type=int, default=0)
-
-    def handle(self, *args, **opts):
-        dry = opts["dry_run"]
-        shop_id = opts["shop_id"]
-        limit = opts["limit"]
-
-        qs = Project.objects.select_related("workflow", "current_stage").filter(workflow__isnull=False)
-
-        if shop_id:
-            qs = qs.filter(shop_id=shop_id)
-
-        # “completed” signal (supports both worlds)
-        qs = qs.filter(status="completed") | qs.filter(completed_at__isnull=False)
-
-        qs = qs.filter(current_stage__isnull=True) | qs.filter(current_stage__is_final=False)
-
-        qs = qs.order_by("id")
-        if limit and limit > 0:
-            qs = qs[:limit]
-
-        processed = 0
-        updated = 0
+from projects.services import record_stage_transitions
+from workflows.models import WorkflowStage
+
+
+class Command(BackfillCommand):
+    help = (
+        "For completed projects, set current_stage to the workflow final stage if missing. "
+        "Chunked and resumable; the move is logged in the stage history at completed_at. "
+        "Stored flow snapshots from that day on are dropped; run refresh_cumulative_flow to store them again."
+    )
+
+    backfill_name = "projects.final_stage"
+    success_message = "backfill_project_final_stage complete"
+    report_labels = {
+        "updated": "Updated",
+        "skipped_no_final": "Skipped (no final stage)",
+    }
+
+    def get_queryset(self):
+        final_stage = (
+            WorkflowStage.objects.filter(workflow_id=OuterRef("workflow_id"), is_final=True, is_active=True)
+            .order_by("-order", "-id")
+            .values("id")[:1]
+        )
+        return (
+            Project.objects.filter(workflow__isnull=False)
+            # “completed” signal (supports both worlds)
+            .filter(Q(status="completed") | Q(completed_at__isnull=False))
+            .filter(Q(current_stage__isnull=True) | Q(current_stage__is_final=False))
+            .only("id", "shop_id", "workflow_id", "current_stage_id", "completed_at")
+            .annotate(final_stage_id=Subquery(final_stage, output_field=IntegerField()))
+        )
+
+    def process_chunk(self, rows) -> dict:
+        changes = []
+        moves = []
         skipped_no_final = 0
-
-        with transaction.atomic():
-            for p in qs.iterator():
-                processed += 1
-
-                wf = p.workflow
-                if not wf:
-                    continue
-
-                final_stage = wf.stages.filter(is_final=True, is_active=True).order_by("order", "id").last()
-                if not final_stage:
-                    skipped_no_final += 1
-                    continue
-
-                if not dry:
-                    p.current_stage = final_stage
-                    p.save(update_fields=["current_stage"])
-                updated += 1
-
-            if dry:
-                transaction.set_rollback(True)
-
-        self.stdout.write(self.style.SUCCESS("backfill_project_final_stage complete"))
-        self.stdout.write(f"Dry run: {dry}")
-        self.stdout.write(f"Processed: {processed}")
-        self.stdout.write(f"Updated: {updated}")
-        self.stdout.write(f"Skipped (no final stage): {skipped_no_final}")
+        for project in rows:
+            if not project.final_stage_id:
+                skipped_no_final += 1
+                continue
+            moves.append(
+                {
+                    "project_id": project.id,
+                    "shop_id": project.shop_id,
+                    "workflow_id": project.workflow_id,
+                    "from_stage_id": project.current_stage_id,
+                    "to_stage_id": project.final_stage_id,
+                    **({"entered_at": project.completed_at} if project.completed_at else {}),
+                }
+            )
+            project.current_stage_id = project.final_stage_id
+            changes.append(project)
+
+        if changes:
+            Project.objects.bulk_update(changes, ["current_stage"])
+            record_stage_transitions(moves)
+            # bulk_update skips post_save, so version projects explicitly.
+            for shop_id in {project.shop_id for project in changes}:
+                bump_versions(shop_id, Project)
+        return {"updated": len(changes), "skipped_no_final": skipped_no_final}
@@ -1,105 +1,84 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from django.db.models import Count
+from django.db.models import IntegerField, Max, Min, OuterRef, Subquery
 
+from accounts.models import Station
+from makerfex_backend.backfill import BackfillCommand
+from makerfex_backend.versions import bump_versions
 from projects.models import Project
 from tasks.models import Task
 
 
-class Command(BaseCommand):
-    help = "Backfill Project.station using Task.station (preferred) or assigned_to.stations (fallback)."
-
-    def add_arguments(self, parser):
-        parser.add_argument("--dry-run", action="store_true", help="Do not write changes; only report.")
-        parser.add_argument("--limit", type=int, default=0, help="Limit number of projects processed (0 = no limit).")
-        parser.add_argument("--shop-id", type=int, default=0, help="Process only one shop id (0 = all shops).")
-
-    def handle(self, *args, **options):
-        dry_run = options["dry_run"]
-        limit = options["limit"]
-        shop_id = options["shop_id"]
-
-        qs = Project.objects.filter(station__isnull=True)
-
-        if shop_id:
-            qs = qs.filter(shop_id=shop_id)
-
-        qs = qs.select_related("assigned_to", "shop").order_by("id")
-
-        if limit and limit > 0:
-            qs = qs[:limit]
-
-        total = 0
-        updated = 0
-        skipped_no_signal = 0
-        skipped_conflict = 0
-
-        def infer_from_tasks(project_id: int):
-            """
-            Return (station_id or None, conflict_bool).
-            We prefer the station of the most recent task that has station set.
-            This resolves multi-station histories into a single 'current station'.
-            """
-            latest = (
-                Task.objects
-                .filter(project_id=project_id, station__isnull=False)
-                .order_by("-updated_at", "-created_at", "-id")
-                .values_list("station_id", flat=True)
-                .first()
-            )
-            if latest:
-                return latest, False
-            return None, False
-
-        def infer_from_assignee(project: Project):
-            assignee = project.assigned_to
-            if not assignee:
-                return None, False
-
-            stations = assignee.stations.all()
-            if stations.count() == 1:
-                return stations.first().id, False
-
-            if stations.count() > 1:
-                return None, True
-
-            return None, False
-
-        with transaction.atomic():
-            for p in qs.iterator():
-                total += 1
-
-                # 1) Prefer tasks signal
-                station_id, conflict = infer_from_tasks(p.id)
-                if conflict:
-                    skipped_conflict += 1
-                    continue
-
-                # 2) Fallback to assignee’s single-station membership
-                if not station_id:
-                    station_id, conflict = infer_from_assignee(p)
-                    if conflict:
-                        skipped_conflict += 1
-                        continue
-
-                if not station_id:
-                    skipped_no_signal += 1
+def infer_station_annotations():
+    """
+    Per-project signals for the inferred station, as subquery annotations:
+
+      task_station:         station of the most recent task that has one
+      assignee_station_lo/hi: lowest / highest station id of the assignee
+                            (equal -> exactly one station; differ -> conflict)
+    """
+    latest_task_station = (
+        Task.objects.filter(project_id=OuterRef("pk"), station__isnull=False)
+        .order_by("-updated_at", "-created_at", "-id")
+        .values("station_id")[:1]
+    )
+    memberships = (
+        Station.employees.through.objects.filter(employee_id=OuterRef("assigned_to_id"))
+        .values("employee_id")
+        .order_by()
+    )
+    return {
+        "task_station": Subquery(latest_task_station, output_field=IntegerField()),
+        "assignee_station_lo": Subquery(
+            memberships.annotate(lo=Min("station_id")).values("lo"), output_field=IntegerField()
+        ),
+        "assignee_station_hi": Subquery(
+            memberships.annotate(hi=Max("station_id")).values("hi"), output_field=IntegerField()
+        ),
+    }
+
+
+class Command(BackfillCommand):
+    help = (
+        "Backfill Project.station using Task.station (preferred) or assigned_to.stations (fallback). "
+        "Chunked and resumable: one annotated SELECT and one bulk UPDATE per chunk, each committed on its own."
+    )
+
+    backfill_name = "projects.station"
+    success_message = "Project.station backfill complete"
+    report_labels = {
+        "updated": "Would update / Updated",
+        "skipped_no_signal": "Skipped (no signal)",
+        "skipped_conflict": "Skipped (conflict)",
+    }
+
+    def get_queryset(self):
+        return Project.objects.filter(station__isnull=True).only("id", "shop_id").annotate(**infer_station_annotations())
+
+    def process_chunk(self, rows) -> dict:
+        counts = {"updated": 0, "skipped_no_signal": 0, "skipped_conflict": 0}
+        changes = []
+        for project in rows:
+            # 1) Prefer tasks signal
+            station_id = project.task_station
+
+            # 2) Fallback to assignee’s single-station membership
+            if not station_id:
+                lo, hi = project.assignee_station_lo, project.assignee_station_hi
+                if lo is not None and lo != hi:
+                    counts["skipped_conflict"] += 1
                     continue
-
-                if dry_run:
-                    updated += 1
-                    continue
-
-                p.station_id = station_id
-                p.save(update_fields=["station"])
-                updated += 1
-
-            if dry_run:
-                transaction.set_rollback(True)
-
-        self.stdout.write(self.style.SUCCESS("Project.station backfill complete"))
-        self.stdout.write(f"Dry run: {dry_run}")
-        self.stdout.write(f"Processed: {total}")
-        self.stdout.write(f"Would update / Updated: {updated}")
-        self.stdout.write(f"Skipped (no signal): {skipped_no_signal}")
-        self.stdout.write(f"Skipped (conflict): {skipped_conflict}")
+                station_id = lo
+
+            if not station_id:
+                counts["skipped_no_signal"] += 1
+                continue
+
+            project.station_id = station_id
+            changes.append(project)
+
+        if changes:
+            Project.objects.bulk_update(changes, ["station"])
+            # bulk_update skips post_save, so version projects explicitly.
+            for shop_id in {project.shop_id for project in changes}:
+                bump_versions(shop_id, Project)
+        counts["updated"] = len(changes)
+        return counts
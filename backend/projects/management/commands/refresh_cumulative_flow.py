@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from projects.metrics import clear_cumulative_flow_snapshots, refresh_cumulative_flow_snapshots
+from workflows.models import Workflow
+
+
+class Command(BaseCommand):
+    help = (
+        "Store cumulative flow snapshots (projects per stage per closed day) for each workflow. "
+        "Only missing days are computed; run daily (the metric replays days not stored yet on read)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365, help="Closed days to cover, ending yesterday.")
+        parser.add_argument("--shop-id", type=int, default=0, help="Process only one shop id (0 = all shops).")
+        parser.add_argument("--workflow-id", type=int, default=0, help="Process only one workflow id (0 = all).")
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop stored days first and replay them from the stage history (after imports/backfills).",
+        )
+
+    def handle(self, *args, **options):
+        days = max(1, options["days"])
+        start_date = timezone.localdate() - timedelta(days=days)
+
+        workflows = Workflow.objects.select_related("shop").order_by("shop_id", "id")
+        if options["shop_id"]:
+            workflows = workflows.filter(shop_id=options["shop_id"])
+        if options["workflow_id"]:
+            workflows = workflows.filter(id=options["workflow_id"])
+
+        total_days = 0
+        for workflow in workflows:
+            if options["rebuild"]:
+                clear_cumulative_flow_snapshots(workflow.shop, workflow)
+            written = refresh_cumulative_flow_snapshots(workflow.shop, workflow, start_date)
+            total_days += written
+            self.stdout.write(f"{workflow.shop.slug} / {workflow.name}: {written} day(s) stored")
+
+        self.stdout.write(self.style.SUCCESS("Cumulative flow snapshots refreshed"))
+        self.stdout.write(f"Days stored: {total_days}")
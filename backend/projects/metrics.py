@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
+import math
+from collections import Counter
+from datetime import date, datetime, time, timedelta
 
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Count, Max, Min
 from django.utils import timezone
-from django.db.models.functions import TruncDate
-from django.db.models import F
+from django.db.models.functions import RowNumber, TruncDate
+from django.db.models import (
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Window,
+)
 
 from accounts.models import Shop
-from projects.models import Project
+from analytics.models import AnalyticsSnapshot
+from makerfex_backend.versions import bump_versions
+from projects.models import Project, ProjectStageTransition
+from workflows.models import Workflow, WorkflowStage
 
 
 # ---- Helpers ---------------------------------------------------------------
@@ -284,3 +299,364 @@ def metric_projects_throughput_sparkline(
         "trendPct": trend_pct,
     }
     return payload
+
+
+# ---- Stage history (ProjectStageTransition) ----------------------------------
+
+TIME_IN_STAGE_PERCENTILES = (50, 85, 95)
+
+# Rows fetched per round trip when streaming the transition log.
+HISTORY_CHUNK_SIZE = 2000
+
+
+def _resolve_workflow(shop: Shop, workflow_id=None):
+    """
+    The requested workflow, else the shop's default (or first active) one.
+    """
+    qs = Workflow.objects.filter(shop=shop)
+    if workflow_id:
+        return qs.filter(id=workflow_id).first()
+    return qs.filter(is_active=True).order_by("-is_default", "name", "id").first()
+
+
+def _stay_started_at():
+    """
+    Subquery: when the project entered the stage a transition row leaves,
+    i.e. the entered_at of the project's previous log row.
+    """
+    previous = (
+        ProjectStageTransition.objects.filter(project=OuterRef("project"))
+        .filter(
+            Q(entered_at__lt=OuterRef("entered_at"))
+            | Q(entered_at=OuterRef("entered_at"), id__lt=OuterRef("id"))
+        )
+        .order_by("-entered_at", "-id")
+        .values("entered_at")[:1]
+    )
+    return Subquery(previous, output_field=DateTimeField())
+
+
+def _empty_category_series(series_ids):
+    return {
+        "kind": "category_series",
+        "categories": [],
+        "series": [{"id": sid, "label": label, "unit": unit, "values": []} for sid, label, unit in series_ids],
+    }
+
+
+def metric_projects_time_in_stage(shop: Shop, time_range: str = "30d", workflow_id=None) -> dict:
+    """
+    Time-in-stage percentiles (hours) per workflow stage, over stays that ended
+    within the time range.
+
+    Each transition out of a stage closes one stay in its from_stage, lasting
+    from the project's previous log row to this one. Counts come from one
+    GROUP BY; durations are computed in SQL and streamed in stage/duration
+    order, so percentiles are picked by rank without holding the rows.
+    """
+    series_ids = [(f"p{p}", f"p{p}", "hours") for p in TIME_IN_STAGE_PERCENTILES] + [
+        ("count", "Stays", "count")
+    ]
+    workflow = _resolve_workflow(shop, workflow_id)
+    if workflow is None:
+        return _empty_category_series(series_ids)
+
+    days = _parse_time_range_days(time_range, default_days=30)
+    since = timezone.now() - timedelta(days=days)
+
+    exits = (
+        ProjectStageTransition.objects.filter(
+            shop=shop,
+            workflow=workflow,
+            entered_at__gte=since,
+            from_stage__isnull=False,
+        )
+        .annotate(stay_started=_stay_started_at())
+        .filter(stay_started__isnull=False)
+    )
+    counts = dict(
+        exits.values("from_stage_id").annotate(n=Count("id")).order_by().values_list("from_stage_id", "n")
+    )
+
+    picked = {}
+    position = {}
+    stays = (
+        exits.annotate(
+            stay=ExpressionWrapper(F("entered_at") - F("stay_started"), output_field=DurationField())
+        )
+        .order_by("from_stage_id", "stay")
+        .values_list("from_stage_id", "stay")
+    )
+    for stage_id, stay in stays.iterator(chunk_size=HISTORY_CHUNK_SIZE):
+        index = position.get(stage_id, 0) + 1
+        position[stage_id] = index
+        n = counts.get(stage_id, 0)
+        for p in TIME_IN_STAGE_PERCENTILES:
+            # Nearest-rank percentile.
+            if index == max(1, math.ceil(p / 100 * n)):
+                picked[(stage_id, p)] = round(stay.total_seconds() / 3600, 2)
+
+    stages = WorkflowStage.objects.filter(workflow=workflow).order_by("order", "id")
+    stages = [stage for stage in stages if stage.is_active or stage.id in counts]
+
+    series = [
+        {
+            "id": f"p{p}",
+            "label": f"p{p}",
+            "unit": "hours",
+            "values": [picked.get((stage.id, p)) for stage in stages],
+        }
+        for p in TIME_IN_STAGE_PERCENTILES
+    ]
+    series.append(
+        {
+            "id": "count",
+            "label": "Stays",
+            "unit": "count",
+            "values": [counts.get(stage.id, 0) for stage in stages],
+        }
+    )
+    return {
+        "kind": "category_series",
+        "categories": [stage.name for stage in stages],
+        "series": series,
+    }
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def iter_daily_stage_counts(shop: Shop, workflow, start_date: date, end_date: date, opening=None):
+    """
+    Yield (day, {stage_id: projects in that stage at the end of day}) for every
+    day from start_date to end_date, replaying the transition log.
+
+    Opening counts (the state at the start of start_date) are taken from
+    `opening` when the caller already knows them, else from each project's
+    last move before start_date (one windowed query). Moves inside the range
+    are then streamed in entered_at order and applied as -1 / +1, so memory
+    stays O(stages).
+    """
+    log = ProjectStageTransition.objects.filter(shop=shop, workflow=workflow)
+
+    if opening is None:
+        opening = (
+            log.filter(entered_at__lt=_day_start(start_date))
+            .annotate(
+                latest=Window(
+                    RowNumber(),
+                    partition_by=[F("project_id")],
+                    order_by=[F("entered_at").desc(), F("id").desc()],
+                )
+            )
+            .filter(latest=1)
+            .values_list("to_stage_id", flat=True)
+        )
+        counts = Counter(opening.iterator(chunk_size=HISTORY_CHUNK_SIZE))
+    else:
+        counts = Counter(opening)
+
+    moves = (
+        log.filter(entered_at__gte=_day_start(start_date), entered_at__lt=_day_start(end_date + timedelta(days=1)))
+        .order_by("entered_at", "id")
+        .values_list("entered_at", "from_stage_id", "to_stage_id")
+    )
+    day = start_date
+    for entered_at, from_stage_id, to_stage_id in moves.iterator(chunk_size=HISTORY_CHUNK_SIZE):
+        move_day = timezone.localtime(entered_at).date()
+        while day < move_day:
+            yield day, dict(counts)
+            day += timedelta(days=1)
+        if from_stage_id:
+            counts[from_stage_id] -= 1
+        if to_stage_id:
+            counts[to_stage_id] += 1
+
+    while day <= end_date:
+        yield day, dict(counts)
+        day += timedelta(days=1)
+
+
+# Cumulative flow is kept as one AnalyticsSnapshot per stage and closed day:
+# metric_key "projects.cfd.stage.<stage_id>", value = projects in the stage at
+# the end of snapshot_date. Today is still moving, so it is never stored.
+CFD_SNAPSHOT_KEY_PREFIX = "projects.cfd.stage."
+
+
+def cfd_snapshot_key(stage_id: int) -> str:
+    return f"{CFD_SNAPSHOT_KEY_PREFIX}{stage_id}"
+
+
+def _cfd_snapshots(shop: Shop, stages):
+    return AnalyticsSnapshot.objects.filter(
+        shop=shop, metric_key__in=[cfd_snapshot_key(stage.id) for stage in stages]
+    )
+
+
+def _store_cfd_days(shop: Shop, workflow, stages, start_date: date, end_date: date, opening=None):
+    """
+    Replay start_date..end_date from the log into snapshot rows (one
+    bulk INSERT per HISTORY_CHUNK_SIZE rows).
+    """
+    batch = []
+    for day, counts in iter_daily_stage_counts(shop, workflow, start_date, end_date, opening=opening):
+        for stage in stages:
+            batch.append(
+                AnalyticsSnapshot(
+                    shop=shop,
+                    metric_key=cfd_snapshot_key(stage.id),
+                    label=stage.name,
+                    snapshot_date=day,
+                    value=max(0, counts.get(stage.id, 0)),
+                    extra={"workflow_id": workflow.id, "stage_id": stage.id},
+                )
+            )
+        if len(batch) >= HISTORY_CHUNK_SIZE:
+            # ignore_conflicts: a concurrent refresh may have written the same days.
+            AnalyticsSnapshot.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        AnalyticsSnapshot.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def _stored_cfd_counts(shop: Shop, stages, day: date) -> dict:
+    """
+    {stage_id: count} stored for day.
+    """
+    return {
+        row["extra"]["stage_id"]: int(row["value"])
+        for row in _cfd_snapshots(shop, stages).filter(snapshot_date=day).values("value", "extra")
+    }
+
+
+def clear_cumulative_flow_snapshots(shop: Shop, workflow) -> int:
+    """
+    Drop the stored days of workflow, e.g. after history was rewritten
+    (imports, backfills) and the rolled-forward counts no longer match the log.
+    """
+    stages = WorkflowStage.objects.filter(workflow=workflow)
+    deleted, _ = _cfd_snapshots(shop, stages).delete()
+    return deleted
+
+
+def invalidate_cumulative_flow_snapshots(shop_id: int, workflow_id: int, from_date: date) -> int:
+    """
+    Drop the stored days of workflow from from_date on, after a move was
+    recorded on an already-closed day; the refresh command stores them again.
+    """
+    stages = WorkflowStage.objects.filter(workflow_id=workflow_id)
+    deleted, _ = (
+        AnalyticsSnapshot.objects.filter(
+            shop_id=shop_id,
+            metric_key__in=[cfd_snapshot_key(stage_id) for stage_id in stages.values_list("id", flat=True)],
+            snapshot_date__gte=from_date,
+        ).delete()
+    )
+    return deleted
+
+
+def refresh_cumulative_flow_snapshots(shop: Shop, workflow, start_date: date, end_date: date | None = None) -> int:
+    """
+    Make sure closed days start_date..end_date (default: yesterday) have
+    cumulative flow snapshots for every stage of workflow, computing only the
+    days that are missing:
+
+      - days after the newest snapshot are rolled forward from that day's
+        stored counts plus the moves logged since (no history replay);
+      - days before the oldest snapshot (a longer range than ever asked for)
+        are replayed from the log once.
+
+    Returns the number of days written. Stages added later simply read as 0
+    on days stored before they existed.
+    """
+    yesterday = timezone.localdate() - timedelta(days=1)
+    end_date = min(end_date or yesterday, yesterday)
+    if start_date > end_date:
+        return 0
+
+    stages = list(WorkflowStage.objects.filter(workflow=workflow).order_by("order", "id"))
+    if not stages:
+        return 0
+    bounds = _cfd_snapshots(shop, stages).aggregate(first=Min("snapshot_date"), last=Max("snapshot_date"))
+    first, last = bounds["first"], bounds["last"]
+
+    written = 0
+    with transaction.atomic():
+        if first is None:
+            _store_cfd_days(shop, workflow, stages, start_date, end_date)
+            written += (end_date - start_date).days + 1
+        else:
+            if start_date < first:
+                _store_cfd_days(shop, workflow, stages, start_date, first - timedelta(days=1))
+                written += (first - start_date).days
+            if last < end_date:
+                opening = _stored_cfd_counts(shop, stages, last)
+                _store_cfd_days(shop, workflow, stages, last + timedelta(days=1), end_date, opening=opening)
+                written += (end_date - last).days
+        if written:
+            # bulk_create skips post_save, so version snapshots explicitly.
+            bump_versions(shop.id, AnalyticsSnapshot)
+    return written
+
+
+def metric_projects_cumulative_flow(shop: Shop, time_range: str = "30d", workflow_id=None) -> dict:
+    """
+    Cumulative flow: projects per stage at the end of each day, one series per
+    stage in workflow order (meant to be drawn stacked).
+
+    Closed days are read from the per-stage snapshots stored by the
+    refresh_cumulative_flow command; days it hasn't stored yet (and today) are
+    replayed from the log in memory, rolling forward from the newest stored
+    day. Reading never writes snapshots.
+    """
+    workflow = _resolve_workflow(shop, workflow_id)
+    if workflow is None:
+        return {"kind": "time_series", "granularity": "day", "stacked": True, "series": []}
+
+    days = _parse_time_range_days(time_range, default_days=30)
+    today = timezone.localdate()
+    yesterday = today - timedelta(days=1)
+    start_date = today - timedelta(days=days - 1)
+
+    stages = list(WorkflowStage.objects.filter(workflow=workflow).order_by("order", "id"))
+    stored = {
+        (row["extra"]["stage_id"], row["snapshot_date"]): int(row["value"])
+        for row in _cfd_snapshots(shop, stages)
+        .filter(snapshot_date__gte=start_date, snapshot_date__lte=yesterday)
+        .values("snapshot_date", "value", "extra")
+    }
+    stored_days = {day for _, day in stored}
+
+    live = {}
+    if stored_days:
+        first, last = min(stored_days), max(stored_days)
+        if start_date < first:
+            live.update(iter_daily_stage_counts(shop, workflow, start_date, first - timedelta(days=1)))
+        opening = {stage.id: stored.get((stage.id, last), 0) for stage in stages}
+        live.update(iter_daily_stage_counts(shop, workflow, last + timedelta(days=1), today, opening=opening))
+    else:
+        live.update(iter_daily_stage_counts(shop, workflow, start_date, today))
+
+    points = {stage.id: [] for stage in stages}
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        for stage in stages:
+            value = live[day].get(stage.id, 0) if day in live else stored.get((stage.id, day), 0)
+            points[stage.id].append({"t": day.isoformat(), "v": max(0, value)})
+
+    return {
+        "kind": "time_series",
+        "granularity": "day",
+        "stacked": True,
+        "series": [
+            {
+                "id": f"stage-{stage.id}",
+                "label": stage.name,
+                "unit": "projects",
+                "points": points[stage.id],
+            }
+            for stage in stages
+            if stage.is_active or any(pt["v"] for pt in points[stage.id])
+        ],
+    }
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('customers', '0002_customer_photo'),
+        ('products', '0003_alter_producttemplate_base_price_and_more'),
+        ('projects', '0007_alter_project_actual_hours_and_more'),
+        ('workflows', '0003_workflowstage_uniq_workflow_stage_order'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['shop', 'updated_at', 'id'], name='proj_shop_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 17:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def seed_initial_placements(apps, schema_editor):
+    """
+    Give every staged project a starting point in the log: an initial
+    placement in its current stage at created_at (earlier moves weren't kept).
+    """
+    Project = apps.get_model("projects", "Project")
+    ProjectStageTransition = apps.get_model("projects", "ProjectStageTransition")
+
+    staged = (
+        Project.objects.filter(current_stage__isnull=False)
+        .order_by("id")
+        .values_list("id", "shop_id", "workflow_id", "current_stage_id", "created_at")
+    )
+    batch = []
+    for project_id, shop_id, workflow_id, stage_id, created_at in staged.iterator(chunk_size=2000):
+        batch.append(
+            ProjectStageTransition(
+                project_id=project_id,
+                shop_id=shop_id,
+                workflow_id=workflow_id,
+                to_stage_id=stage_id,
+                entered_at=created_at,
+            )
+        )
+        if len(batch) >= 2000:
+            ProjectStageTransition.objects.bulk_create(batch)
+            batch = []
+    ProjectStageTransition.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('projects', '0008_projects_shop_updated_idx'),
+        ('workflows', '0003_workflowstage_uniq_workflow_stage_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStageTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entered_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('from_stage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='workflows.workflowstage')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_transitions', to='projects.project')),
+                ('shop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_stage_transitions', to='accounts.shop')),
+                ('to_stage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='workflows.workflowstage')),
+                ('workflow', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='workflows.workflow')),
+            ],
+            options={
+                'ordering': ['project', 'entered_at', 'id'],
+                'indexes': [models.Index(fields=['shop', 'workflow', 'entered_at'], name='proj_transition_flow_idx'), models.Index(fields=['project', 'entered_at'], name='proj_transition_project_idx')],
+            },
+        ),
+        migrations.RunPython(seed_initial_placements, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from accounts.models import TimeStampedModel, Shop, Employee, Station
 from customers.models import Customer
@@ -84,6 +85,47 @@ class Project(TimeStampedModel):
 
     class Meta:
         ordering = ["shop", "-created_at"]
+        indexes = [
+            # Change feed scans: WHERE shop = ? AND updated_at > ? ORDER BY updated_at, id
+            models.Index(fields=["shop", "updated_at", "id"], name="proj_shop_updated_idx"),
+        ]
+
+
+class ProjectStageTransition(models.Model):
+    """
+    Append-only log of stage moves: one row each time a project enters a stage
+    (from_stage is None for its initial placement; to_stage is None, under the
+    old workflow, when it moves to another workflow). Written by
+    projects/services.py inside the same transaction as the move.
+
+    A stay in a stage runs from the row that entered it to the next row for the
+    same project; time-in-stage and cumulative flow are derived from that.
+    """
+
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name="project_stage_transitions")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="stage_transitions")
+    workflow = models.ForeignKey(
+        Workflow, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    from_stage = models.ForeignKey(
+        WorkflowStage, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    to_stage = models.ForeignKey(
+        WorkflowStage, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    entered_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["project", "entered_at", "id"]
+        indexes = [
+            # Flow metrics: WHERE shop = ? AND workflow = ? AND entered_at BETWEEN ...
+            models.Index(fields=["shop", "workflow", "entered_at"], name="proj_transition_flow_idx"),
+            # Previous/next stay of one project.
+            models.Index(fields=["project", "entered_at"], name="proj_transition_project_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}: {self.from_stage_id} -> {self.to_stage_id} @ {self.entered_at}"
 
 
 # ---------------------------------------------------------------------
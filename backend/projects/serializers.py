@@ -3,6 +3,7 @@
 from rest_framework import serializers
 
 from accounts.utils import get_shop_for_user
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
 from .models import (
     Project,
     ProjectConsumableSnapshot,
@@ -68,7 +69,7 @@ class ProjectEquipmentSnapshotSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     customer_name = serializers.SerializerMethodField()
     photo_url = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
@@ -143,6 +144,22 @@ class ProjectSerializer(serializers.ModelSerializer):
             "consumable_snapshots",
             "equipment_snapshots",
         ]
+        # Snapshots are detail-page data: omitted from lists unless ?expand=...
+        expandable_fields = [
+            "material_snapshots",
+            "consumable_snapshots",
+            "equipment_snapshots",
+        ]
+        field_dependencies = {
+            "customer_name": ["customer"],
+            "photo_url": ["photo"],
+            "created_by_name": ["created_by"],
+            "assigned_to_name": ["assigned_to"],
+            "station_name": ["station"],
+            "workflow_name": ["workflow"],
+            "current_stage_name": ["current_stage"],
+            "can_log_sale": ["current_stage"],
+        }
 
     def _employee_display_name(self, emp):
         if not emp:
@@ -0,0 +1,192 @@
+# backend/projects/services.py
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from makerfex_backend.versions import bump_versions
+from projects.metrics import invalidate_cumulative_flow_snapshots
+from projects.models import Project, ProjectStageTransition
+from workflows.models import WorkflowStage
+
+# Largest selection a single bulk transition accepts.
+MAX_BULK_TRANSITION = 500
+
+# Block reason for a target stage outside the project's workflow (or inactive);
+# reported against to_stage_id rather than as a general detail.
+INVALID_STAGE_REASON = "Invalid stage for this workflow (or inactive)."
+
+# Compact per-project result of a bulk transition.
+BULK_TRANSITION_FIELDS = ("id", "current_stage", "status", "completed_at", "updated_at")
+
+
+def record_stage_transitions(moves, *, entered_at=None) -> int:
+    """
+    Append ProjectStageTransition rows for moves, an iterable of dicts with
+    project_id, shop_id, workflow_id, from_stage_id and to_stage_id (and
+    optionally their own entered_at, for moves being recorded after the fact).
+    A to_stage_id of None logs the project leaving its workflow. Moves that
+    don't change the stage are skipped. Call inside the transaction
+    that moves the projects, so the log never disagrees with current_stage.
+
+    Moves dated on an already-closed day drop the workflow's stored cumulative
+    flow days from that day on, since those counts no longer match the log.
+    """
+    entered_at = entered_at or timezone.now()
+    rows = [
+        ProjectStageTransition(**{"entered_at": entered_at, **move})
+        for move in moves
+        if move["from_stage_id"] != move["to_stage_id"]
+    ]
+    ProjectStageTransition.objects.bulk_create(rows)
+
+    today = timezone.localdate()
+    backdated = {}
+    for row in rows:
+        day = timezone.localtime(row.entered_at).date()
+        key = (row.shop_id, row.workflow_id)
+        if day < today and day < backdated.get(key, today):
+            backdated[key] = day
+    for (shop_id, workflow_id), day in backdated.items():
+        invalidate_cumulative_flow_snapshots(shop_id, workflow_id, day)
+    return len(rows)
+
+
+def record_project_move(project, from_stage_id, *, from_workflow_id=None, entered_at=None) -> int:
+    """
+    Log project's move from from_stage_id into its (already set) current_stage.
+
+    A project moved from another workflow (from_workflow_id) is logged as
+    leaving that workflow's stage (to_stage None, under the old workflow) and
+    entering the new one, so each workflow's history only sees its own stages.
+    """
+    move = {
+        "project_id": project.id,
+        "shop_id": project.shop_id,
+        "workflow_id": project.workflow_id,
+        "from_stage_id": from_stage_id,
+        "to_stage_id": project.current_stage_id,
+    }
+    if from_workflow_id is None or from_workflow_id == project.workflow_id:
+        return record_stage_transitions([move], entered_at=entered_at)
+    return record_stage_transitions(
+        [
+            {**move, "workflow_id": from_workflow_id, "to_stage_id": None},
+            {**move, "from_stage_id": None},
+        ],
+        entered_at=entered_at,
+    )
+
+
+def transition_block_reason(*, status, is_archived, workflow_id, to_stage, force) -> str | None:
+    """
+    Why a project in this state can't move to to_stage (None: no such active
+    stage in the shop), or None if it can. Used by ProjectViewSet.transition
+    and bulk_transition_projects().
+    """
+    if is_archived:
+        return "Archived projects cannot transition stages."
+    if status == Project.Status.CANCELLED:
+        return "Cancelled projects cannot transition stages."
+    if status == Project.Status.ON_HOLD and not force:
+        return "On-hold projects cannot transition stages without force=true."
+    if status == Project.Status.COMPLETED and not force:
+        return "Completed projects cannot transition stages without force=true."
+    if not workflow_id:
+        return "Project has no workflow assigned."
+    if to_stage is None or workflow_id != to_stage.workflow_id:
+        return INVALID_STAGE_REASON
+    return None
+
+
+def bulk_transition_projects(*, shop, project_ids, to_stage_id, force=False) -> dict:
+    """
+    Move many projects to one stage with a fixed number of queries.
+
+    Projects that can't move (not found, archived, cancelled, on hold or
+    completed without force, other workflow) are skipped with a reason; the
+    rest are updated with a single UPDATE (plus one bulk INSERT into the stage
+    transition log) that applies the is_final rules:
+
+      - into a final stage: status=completed, completed_at kept or set to now
+      - out of one: completed projects go back to active, completed_at cleared
+
+    Returns {"moved": [compact rows], "skipped": [{"id", "detail"}]}.
+    """
+    try:
+        to_stage = WorkflowStage.objects.get(id=to_stage_id, workflow__shop=shop, is_active=True)
+    except (WorkflowStage.DoesNotExist, ValueError, TypeError):
+        raise ValidationError({"to_stage_id": INVALID_STAGE_REASON})
+
+    now = timezone.now()
+    with transaction.atomic():
+        found = {
+            row["id"]: row
+            for row in Project.objects.select_for_update()
+            .filter(shop=shop, id__in=project_ids)
+            .values("id", "status", "is_archived", "workflow_id", "current_stage_id")
+        }
+
+        movable = []
+        skipped = []
+        for pk in project_ids:
+            row = found.get(pk)
+            reason = (
+                "Not found."
+                if row is None
+                else transition_block_reason(
+                    status=row["status"],
+                    is_archived=row["is_archived"],
+                    workflow_id=row["workflow_id"],
+                    to_stage=to_stage,
+                    force=force,
+                )
+            )
+            if reason:
+                skipped.append({"id": pk, "detail": reason})
+            else:
+                movable.append(pk)
+
+        if movable:
+            targets = Project.objects.filter(id__in=movable)
+            if to_stage.is_final:
+                targets.update(
+                    current_stage=to_stage,
+                    status=Project.Status.COMPLETED,
+                    completed_at=Coalesce(F("completed_at"), Value(now)),
+                    updated_at=now,
+                )
+            else:
+                # completed_at first: every CASE reads the row's old status.
+                targets.update(
+                    current_stage=to_stage,
+                    completed_at=Case(
+                        When(status=Project.Status.COMPLETED, then=Value(None)),
+                        default=F("completed_at"),
+                    ),
+                    status=Case(
+                        When(status=Project.Status.COMPLETED, then=Value(Project.Status.ACTIVE)),
+                        default=F("status"),
+                    ),
+                    updated_at=now,
+                )
+            record_stage_transitions(
+                (
+                    {
+                        "project_id": pk,
+                        "shop_id": shop.id,
+                        "workflow_id": found[pk]["workflow_id"],
+                        "from_stage_id": found[pk]["current_stage_id"],
+                        "to_stage_id": to_stage.id,
+                    }
+                    for pk in movable
+                ),
+                entered_at=now,
+            )
+            # update() skips post_save, so version projects explicitly.
+            bump_versions(shop.id, Project)
+
+    moved = list(Project.objects.filter(id__in=movable).order_by("id").values(*BULK_TRANSITION_FIELDS))
+    return {"to_stage_id": to_stage.id, "moved": moved, "skipped": skipped}
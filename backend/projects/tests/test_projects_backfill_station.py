@@ -0,0 +1,68 @@
+# backend/projects/tests/test_projects_backfill_station.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import Employee, Station
+from projects.models import Project
+from tasks.models import Task
+
+
+def expected_station(project):
+    """
+    The per-project inference the batched command must reproduce.
+    """
+    latest = (
+        Task.objects.filter(project=project, station__isnull=False)
+        .order_by("-updated_at", "-created_at", "-id")
+        .values_list("station_id", flat=True)
+        .first()
+    )
+    if latest:
+        return latest
+    if project.assigned_to_id:
+        stations = list(project.assigned_to.stations.values_list("id", flat=True))
+        if len(stations) == 1:
+            return stations[0]
+    return None
+
+
+@pytest.mark.django_db
+def test_batched_backfill_matches_per_project_inference(demo_data):
+    shop = Project.objects.first().shop
+    # One assignee with two stations (conflict), one with exactly one.
+    busy, single = Employee.objects.filter(shop=shop).order_by("id")[:2]
+    busy.stations.set(Station.objects.filter(shop=shop).order_by("id")[:2])
+    single.stations.set(Station.objects.filter(shop=shop).order_by("id")[2:3])
+
+    Project.objects.update(station=None)
+    projects = list(Project.objects.select_related("assigned_to").order_by("id"))
+    for project in projects[:6]:
+        Task.objects.filter(project=project).update(station=None)
+        project.assigned_to = busy if project.id % 2 else single
+        project.save(update_fields=["assigned_to"])
+    expected = {project.id: expected_station(project) for project in projects}
+
+    out = StringIO()
+    call_command("backfill_project_station", "--batch-size", "7", stdout=out)
+
+    actual = dict(Project.objects.values_list("id", "station_id"))
+    assert actual == expected
+    assert "chunk 2:" in out.getvalue()
+    assert f"Updated: {sum(1 for v in expected.values() if v)}" in out.getvalue()
+    assert "Skipped (conflict): 0" not in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_backfill_dry_run_and_limit_write_nothing_beyond_scope(demo_data):
+    Project.objects.update(station=None)
+
+    call_command("backfill_project_station", "--dry-run", stdout=StringIO())
+    assert not Project.objects.filter(station__isnull=False).exists()
+
+    out = StringIO()
+    call_command("backfill_project_station", "--limit", "5", "--batch-size", "2", stdout=out)
+    assert "Processed: 5" in out.getvalue()
+    first_five = Project.objects.order_by("id")[:5].values_list("id", flat=True)
+    assert not Project.objects.filter(station__isnull=False).exclude(id__in=list(first_five)).exists()
@@ -0,0 +1,122 @@
+# backend/projects/tests/test_projects_bulk_transition.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from makerfex_backend.versions import get_versions
+from projects.models import Project
+from projects.services import INVALID_STAGE_REASON
+from workflows.models import WorkflowStage
+
+
+def _stages():
+    stages = WorkflowStage.objects.filter(workflow__name="Woodworking - Standard", is_active=True)
+    return stages.get(is_final=True), stages.filter(is_final=False).order_by("order").first()
+
+
+def _bulk(client, ids, stage, **extra):
+    return client.post(
+        "/api/projects/bulk_transition/",
+        {"project_ids": ids, "to_stage_id": stage.id, **extra},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_transition_to_final_stage_applies_completion_rules(auth_client, django_capture_on_commit_callbacks):
+    final, _ = _stages()
+    active = list(
+        Project.objects.filter(workflow=final.workflow, status=Project.Status.ACTIVE, is_archived=False)
+        .exclude(current_stage=final)
+        .order_by("id")[:4]
+    )
+    cancelled = Project.objects.filter(workflow=final.workflow).first()
+    Project.objects.filter(id=cancelled.id).update(status=Project.Status.CANCELLED)
+    ids = [p.id for p in active if p.id != cancelled.id][:3]
+    before = get_versions(final.workflow.shop_id, [Project])["projects.project"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = _bulk(auth_client, ids + [cancelled.id, 999999], final)
+    assert resp.status_code == 200, resp.data
+
+    assert [row["id"] for row in resp.data["moved"]] == sorted(ids)
+    assert {row["id"] for row in resp.data["skipped"]} == {cancelled.id, 999999}
+    for project in Project.objects.filter(id__in=ids):
+        assert project.current_stage_id == final.id
+        assert project.status == Project.Status.COMPLETED
+        assert project.completed_at is not None
+    assert get_versions(final.workflow.shop_id, [Project])["projects.project"] == before + 1
+
+
+@pytest.mark.django_db
+def test_bulk_transition_out_of_final_requires_force_and_reopens(auth_client):
+    final, first = _stages()
+    ids = list(
+        Project.objects.filter(workflow=final.workflow, is_archived=False)
+        .exclude(status=Project.Status.CANCELLED)
+        .values_list("id", flat=True)[:3]
+    )
+    assert _bulk(auth_client, ids, final, force=True).status_code == 200
+
+    refused = _bulk(auth_client, ids, first)
+    assert refused.data["moved"] == []
+    assert len(refused.data["skipped"]) == len(ids)
+
+    reopened = _bulk(auth_client, ids, first, force=True)
+    assert {row["id"] for row in reopened.data["moved"]} == set(ids)
+    assert all(row["status"] == "active" and row["completed_at"] is None for row in reopened.data["moved"])
+
+
+@pytest.mark.django_db
+def test_bulk_transition_query_count_is_independent_of_selection(auth_client):
+    _, first = _stages()
+    ids = list(
+        Project.objects.filter(workflow=first.workflow, status=Project.Status.ACTIVE, is_archived=False)
+        .values_list("id", flat=True)
+    )
+    assert len(ids) > 4
+
+    def count_queries(selection):
+        with CaptureQueriesContext(connection) as ctx:
+            assert _bulk(auth_client, selection, first).status_code == 200
+        return len(ctx.captured_queries)
+
+    assert count_queries(ids[:1]) == count_queries(ids)
+
+
+@pytest.mark.django_db
+def test_bulk_transition_validates_payload(auth_client):
+    _, first = _stages()
+    assert _bulk(auth_client, [], first).status_code == 400
+    assert _bulk(auth_client, ["1"], first).status_code == 400
+    resp = auth_client.post("/api/projects/bulk_transition/", {"project_ids": [1], "to_stage_id": 999999}, format="json")
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_single_and_bulk_transition_share_block_reasons(auth_client):
+    final, first = _stages()
+    project = (
+        Project.objects.filter(workflow=final.workflow, status=Project.Status.ACTIVE, is_archived=False)
+        .exclude(current_stage=first)
+        .first()
+    )
+
+    def single(stage_id, **extra):
+        return auth_client.post(f"/api/projects/{project.id}/transition/", {"to_stage_id": stage_id, **extra}, format="json")
+
+    other_stage = WorkflowStage.objects.exclude(workflow=final.workflow).first()
+    for stage_id in (999999, "abc", other_stage.id if other_stage else 999998):
+        resp = single(stage_id)
+        assert resp.status_code == 400
+        assert resp.data["to_stage_id"] == INVALID_STAGE_REASON
+
+    for status in (Project.Status.ON_HOLD, Project.Status.CANCELLED):
+        Project.objects.filter(id=project.id).update(status=status)
+        resp = single(first.id)
+        assert resp.status_code == 400
+        bulk = _bulk(auth_client, [project.id], first)
+        assert bulk.data["skipped"] == [{"id": project.id, "detail": resp.data["detail"]}]
+
+    Project.objects.filter(id=project.id).update(status=Project.Status.ON_HOLD)
+    assert single(first.id, force=True).status_code == 200
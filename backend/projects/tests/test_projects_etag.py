@@ -0,0 +1,75 @@
+# backend/projects/tests/test_projects_etag.py
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from inventory.models import Material
+from makerfex_backend.versions import get_versions
+
+
+@pytest.mark.django_db
+def test_project_list_returns_304_without_running_list_query(auth_client):
+    first = auth_client.get("/api/projects/?page_size=5")
+    assert first.status_code == 200
+    etag = first["ETag"]
+    assert etag.startswith('W/"')
+
+    with CaptureQueriesContext(connection) as ctx:
+        again = auth_client.get("/api/projects/?page_size=5", HTTP_IF_NONE_MATCH=etag)
+    assert again.status_code == 304
+    assert again["ETag"] == etag
+    assert not again.content
+    assert not any("projects_project" in q["sql"] for q in ctx.captured_queries)
+
+    # Query params are part of the tag.
+    other = auth_client.get("/api/projects/?page_size=6", HTTP_IF_NONE_MATCH=etag)
+    assert other.status_code == 200
+    assert other["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_project_etag_changes_after_write(auth_client, django_capture_on_commit_callbacks):
+    first = auth_client.get("/api/projects/?page_size=5")
+    etag = first["ETag"]
+    project_id = first.data["results"][0]["id"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.patch(f"/api/projects/{project_id}/", {"description": "Re-planed"}, format="json")
+    assert resp.status_code == 200
+
+    after = auth_client.get("/api/projects/?page_size=5", HTTP_IF_NONE_MATCH=etag)
+    assert after.status_code == 200
+    assert after["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_optimistic_inventory_update_bumps_version(auth_client, django_capture_on_commit_callbacks, settings):
+    settings.INVENTORY_OPTIMISTIC_UPDATES = True
+    item = Material.objects.order_by("id").first()
+    before = get_versions(item.shop_id, [Material])["inventory.material"]
+    etag = auth_client.get("/api/inventory/materials/")["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.post(
+            "/api/inventory/consume/",
+            {"inventory_type": "material", "inventory_id": item.id, "quantity": str(Decimal("0.5"))},
+            format="json",
+        )
+    assert resp.status_code in (200, 201)
+
+    assert get_versions(item.shop_id, [Material])["inventory.material"] == before + 1
+    assert auth_client.get("/api/inventory/materials/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/api/projects/?page_size=5", "/api/inventory/transactions/", "/api/tasks/tasks/"])
+def test_etag_and_queryset_share_one_shop_lookup(auth_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = auth_client.get(url)
+    assert resp.status_code == 200
+    assert resp.has_header("ETag")
+    shop_lookups = [q["sql"] for q in ctx.captured_queries if 'FROM "accounts_employee"' in q["sql"]]
+    assert len(shop_lookups) == 1
+    assert not any(q["sql"].startswith('SELECT "accounts_shop"') for q in ctx.captured_queries)
@@ -0,0 +1,45 @@
+# backend/projects/tests/test_projects_queries.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+    assert resp.status_code == 200
+    return len(ctx.captured_queries), resp
+
+
+@pytest.mark.django_db
+def test_project_list_query_count_does_not_grow_with_page_size(auth_client):
+    small, _ = _count_queries(auth_client, "/api/projects/?page_size=2")
+    large, resp = _count_queries(auth_client, "/api/projects/?page_size=100")
+
+    assert len(resp.data["results"]) > 2
+    assert large == small
+    # 6 for the list itself + 2 for the conditional-GET shop/version lookup.
+    assert large <= 8
+
+
+@pytest.mark.django_db
+def test_project_list_is_lean_and_detail_carries_snapshots(auth_client):
+    rows = auth_client.get("/api/projects/").data["results"]
+    assert rows
+    assert "material_snapshots" not in rows[0]
+    assert "customer_name" in rows[0]
+
+    detail = auth_client.get(f"/api/projects/{rows[0]['id']}/").data
+    for key in ("material_snapshots", "consumable_snapshots", "equipment_snapshots"):
+        assert key in detail
+
+
+@pytest.mark.django_db
+def test_project_list_sparse_fields_and_expand(auth_client):
+    rows = auth_client.get("/api/projects/?fields=id,name,status&expand=material_snapshots").data["results"]
+    assert set(rows[0]) == {"id", "name", "status", "material_snapshots"}
+
+    # Expanding on the list path prefetches: still no per-row queries.
+    small, _ = _count_queries(auth_client, "/api/projects/?page_size=2&expand=material_snapshots")
+    large, _ = _count_queries(auth_client, "/api/projects/?page_size=100&expand=material_snapshots")
+    assert large == small
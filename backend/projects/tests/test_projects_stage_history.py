@@ -0,0 +1,209 @@
+# backend/projects/tests/test_projects_stage_history.py
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from accounts.models import Shop
+from analytics.models import AnalyticsSnapshot
+from projects.metrics import (
+    cfd_snapshot_key,
+    iter_daily_stage_counts,
+    metric_projects_cumulative_flow,
+    metric_projects_time_in_stage,
+    refresh_cumulative_flow_snapshots,
+)
+from projects.models import Project, ProjectStageTransition
+from projects.services import record_project_move
+from workflows.models import Workflow, WorkflowStage
+
+
+@pytest.fixture
+def flow(demo_data):
+    """
+    A two-stage workflow with a hand-written history:
+      p1: Build 10h -> Done (2 days ago)
+      p2: Build 30h -> Done (1 day ago)
+      p3: Build since 3 days ago (still open)
+    """
+    shop = Shop.objects.get(name="Silver Grain Woodworks")
+    workflow = Workflow.objects.create(shop=shop, name="Flow test")
+    build = WorkflowStage.objects.create(workflow=workflow, name="Build", order=0)
+    done = WorkflowStage.objects.create(workflow=workflow, name="Done", order=1, is_final=True)
+    now = timezone.now()
+
+    def project(name, stays):
+        p = Project.objects.create(shop=shop, name=name, workflow=workflow, current_stage=stays[-1][1])
+        previous = None
+        for entered_at, stage in stays:
+            ProjectStageTransition.objects.create(
+                shop=shop, project=p, workflow=workflow, from_stage=previous, to_stage=stage, entered_at=entered_at
+            )
+            previous = stage
+        return p
+
+    done_1 = now - timedelta(days=2)
+    done_2 = now - timedelta(days=1)
+    project("p1", [(done_1 - timedelta(hours=10), build), (done_1, done)])
+    project("p2", [(done_2 - timedelta(hours=30), build), (done_2, done)])
+    project("p3", [(now - timedelta(days=3), build)])
+    return shop, workflow, build, done
+
+
+@pytest.mark.django_db
+def test_transition_endpoints_append_history(auth_client):
+    project = Project.objects.filter(status=Project.Status.ACTIVE, is_archived=False).exclude(current_stage=None).first()
+    target = WorkflowStage.objects.filter(workflow=project.workflow, is_final=False).exclude(id=project.current_stage_id).first()
+    before = ProjectStageTransition.objects.filter(project=project).count()
+
+    resp = auth_client.post(f"/api/projects/{project.id}/transition/", {"to_stage_id": target.id}, format="json")
+    assert resp.status_code == 200
+    row = ProjectStageTransition.objects.filter(project=project).latest("entered_at", "id")
+    assert (row.from_stage_id, row.to_stage_id) == (project.current_stage_id, target.id)
+
+    # Re-sending the same stage isn't a move.
+    auth_client.post(f"/api/projects/{project.id}/transition/", {"to_stage_id": target.id}, format="json")
+    assert ProjectStageTransition.objects.filter(project=project).count() == before + 1
+
+    created = auth_client.post("/api/projects/", {"name": "Fresh", "shop": project.shop_id, "workflow": project.workflow_id}, format="json")
+    assert created.status_code == 201, created.data
+    first = ProjectStageTransition.objects.get(project_id=created.data["id"])
+    assert first.from_stage_id is None and first.to_stage_id == created.data["current_stage"]
+
+
+@pytest.mark.django_db
+def test_time_in_stage_percentiles_come_from_closed_stays(flow):
+    shop, workflow, build, done = flow
+    payload = metric_projects_time_in_stage(shop=shop, time_range="7d", workflow_id=workflow.id)
+
+    assert payload["categories"] == ["Build", "Done"]
+    series = {s["id"]: s["values"] for s in payload["series"]}
+    assert series["count"] == [2, 0]  # p3 is still in Build
+    assert series["p50"] == [10.0, None]
+    assert series["p95"] == [30.0, None]
+
+
+@pytest.mark.django_db
+def test_cumulative_flow_replays_daily_counts(flow):
+    shop, workflow, build, done = flow
+    payload = metric_projects_cumulative_flow(shop=shop, time_range="5d", workflow_id=workflow.id)
+
+    series = {s["label"]: [pt["v"] for pt in s["points"]] for s in payload["series"]}
+    assert len(series["Build"]) == 5
+    assert series["Done"][-1] == 2
+    assert series["Build"][-1] == 1
+    assert series["Build"][0] + series["Done"][0] <= 3
+
+
+@pytest.mark.django_db
+def test_cumulative_flow_snapshots_are_filled_incrementally(flow):
+    shop, workflow, build, done = flow
+    today = timezone.localdate()
+    stored = AnalyticsSnapshot.objects.filter(shop=shop, metric_key=cfd_snapshot_key(build.id))
+
+    # Reading never writes; unstored days are replayed in memory.
+    replayed = list(iter_daily_stage_counts(shop, workflow, today - timedelta(days=5), today))
+    payload = metric_projects_cumulative_flow(shop=shop, time_range="6d", workflow_id=workflow.id)
+    assert not stored.exists()
+
+    # Closed days only: today is computed live.
+    assert refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=2)) == 2
+    assert sorted(stored.values_list("snapshot_date", flat=True)) == [today - timedelta(days=2), today - timedelta(days=1)]
+
+    # Nothing left to compute; a longer range only fills the older days.
+    assert refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=2)) == 0
+    assert refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=5)) == 3
+    assert stored.count() == 5
+    assert metric_projects_cumulative_flow(shop=shop, time_range="6d", workflow_id=workflow.id) == payload
+    for stage in (build, done):
+        points = next(s["points"] for s in payload["series"] if s["id"] == f"stage-{stage.id}")
+        assert [pt["v"] for pt in points] == [counts.get(stage.id, 0) for _, counts in replayed]
+
+    # Days past the newest snapshot roll forward from it, not from a replay.
+    stored.filter(snapshot_date=today - timedelta(days=1)).delete()
+    AnalyticsSnapshot.objects.filter(
+        shop=shop, metric_key=cfd_snapshot_key(done.id), snapshot_date=today - timedelta(days=1)
+    ).delete()
+    assert metric_projects_cumulative_flow(shop=shop, time_range="6d", workflow_id=workflow.id) == payload
+    assert refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=5)) == 1
+    assert stored.get(snapshot_date=today - timedelta(days=1)).value == 1
+
+
+@pytest.mark.django_db
+def test_backdated_moves_drop_stored_days_from_that_day(flow):
+    shop, workflow, build, done = flow
+    today = timezone.localdate()
+    refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=5))
+    stored = AnalyticsSnapshot.objects.filter(shop=shop, metric_key__in=[cfd_snapshot_key(build.id), cfd_snapshot_key(done.id)])
+
+    # Moves recorded today leave closed days alone.
+    p3 = Project.objects.get(shop=shop, name="p3")
+    p3.current_stage = done
+    record_project_move(p3, build.id)
+    assert stored.count() == 10
+
+    p4 = Project.objects.create(shop=shop, name="p4", workflow=workflow, current_stage=done)
+    record_project_move(p4, None, entered_at=timezone.now() - timedelta(days=2))
+    assert sorted(set(stored.values_list("snapshot_date", flat=True))) == [
+        today - timedelta(days=5),
+        today - timedelta(days=4),
+        today - timedelta(days=3),
+    ]
+
+    refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=5))
+    replayed = dict(iter_daily_stage_counts(shop, workflow, today - timedelta(days=5), today - timedelta(days=1)))
+    for row in stored.values("snapshot_date", "value", "extra"):
+        assert int(row["value"]) == replayed[row["snapshot_date"]].get(row["extra"]["stage_id"], 0)
+
+
+@pytest.mark.django_db
+def test_metric_endpoint_forwards_workflow_param(auth_client, flow):
+    shop, workflow, build, done = flow
+    resp = auth_client.get(
+        "/api/analytics/metrics/", {"key": "projects.time_in_stage", "time_range": "7d", "workflow": workflow.id}
+    )
+    assert resp.status_code == 200
+    assert resp.data["payload"]["categories"] == ["Build", "Done"]
+
+
+@pytest.mark.django_db
+def test_workflow_change_leaves_the_old_workflow(auth_client, flow):
+    shop, workflow, build, done = flow
+    other = Workflow.objects.create(shop=shop, name="Other flow")
+    cut = WorkflowStage.objects.create(workflow=other, name="Cut", order=0)
+    p3 = Project.objects.get(shop=shop, name="p3")
+
+    resp = auth_client.patch(f"/api/projects/{p3.id}/", {"workflow": other.id, "current_stage": cut.id}, format="json")
+    assert resp.status_code == 200, resp.data
+    left, entered = ProjectStageTransition.objects.filter(project=p3).order_by("-id")[:2][::-1]
+    assert (left.workflow_id, left.from_stage_id, left.to_stage_id) == (workflow.id, build.id, None)
+    assert (entered.workflow_id, entered.from_stage_id, entered.to_stage_id) == (other.id, None, cut.id)
+
+    today = timezone.localdate()
+    _, old_counts = next(iter_daily_stage_counts(shop, workflow, today, today))
+    _, new_counts = next(iter_daily_stage_counts(shop, other, today, today))
+    assert old_counts == {build.id: 0, done.id: 2}
+    assert new_counts == {cut.id: 1}
+    # The stay in Build closed when the project left the workflow.
+    payload = metric_projects_time_in_stage(shop=shop, time_range="7d", workflow_id=workflow.id)
+    assert {s["id"]: s["values"] for s in payload["series"]}["count"] == [3, 0]
+
+
+@pytest.mark.django_db
+def test_backdated_workflow_change_drops_both_workflows_stored_days(flow):
+    shop, workflow, build, done = flow
+    other = Workflow.objects.create(shop=shop, name="Other flow")
+    cut = WorkflowStage.objects.create(workflow=other, name="Cut", order=0)
+    today = timezone.localdate()
+    refresh_cumulative_flow_snapshots(shop, workflow, today - timedelta(days=5))
+    refresh_cumulative_flow_snapshots(shop, other, today - timedelta(days=5))
+    keys = [cfd_snapshot_key(stage.id) for stage in (build, done, cut)]
+    stored = AnalyticsSnapshot.objects.filter(shop=shop, metric_key__in=keys)
+
+    p3 = Project.objects.get(shop=shop, name="p3")
+    p3.workflow, p3.current_stage = other, cut
+    p3.save()
+    record_project_move(p3, build.id, from_workflow_id=workflow.id, entered_at=timezone.now() - timedelta(days=2))
+
+    assert max(stored.values_list("snapshot_date", flat=True)) == today - timedelta(days=3)
+    assert set(stored.values_list("metric_key", flat=True)) == set(keys)
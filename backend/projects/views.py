@@ -3,8 +3,10 @@
 # Projects ViewSet (Server-Driven Tables)
 # ----------------------------------------------------------------------------
 # Adds:
-# - Immutable BOM snapshots are prefetched and serialized on detail.
-# - Stage transitions remain explicit via /transition/.
+# - Immutable BOM snapshots are prefetched and serialized on detail only;
+#   lists stay lean unless ?expand= asks for them (?fields= narrows columns).
+# - Stage transitions remain explicit via /transition/ (and /bulk_transition/
+#   for multi-card moves).
 # - Inventory usage logging is done via inventory consume endpoint
 #   (project_id + bom_snapshot provenance).
 # ============================================================================
@@ -19,10 +21,16 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from accounts.models import Employee
-from accounts.utils import get_shop_for_user
+from accounts.models import Employee, Station
+from accounts.utils import get_request_shop
+from customers.models import Customer
 from makerfex_backend.filters import QueryParamSearchFilter, parse_bool
-from makerfex_backend.mixins import ServerTableViewSetMixin, ShopScopedQuerysetMixin
+from makerfex_backend.mixins import (
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    SparseFieldsetViewSetMixin,
+)
+from makerfex_backend.serializers import EXPAND_ALL
 from products.models import ProductTemplate
 from projects.models import (
     Project,
@@ -31,14 +39,54 @@ from projects.models import (
     ProjectMaterialSnapshot,
 )
 from projects.serializers import ProjectSerializer
-from workflows.models import WorkflowStage
+from projects.services import (
+    INVALID_STAGE_REASON,
+    MAX_BULK_TRANSITION,
+    bulk_transition_projects,
+    record_project_move,
+    transition_block_reason,
+)
+from workflows.models import Workflow, WorkflowStage
+
+
+def project_table_queryset(shop):
+    """
+    The shop's projects as the project table serializes them: related rows
+    joined and is_completed annotated. Also used by the change feed and the
+    workflow board, so feed rows and board cards match /api/projects/ rows.
+    """
+    return (
+        Project.objects.filter(shop=shop)
+        .select_related(
+            "customer",
+            "assigned_to",
+            "assigned_to__user",
+            "created_by",
+            "created_by__user",
+            "workflow",
+            "current_stage",
+            "station",
+        )
+        .annotate(
+            is_completed=Case(
+                When(current_stage__is_final=True, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+    )
 
 
-class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet):
+class ProjectViewSet(
+    SparseFieldsetViewSetMixin, ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectSerializer
     queryset = Project.objects.none()
 
+    # Rows embed customer/employee/station/workflow/stage names.
+    etag_models = (Project, Customer, Employee, Station, Workflow, WorkflowStage)
+
     filter_backends = [QueryParamSearchFilter, OrderingFilter]
     search_fields = [
         "name",
@@ -65,6 +113,8 @@ class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.
         "current_stage__name",
     ]
     ordering = ["-created_at"]
+    # list: 8, plus one prefetch per ?expand= snapshot relation.
+    query_budgets = {"list": 11, "retrieve": 10}
 
     def _get_first_stage(self, workflow_id):
         if not workflow_id:
@@ -76,30 +126,33 @@ class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.
         )
 
     def get_shop(self):
-        return get_shop_for_user(self.request.user)
+        return get_request_shop(self.request)
 
     def get_employee(self, shop):
         if not shop:
             return None
         return Employee.objects.filter(shop=shop, user=self.request.user).first()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action != "list":
+            # Detail-style responses always carry the full BOM snapshots.
+            context["expand"] = EXPAND_ALL
+        return context
+
+    def _expanded_snapshot_fields(self):
+        """
+        Snapshot relations to prefetch: all of them on detail actions, only the
+        ?expand=-ed ones on lists.
+        """
+        return sorted(self.get_serializer().get_expanded_field_names())
+
     def get_shop_queryset(self, shop):
-        qs = (
-            Project.objects.filter(shop=shop, is_archived=False)
-            .select_related("customer", "assigned_to", "workflow", "current_stage", "station")
-            .prefetch_related(
-                "material_snapshots",
-                "consumable_snapshots",
-                "equipment_snapshots",
-            )
-            .annotate(
-                is_completed=Case(
-                    When(current_stage__is_final=True, then=Value(True)),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            )
-        )
+        qs = project_table_queryset(shop).filter(is_archived=False)
+
+        snapshot_fields = self._expanded_snapshot_fields()
+        if snapshot_fields:
+            qs = qs.prefetch_related(*snapshot_fields)
 
         qp = self.request.query_params
 
@@ -150,16 +203,27 @@ class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.
         if not shop:
             raise ValidationError({"detail": "Current user has no shop configured."})
         emp = self.get_employee(shop)
-        project = serializer.save(shop=shop, created_by=emp)
+        with transaction.atomic():
+            project = serializer.save(shop=shop, created_by=emp)
 
-        if project.workflow_id and not project.current_stage_id:
-            first_stage = self._get_first_stage(project.workflow_id)
-            if first_stage:
-                project.current_stage = first_stage
-                project.save(update_fields=["current_stage"])
+            if project.workflow_id and not project.current_stage_id:
+                first_stage = self._get_first_stage(project.workflow_id)
+                if first_stage:
+                    project.current_stage = first_stage
+                    project.save(update_fields=["current_stage"])
+
+            # Initial placement starts the project's stage history.
+            record_project_move(project, None)
 
         return project
 
+    def perform_update(self, serializer):
+        from_stage_id = serializer.instance.current_stage_id
+        from_workflow_id = serializer.instance.workflow_id
+        with transaction.atomic():
+            project = serializer.save()
+            record_project_move(project, from_stage_id, from_workflow_id=from_workflow_id)
+
     @action(detail=False, methods=["post"], url_path="create_from_template")
     def create_from_template(self, request):
         shop = self.get_shop()
@@ -263,33 +327,29 @@ class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.
         if not to_stage_id:
             raise ValidationError({"to_stage_id": "This field is required."})
 
-        if project.is_archived:
-            raise ValidationError({"detail": "Archived projects cannot transition stages."})
-
-        if project.status == Project.Status.CANCELLED:
-            raise ValidationError({"detail": "Cancelled projects cannot transition stages."})
-
-        if project.status == Project.Status.ON_HOLD and not force:
-            raise ValidationError({"detail": "On-hold projects cannot transition stages without force=true."})
-
-        if project.status == Project.Status.COMPLETED and not force:
-            raise ValidationError({"detail": "Completed projects cannot transition stages without force=true."})
-
-        if not project.workflow_id:
-            raise ValidationError({"detail": "Project has no workflow assigned."})
-
         try:
-            to_stage = WorkflowStage.objects.get(
-                id=to_stage_id,
-                workflow_id=project.workflow_id,
-                is_active=True,
-            )
-        except WorkflowStage.DoesNotExist:
-            raise ValidationError({"to_stage_id": "Invalid stage for this workflow (or inactive)."})
+            to_stage = WorkflowStage.objects.filter(
+                id=to_stage_id, workflow__shop_id=project.shop_id, is_active=True
+            ).first()
+        except (ValueError, TypeError):
+            to_stage = None
+
+        reason = transition_block_reason(
+            status=project.status,
+            is_archived=project.is_archived,
+            workflow_id=project.workflow_id,
+            to_stage=to_stage,
+            force=force,
+        )
+        if reason == INVALID_STAGE_REASON:
+            raise ValidationError({"to_stage_id": reason})
+        if reason:
+            raise ValidationError({"detail": reason})
 
         now = timezone.now()
 
         with transaction.atomic():
+            from_stage_id = project.current_stage_id
             project.current_stage = to_stage
 
             if to_stage.is_final:
@@ -303,6 +363,47 @@ class ProjectViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.
                     project.completed_at = None
 
             project.save(update_fields=["current_stage", "status", "completed_at", "updated_at"])
+            record_project_move(project, from_stage_id, entered_at=now)
 
         data = self.get_serializer(project).data
         return Response({"detail": "Stage transitioned.", "project": data}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk_transition")
+    def bulk_transition(self, request):
+        """
+        Move several projects to one stage in a single request.
+
+        POST /api/projects/bulk_transition/
+        Body: { "project_ids": [1, 2, 3], "to_stage_id": 123, "force": true|false }
+
+        Same rules as /transition/, checked per project; projects that can't
+        move are listed under "skipped" and the rest move together. Returns
+        compact rows (id, current_stage, status, completed_at, updated_at)
+        rather than full project payloads.
+        """
+        shop = self.get_shop()
+        if not shop:
+            raise ValidationError({"detail": "Current user has no shop configured."})
+
+        project_ids = request.data.get("project_ids")
+        to_stage_id = request.data.get("to_stage_id")
+        force = parse_bool(request.data.get("force")) is True
+
+        if not to_stage_id:
+            raise ValidationError({"to_stage_id": "This field is required."})
+        if (
+            not isinstance(project_ids, list)
+            or not project_ids
+            or not all(isinstance(x, int) and not isinstance(x, bool) for x in project_ids)
+        ):
+            raise ValidationError({"project_ids": "Must be a non-empty list of integers."})
+        if len(project_ids) > MAX_BULK_TRANSITION:
+            raise ValidationError({"project_ids": f"At most {MAX_BULK_TRANSITION} projects per request."})
+
+        result = bulk_transition_projects(
+            shop=shop,
+            project_ids=list(dict.fromkeys(project_ids)),
+            to_stage_id=to_stage_id,
+            force=force,
+        )
+        return Response({"detail": "Stages transitioned.", **result}, status=status.HTTP_200_OK)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class SalesConfig(AppConfig):
     name = 'sales'
+
+    def ready(self):
+        from sales.rollups import connect_sales_rollups
+
+        # Keep SalesDailyRollup current on SalesOrder writes (see sales/rollups.py).
+        connect_sales_rollups()
@@ -0,0 +1,22 @@
+from accounts.models import Shop
+from makerfex_backend.backfill import BackfillCommand
+from sales.rollups import rebuild_shop_sales_rollups
+
+
+class Command(BackfillCommand):
+    help = (
+        "Recompute the daily sales rollups behind the sales.* metrics, one shop per chunk. "
+        "Resumable; each shop is one grouped query and one replace of its rollup rows."
+    )
+
+    backfill_name = "sales.daily_rollups"
+    shop_field = "id"
+    default_batch_size = 1
+    success_message = "Sales rollups rebuilt"
+    report_labels = {"rows": "Rollup rows"}
+
+    def get_queryset(self):
+        return Shop.objects.only("id")
+
+    def process_chunk(self, rows) -> dict:
+        return {"rows": sum(rebuild_shop_sales_rollups(shop.id) for shop in rows)}
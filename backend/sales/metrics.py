@@ -0,0 +1,149 @@
+# backend/sales/metrics.py
+"""
+sales.* analytics metrics.
+
+Revenue metrics read SalesDailyRollup (one row per shop, day and source, kept
+current by sales/rollups.py) instead of scanning SalesOrder, so their cost
+follows the number of days in the range, not the number of orders.
+Top customers read CustomerStats (lifetime revenue per customer).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from accounts.models import Shop
+from customers.models import CustomerStats
+from projects.metrics import _parse_time_range_days
+from sales.models import SalesDailyRollup, SalesOrder
+
+
+def _rollups_in_range(shop: Shop, time_range: str):
+    days = _parse_time_range_days(time_range, default_days=30)
+    today = timezone.localdate()
+    start_date = today - timedelta(days=days - 1)
+    rollups = SalesDailyRollup.objects.filter(shop=shop, day__gte=start_date, day__lte=today)
+    return rollups, start_date, today
+
+
+def _money(value) -> float:
+    return float(value or Decimal("0"))
+
+
+def metric_sales_revenue_by_day(shop: Shop, time_range: str = "30d") -> dict:
+    """
+    Paid revenue per order day over the time range (days without orders are 0).
+    """
+    rollups, start_date, today = _rollups_in_range(shop, time_range)
+    by_day = {
+        row["day"]: row["revenue"]
+        for row in rollups.order_by().values("day").annotate(revenue=Sum("revenue"))
+    }
+
+    points = []
+    current = start_date
+    while current <= today:
+        points.append({"t": current.isoformat(), "v": _money(by_day.get(current))})
+        current += timedelta(days=1)
+
+    return {
+        "kind": "time_series",
+        "granularity": "day",
+        "series": [
+            {
+                "id": "revenue",
+                "label": "Revenue",
+                "unit": shop.currency_code,
+                "points": points,
+            }
+        ],
+    }
+
+
+def metric_sales_revenue_by_source(shop: Shop, time_range: str = "30d") -> dict:
+    """
+    Paid revenue and booked orders per order source over the time range.
+    """
+    rollups, _, _ = _rollups_in_range(shop, time_range)
+    rows = (
+        rollups.order_by()
+        .values("source")
+        .annotate(revenue=Sum("revenue"), orders=Sum("order_count"))
+        .order_by("source")
+    )
+    labels = dict(SalesOrder.Source.choices)
+
+    categories: list[str] = []
+    revenue: list[float] = []
+    orders: list[int] = []
+    for row in rows:
+        categories.append(labels.get(row["source"], row["source"]))
+        revenue.append(_money(row["revenue"]))
+        orders.append(row["orders"] or 0)
+
+    return {
+        "kind": "category_series",
+        "categories": categories,
+        "series": [
+            {"id": "revenue", "label": "Revenue", "unit": shop.currency_code, "values": revenue},
+            {"id": "orders", "label": "Orders", "unit": "count", "values": orders},
+        ],
+    }
+
+
+def metric_sales_average_order_value(shop: Shop, time_range: str = "30d") -> dict:
+    """
+    Paid revenue divided by paid orders over the time range.
+    """
+    rollups, _, _ = _rollups_in_range(shop, time_range)
+    totals = rollups.aggregate(revenue=Sum("revenue"), paid=Sum("paid_count"))
+    paid = totals["paid"] or 0
+    value = round(_money(totals["revenue"]) / paid, 2) if paid else 0
+
+    return {
+        "kind": "single",
+        "value": value,
+        "unit": shop.currency_code,
+        "label": "Average order value",
+        "comparison": None,
+    }
+
+
+def metric_sales_top_customers(shop: Shop, limit: int = 10) -> dict:
+    """
+    Customers with the highest lifetime paid revenue, as a table payload.
+    """
+    stats = (
+        CustomerStats.objects.filter(customer__shop=shop, lifetime_revenue__gt=0)
+        .select_related("customer")
+        .order_by("-lifetime_revenue", "customer_id")[:limit]
+    )
+
+    rows = []
+    for row in stats:
+        customer = row.customer
+        name = (customer.company_name or "").strip() or f"{customer.first_name} {customer.last_name}".strip()
+        rows.append(
+            {
+                "id": customer.id,
+                "name": name or "—",
+                "order_count": row.order_count,
+                "lifetime_revenue": _money(row.lifetime_revenue),
+                "last_order_date": row.last_order_date.isoformat() if row.last_order_date else None,
+            }
+        )
+
+    return {
+        "kind": "table",
+        "columns": [
+            {"key": "name", "label": "Customer", "type": "string"},
+            {"key": "order_count", "label": "Orders", "type": "number"},
+            {"key": "lifetime_revenue", "label": "Lifetime revenue", "type": "number"},
+            {"key": "last_order_date", "label": "Last order", "type": "date"},
+        ],
+        "rows": rows,
+    }
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-19 18:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('customers', '0003_customerstats'),
+        ('projects', '0009_project_stage_transition'),
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('source', models.CharField(choices=[('etsy', 'Etsy'), ('website', 'Website'), ('pos', 'Point of Sale'), ('other', 'Other')], max_length=20)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('paid_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['shop', 'day', 'source'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['shop', 'order_date'], name='sales_order_shop_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='salesdailyrollup',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_daily_rollups', to='accounts.shop'),
+        ),
+        migrations.AddConstraint(
+            model_name='salesdailyrollup',
+            constraint=models.UniqueConstraint(fields=('shop', 'day', 'source'), name='sales_rollup_shop_day_source_uniq'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 18:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_order_shop(apps, schema_editor):
+    """
+    Fill SalesOrderLine.shop from each line's order.
+    """
+    SalesOrder = apps.get_model("sales", "SalesOrder")
+    SalesOrderLine = apps.get_model("sales", "SalesOrderLine")
+    SalesOrderLine.objects.filter(shop__isnull=True).update(
+        shop_id=Subquery(SalesOrder.objects.filter(pk=OuterRef("order_id")).values("shop_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('sales', '0002_salesdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesorderline',
+            name='shop',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sales_order_lines', to='accounts.shop'),
+        ),
+        migrations.RunPython(copy_order_shop, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='salesorderline',
+            name='shop',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='sales_order_lines', to='accounts.shop'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorderline',
+            index=models.Index(fields=['shop', 'id'], name='sales_line_shop_id_idx'),
+        ),
+    ]
@@ -90,17 +90,36 @@ class SalesOrder(TimeStampedModel):
 
     class Meta:
         ordering = ["-order_date", "-created_at"]
+        indexes = [
+            # Daily rollup refresh: WHERE shop = ? AND order_date IN (...)
+            models.Index(fields=["shop", "order_date"], name="sales_order_shop_date_idx"),
+        ]
 
     def __str__(self):
         return self.order_number or f"Order #{self.pk} ({self.shop.slug})"
 
 
+# Orders that happened (order counts, last order date): all but these.
+NON_BOOKED_ORDER_STATUSES = (SalesOrder.Status.DRAFT, SalesOrder.Status.CANCELLED)
+# Orders whose total counts as revenue.
+REVENUE_ORDER_STATUSES = (SalesOrder.Status.PAID,)
+
+
 class SalesOrderLine(TimeStampedModel):
     """
     Line item on a sales order.
     Tied to a product template and/or project where applicable.
     """
 
+    # Copy of order.shop (kept in save()), so line listings filter on their
+    # own indexed column instead of joining orders.
+    shop = models.ForeignKey(
+        Shop,
+        on_delete=models.CASCADE,
+        related_name="sales_order_lines",
+        editable=False,
+        db_index=False,  # covered by sales_line_shop_id_idx
+    )
     order = models.ForeignKey(
         SalesOrder,
         on_delete=models.CASCADE,
@@ -147,6 +166,50 @@ class SalesOrderLine(TimeStampedModel):
 
     class Meta:
         ordering = ["order", "created_at"]
+        indexes = [
+            # Line listings: WHERE shop = ? ORDER BY id
+            models.Index(fields=["shop", "id"], name="sales_line_shop_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.description} (Order {self.order_id})"
+
+    def save(self, *args, **kwargs):
+        # Bulk writes skip this and must set shop themselves.
+        if self.order_id:
+            self.shop_id = self.order.shop_id
+        super().save(*args, **kwargs)
+
+
+class SalesDailyRollup(models.Model):
+    """
+    Per shop, order_date and source: booked orders, paid orders and revenue.
+    Sales metrics read these instead of aggregating SalesOrder.
+
+    Kept current by sales/rollups.py (signals on SalesOrder writes, in the
+    writer's transaction); `manage.py rebuild_sales_rollups` recomputes them.
+    Orders without an order_date are not rolled up.
+    """
+
+    shop = models.ForeignKey(
+        Shop,
+        on_delete=models.CASCADE,
+        related_name="sales_daily_rollups",
+    )
+    day = models.DateField()
+    source = models.CharField(max_length=20, choices=SalesOrder.Source.choices)
+    # Orders not in NON_BOOKED_ORDER_STATUSES.
+    order_count = models.PositiveIntegerField(default=0)
+    # Orders in REVENUE_ORDER_STATUSES, and the sum of their total_amount.
+    paid_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["shop", "day", "source"]
+        constraints = [
+            models.UniqueConstraint(fields=["shop", "day", "source"], name="sales_rollup_shop_day_source_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.source}: {self.revenue} ({self.shop_id})"
@@ -0,0 +1,118 @@
+# backend/sales/rollups.py
+"""
+Maintenance of SalesDailyRollup (see sales/models.py).
+
+A write to an order re-aggregates the whole (shop, day) bucket it touches:
+one grouped query over that day's orders (sales_order_shop_date_idx), an
+upsert of the (day, source) rows it returns and a delete of the ones that no
+longer have orders. Touching a day costs the same however many orders the
+shop has, and a bucket can't drift from its orders.
+
+connect_sales_rollups() (called from SalesConfig.ready) re-aggregates the
+order's day after a save that creates it or changes its order_date, status,
+total_amount or source, and after a delete: order updates, deletes and
+log_from_project all go through it. A new order_date refreshes the old day
+as well, so the bucket the order left is corrected (or deleted when it
+emptied). Bulk writes skip signals and must call refresh_sales_rollups() /
+rebuild_shop_sales_rollups() themselves.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_save
+
+from makerfex_backend.previous_values import has_changed, previous_values, track_previous_values
+from sales.models import NON_BOOKED_ORDER_STATUSES, REVENUE_ORDER_STATUSES, SalesDailyRollup, SalesOrder
+
+ROLLUP_FIELDS = ["order_count", "paid_count", "revenue", "updated_at"]
+
+# SalesOrder fields a bucket is aggregated from.
+ROLLUP_SOURCE_FIELDS = ("order_date", "status", "total_amount", "source")
+
+# Rows per INSERT (and per fetch) in a full rebuild.
+REBUILD_BATCH_SIZE = 1000
+
+
+def _aggregate(shop_id, days=None):
+    orders = SalesOrder.objects.filter(shop_id=shop_id, order_date__isnull=False).exclude(
+        status__in=NON_BOOKED_ORDER_STATUSES
+    )
+    if days is not None:
+        orders = orders.filter(order_date__in=days)
+    return (
+        orders.order_by()
+        .values("order_date", "source")
+        .annotate(
+            n=Count("id"),
+            paid=Count("id", filter=Q(status__in=REVENUE_ORDER_STATUSES)),
+            revenue=Sum("total_amount", filter=Q(status__in=REVENUE_ORDER_STATUSES)),
+        )
+    )
+
+
+def _rollup(shop_id, row) -> SalesDailyRollup:
+    return SalesDailyRollup(
+        shop_id=shop_id,
+        day=row["order_date"],
+        source=row["source"],
+        order_count=row["n"],
+        paid_count=row["paid"],
+        revenue=row["revenue"] or Decimal("0"),
+    )
+
+
+def refresh_sales_rollups(shop_id, days) -> int:
+    """
+    Recompute the buckets of shop_id on days (None entries are ignored).
+    Returns the number of (day, source) rows written.
+    """
+    days = sorted({day for day in days if day})
+    if not shop_id or not days:
+        return 0
+    rollups = [_rollup(shop_id, row) for row in _aggregate(shop_id, days)]
+    keep = Q()
+    for rollup in rollups:
+        keep |= Q(day=rollup.day, source=rollup.source)
+    with transaction.atomic():
+        # Upsert, so concurrent writers to the same day don't collide on insert.
+        SalesDailyRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=["shop", "day", "source"],
+            update_fields=ROLLUP_FIELDS,
+        )
+        emptied = SalesDailyRollup.objects.filter(shop_id=shop_id, day__in=days)
+        if rollups:
+            emptied = emptied.exclude(keep)
+        emptied.delete()
+    return len(rollups)
+
+
+def rebuild_shop_sales_rollups(shop_id) -> int:
+    """
+    Recompute every bucket of one shop (after bulk imports or to repair).
+    """
+    rollups = [_rollup(shop_id, row) for row in _aggregate(shop_id).iterator(chunk_size=REBUILD_BATCH_SIZE)]
+    with transaction.atomic():
+        SalesDailyRollup.objects.filter(shop_id=shop_id).delete()
+        SalesDailyRollup.objects.bulk_create(rollups, batch_size=REBUILD_BATCH_SIZE)
+    return len(rollups)
+
+
+def _refresh_after_save(sender, instance, raw=False, **kwargs):
+    if raw or not has_changed(instance, ROLLUP_SOURCE_FIELDS):
+        return
+    refresh_sales_rollups(instance.shop_id, [instance.order_date, previous_values(instance).get("order_date")])
+
+
+def _refresh_after_delete(sender, instance, **kwargs):
+    refresh_sales_rollups(instance.shop_id, [instance.order_date])
+
+
+def connect_sales_rollups():
+    uid = "sales-rollups:sales.salesorder"
+    track_previous_values(SalesOrder, ROLLUP_SOURCE_FIELDS)
+    post_save.connect(_refresh_after_save, sender=SalesOrder, weak=False, dispatch_uid=uid)
+    post_delete.connect(_refresh_after_delete, sender=SalesOrder, weak=False, dispatch_uid=uid)
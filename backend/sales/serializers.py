@@ -2,10 +2,12 @@
 
 from decimal import Decimal
 from rest_framework import serializers
+
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
 from .models import SalesOrder, SalesOrderLine
 
 
-class SalesOrderLineSerializer(serializers.ModelSerializer):
+class SalesOrderLineSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = SalesOrderLine
         fields = [
@@ -23,7 +25,7 @@ class SalesOrderLineSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class SalesOrderSerializer(serializers.ModelSerializer):
+class SalesOrderSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # optional nested read-only lines
     lines = SalesOrderLineSerializer(many=True, read_only=True)
 
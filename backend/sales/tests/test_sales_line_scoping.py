@@ -0,0 +1,39 @@
+# backend/sales/tests/test_sales_line_scoping.py
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Shop
+from sales.models import SalesOrder, SalesOrderLine
+
+
+@pytest.mark.django_db
+def test_line_shop_follows_its_order(demo_data):
+    assert SalesOrderLine.objects.exists()
+    assert not SalesOrderLine.objects.exclude(shop_id=F("order__shop_id")).exists()
+
+    other = Shop.objects.create(name="Other", slug="other-sales-shop")
+    order = SalesOrder.objects.create(shop=other, order_number="OTHER-1", total_amount=Decimal("10.00"))
+    line = SalesOrderLine.objects.create(order=order, description="Elsewhere", unit_price=Decimal("10.00"))
+    assert line.shop_id == other.id
+
+
+@pytest.mark.django_db
+def test_line_list_is_scoped_without_joining_orders(auth_client):
+    shop = Shop.objects.get(slug="silver-grain-woodworks")
+    other = Shop.objects.create(name="Other", slug="other-sales-shop")
+    order = SalesOrder.objects.create(shop=other, order_number="OTHER-1", total_amount=Decimal("10.00"))
+    foreign = SalesOrderLine.objects.create(order=order, description="Elsewhere", unit_price=Decimal("10.00"))
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = auth_client.get("/api/sales/lines/")
+    assert resp.status_code == 200
+    assert resp.data["count"] == SalesOrderLine.objects.filter(shop=shop).count()
+    assert foreign.id not in {row["id"] for row in resp.data["results"]}
+
+    line_queries = [q["sql"] for q in ctx.captured_queries if 'FROM "sales_salesorderline"' in q["sql"]]
+    assert line_queries
+    assert not any('JOIN "sales_salesorder"' in sql for sql in line_queries)
@@ -0,0 +1,133 @@
+# backend/sales/tests/test_sales_rollups.py
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Shop
+from sales import rollups
+from sales.models import SalesDailyRollup, SalesOrder
+
+
+def _expected(shop):
+    rows = (
+        SalesOrder.objects.filter(shop=shop, order_date__isnull=False)
+        .exclude(status__in=["draft", "cancelled"])
+        .order_by()
+        .values("order_date", "source")
+        .annotate(n=Count("id"), paid=Count("id", filter=Q(status="paid")), revenue=Sum("total_amount", filter=Q(status="paid")))
+    )
+    return {
+        (row["order_date"], row["source"]): (row["n"], row["paid"], row["revenue"] or Decimal("0.00"))
+        for row in rows
+    }
+
+
+def _stored(shop):
+    return {
+        (row.day, row.source): (row.order_count, row.paid_count, row.revenue)
+        for row in SalesDailyRollup.objects.filter(shop=shop)
+    }
+
+
+@pytest.fixture
+def shop(db):
+    return Shop.objects.create(name="Rollup test", slug="rollup-test")
+
+
+def _paid_order(shop, day, **fields):
+    return SalesOrder.objects.create(
+        shop=shop, order_date=day, status=SalesOrder.Status.PAID, total_amount=Decimal("10.00"), **fields
+    )
+
+
+@pytest.mark.django_db
+def test_seeded_rollups_match_orders(demo_data):
+    shop = Shop.objects.get()
+    assert _stored(shop) == _expected(shop)
+
+
+def test_source_change_moves_the_order_between_buckets(shop):
+    day = timezone.localdate()
+    order = _paid_order(shop, day, source=SalesOrder.Source.ETSY)
+    _paid_order(shop, day, source=SalesOrder.Source.POS)
+
+    order.source = SalesOrder.Source.WEBSITE
+    order.save()
+    assert _stored(shop) == {
+        (day, "pos"): (1, 1, Decimal("10.00")),
+        (day, "website"): (1, 1, Decimal("10.00")),
+    }
+
+
+def test_emptied_days_are_deleted(shop):
+    day = timezone.localdate()
+    order = _paid_order(shop, day)
+
+    order.order_date = day - timedelta(days=3)
+    order.save()
+    assert _stored(shop) == {(day - timedelta(days=3), "other"): (1, 1, Decimal("10.00"))}
+
+    order.status = SalesOrder.Status.CANCELLED
+    order.save()
+    assert _stored(shop) == {}
+
+    order.status = SalesOrder.Status.OPEN
+    order.save()
+    assert _stored(shop) == {(day - timedelta(days=3), "other"): (1, 0, Decimal("0.00"))}
+
+    order.delete()
+    assert _stored(shop) == {}
+
+
+def test_unrelated_edits_skip_the_refresh(shop, monkeypatch):
+    day = timezone.localdate()
+    order = _paid_order(shop, day)
+    refreshed = []
+    monkeypatch.setattr(rollups, "refresh_sales_rollups", lambda shop_id, days: refreshed.append(list(days)))
+
+    order.notes = "Gift wrap"
+    order.due_date = day
+    with CaptureQueriesContext(connection) as ctx:
+        order.save()
+    assert refreshed == []
+    # Stats and rollups share one read of the previous values.
+    selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+    assert len([sql for sql in selects if "sales_salesorder" in sql]) == 1
+
+    order.total_amount = Decimal("12.00")
+    order.save()
+    assert refreshed == [[day, day]]
+
+
+@pytest.mark.django_db
+def test_rebuild_command_and_metrics(auth_client):
+    shop = Shop.objects.get()
+    SalesDailyRollup.objects.all().delete()
+    call_command("rebuild_sales_rollups", stdout=StringIO())
+    assert _stored(shop) == _expected(shop)
+
+    payloads = {}
+    for key in ["sales.revenue_by_day", "sales.revenue_by_source", "sales.average_order_value", "sales.top_customers"]:
+        resp = auth_client.get("/api/analytics/metrics/", {"key": key, "time_range": "7d"})
+        assert resp.status_code == 200
+        payloads[key] = resp.json()["payload"]
+
+    points = payloads["sales.revenue_by_day"]["series"][0]["points"]
+    assert len(points) == 7
+    start = timezone.localdate() - timedelta(days=6)
+    paid = SalesOrder.objects.filter(shop=shop, status="paid", order_date__gte=start)
+    revenue = paid.aggregate(total=Sum("total_amount"))["total"] or Decimal("0")
+    assert sum(Decimal(str(point["v"])) for point in points) == revenue
+
+    expected_aov = round(float(revenue) / paid.count(), 2) if paid.exists() else 0
+    assert payloads["sales.average_order_value"]["value"] == expected_aov
+
+    rows = payloads["sales.top_customers"]["rows"]
+    assert [row["lifetime_revenue"] for row in rows] == sorted((row["lifetime_revenue"] for row in rows), reverse=True)
@@ -1,7 +1,7 @@
 # backend/sales/views.py
 
 from decimal import Decimal
-from django.core.exceptions import FieldError
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.db import transaction
 from django.utils import timezone
 from django.utils.text import slugify
@@ -14,8 +14,14 @@ from rest_framework.response import Response
 
 from accounts.utils import get_shop_for_user
 from makerfex_backend.filters import QueryParamSearchFilter
-from makerfex_backend.mixins import ShopScopedQuerysetMixin, ServerTableViewSetMixin
+from makerfex_backend.mixins import (
+    FastListViewSetMixin,
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    SparseFieldsetViewSetMixin,
+)
 
+from accounts.models import Shop
 from projects.models import Project
 from products.models import (
     ProductTemplate,
@@ -28,14 +34,21 @@ from .models import SalesOrder, SalesOrderLine
 from .serializers import SalesOrderSerializer, SalesOrderLineSerializer, LogSaleFromProjectSerializer
 
 
-def _try_scope_to_shop(qs, shop, candidate_filters):
-    """Try a sequence of queryset filters until one works."""
-    for kwargs in candidate_filters:
+def _shop_lookup(model, candidates) -> str:
+    """
+    First of candidates ("shop", "order__shop", ...) that is a relation path
+    from model to Shop. Resolved once, when the viewset class is defined.
+    """
+    for lookup in candidates:
+        related = model
         try:
-            return qs.filter(**kwargs)
-        except FieldError:
+            for name in lookup.split("__"):
+                related = related._meta.get_field(name).related_model
+        except (FieldDoesNotExist, AttributeError):
             continue
-    return qs.none()
+        if related is Shop:
+            return lookup
+    raise ImproperlyConfigured(f"{model.__name__} has no relation to Shop among {candidates}.")
 
 
 def _unique_template_slug(shop_id: int, base: str) -> str:
@@ -115,30 +128,32 @@ def _create_template_from_project(shop, project: Project, name: str, base_price:
     return tmpl
 
 
-class SalesOrderViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewsets.ModelViewSet):
+class SalesOrderViewSet(
+    SparseFieldsetViewSetMixin,
+    ServerTableViewSetMixin,
+    FastListViewSetMixin,
+    ShopScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = [IsAuthenticated]
     serializer_class = SalesOrderSerializer
     queryset = SalesOrder.objects.none()
 
+    # Nested lines keep the serializer path; ?omit=lines takes the fast one.
+    fast_list_fields = tuple(f for f in SalesOrderSerializer.Meta.fields if f != "lines")
+
     filter_backends = [QueryParamSearchFilter, OrderingFilter]
     search_fields = ["id"]
     ordering_fields = ["id"]
     ordering = ("-id",)
+    query_budgets = {"list": 6, "retrieve": 5}
+    shop_lookup = _shop_lookup(SalesOrder, ["shop", "customer__shop", "project__shop"])
 
     def get_shop_queryset(self, shop):
         base = SalesOrder.objects.all()
-        return _try_scope_to_shop(
-            base,
-            shop,
-            candidate_filters=[
-                {"shop": shop},
-                {"shop_id": shop.id},
-                {"customer__shop": shop},
-                {"customer__shop_id": shop.id},
-                {"project__shop": shop},
-                {"project__shop_id": shop.id},
-            ],
-        )
+        if "lines" in self.get_serialized_field_names():
+            base = base.prefetch_related("lines")
+        return base.filter(**{self.shop_lookup: shop})
 
     @action(detail=False, methods=["post"], url_path="log_from_project")
     def log_from_project(self, request):
@@ -236,33 +251,24 @@ class SalesOrderViewSet(ServerTableViewSetMixin, ShopScopedQuerysetMixin, viewse
         return Response(SalesOrderSerializer(order, context={"request": request}).data, status=status.HTTP_201_CREATED)
 
 
-class SalesOrderLineViewSet(viewsets.ModelViewSet):
+class SalesOrderLineViewSet(
+    FastListViewSetMixin,
+    SparseFieldsetViewSetMixin,
+    ShopScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = [IsAuthenticated]
     serializer_class = SalesOrderLineSerializer
     queryset = SalesOrderLine.objects.none()
+    fast_list_fields = tuple(SalesOrderLineSerializer.Meta.fields)
 
     filter_backends = [QueryParamSearchFilter, OrderingFilter]
     search_fields = ["id"]
     ordering_fields = ["id"]
     ordering = ("-id",)
+    query_budgets = {"list": 5, "retrieve": 4}
+    # SalesOrderLine.shop mirrors order.shop: an indexed scan, no join.
+    shop_lookup = _shop_lookup(SalesOrderLine, ["shop", "order__shop"])
 
-    def get_queryset(self):
-        shop = get_shop_for_user(self.request.user)
-        if not shop:
-            return SalesOrderLine.objects.none()
-
-        base = SalesOrderLine.objects.all()
-        return _try_scope_to_shop(
-            base,
-            shop,
-            candidate_filters=[
-                {"shop": shop},
-                {"shop_id": shop.id},
-                {"order__shop": shop},
-                {"order__shop_id": shop.id},
-                {"order__customer__shop": shop},
-                {"order__customer__shop_id": shop.id},
-                {"order__project__shop": shop},
-                {"order__project__shop_id": shop.id},
-            ],
-        )
+    def get_shop_queryset(self, shop):
+        return SalesOrderLine.objects.filter(**{self.shop_lookup: shop})
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_photo_shop_logo'),
+        ('projects', '0008_projects_shop_updated_idx'),
+        ('tasks', '0002_initial'),
+        ('workflows', '0003_workflowstage_uniq_workflow_stage_order'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['shop', 'updated_at', 'id'], name='task_shop_updated_idx'),
+        ),
+    ]
@@ -87,6 +87,10 @@ class Task(TimeStampedModel):
 
     class Meta:
         ordering = ["project", "order", "id"]
+        indexes = [
+            # Change feed scans: WHERE shop = ? AND updated_at > ? ORDER BY updated_at, id
+            models.Index(fields=["shop", "updated_at", "id"], name="task_shop_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.name})"
@@ -1,10 +1,11 @@
 # backend/tasks/serializers.py
 from rest_framework import serializers
 
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
 from .models import Task
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # Lightweight project context for Kanban cards (read-only)
     project_name = serializers.CharField(source="project.name", read_only=True)
     project_due_date = serializers.DateField(source="project.due_date", read_only=True, allow_null=True)
@@ -35,6 +36,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "shop", "created_at", "updated_at", "project_name", "project_due_date", "is_vip"]
+        field_dependencies = {"is_vip": ["project"]}
 
     def get_is_vip(self, obj) -> bool:
         """
@@ -0,0 +1,111 @@
+# backend/tasks/tests/test_tasks_change_feed.py
+import json
+
+import pytest
+
+from tasks.models import Task
+
+
+@pytest.fixture
+def feed_settings(settings):
+    settings.CHANGE_FEED_SETTLE_SECONDS = 0
+    settings.CHANGE_FEED_POLL_SECONDS = 0.05
+    return settings
+
+
+def _feed(client, **params):
+    resp = client.get("/api/changes/", params)
+    assert resp.status_code == 200, resp.content
+    return json.loads(resp.content)
+
+
+@pytest.mark.django_db
+def test_feed_returns_only_rows_changed_since_cursor(auth_client, feed_settings):
+    baseline = _feed(auth_client, models="tasks.task")
+    assert baseline["changes"] == {"tasks.task": []}
+
+    task = Task.objects.exclude(stage=None).order_by("id").first()
+    resp = auth_client.patch(f"/api/tasks/tasks/{task.id}/", {"status": "blocked"}, format="json")
+    assert resp.status_code == 200
+
+    changed = _feed(auth_client, models="tasks.task", cursor=baseline["cursor"])
+    assert [row["id"] for row in changed["changes"]["tasks.task"]] == [task.id]
+    assert changed["changes"]["tasks.task"][0]["status"] == "blocked"
+
+    # Cursor advanced past the row; sparse fields apply to feed rows too.
+    assert _feed(auth_client, models="tasks.task", cursor=changed["cursor"])["changes"]["tasks.task"] == []
+    again = _feed(auth_client, models="tasks.task", cursor=baseline["cursor"], fields="id,status")
+    assert set(again["changes"]["tasks.task"][0]) == {"id", "status"}
+
+
+@pytest.mark.django_db
+def test_feed_filters_by_workflow(auth_client, feed_settings):
+    baseline = _feed(auth_client, models="tasks.task,projects.project")
+    task = Task.objects.exclude(stage=None).select_related("stage").order_by("id").first()
+    task.title = "Moved on the board"
+    task.save()
+
+    other = _feed(auth_client, cursor=baseline["cursor"], workflow=task.stage.workflow_id + 1000)
+    assert other["changes"] == {"projects.project": [], "tasks.task": []}
+
+    mine = _feed(auth_client, cursor=baseline["cursor"], workflow=task.stage.workflow_id)
+    assert [row["id"] for row in mine["changes"]["tasks.task"]] == [task.id]
+
+
+@pytest.mark.django_db
+def test_feed_rejects_bad_cursor_and_unknown_models(auth_client):
+    assert auth_client.get("/api/changes/", {"cursor": "not-a-cursor"}).status_code == 400
+    assert auth_client.get("/api/changes/", {"models": "accounts.user"}).status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.filterwarnings("ignore:StreamingHttpResponse must consume asynchronous iterators")
+def test_feed_and_stream_reject_non_numeric_filters(auth_client, feed_settings):
+    cursor = _feed(auth_client)["cursor"]
+    for param in ("workflow", "stage", "project"):
+        resp = auth_client.get("/api/changes/", {"cursor": cursor, param: "abc"})
+        assert resp.status_code == 400, param
+        assert param in resp.json()
+
+    token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+    resp = auth_client.get("/api/changes/stream/", {"cursor": cursor, "stage": "abc", "access_token": token})
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_long_poll_times_out_with_same_cursor(auth_client, feed_settings):
+    baseline = _feed(auth_client, models="tasks.task")
+    idle = _feed(auth_client, models="tasks.task", cursor=baseline["cursor"], wait=0.2)
+    assert idle["changes"] == {"tasks.task": []}
+    assert idle["cursor"] == baseline["cursor"]
+
+
+@pytest.mark.django_db
+@pytest.mark.filterwarnings("ignore:StreamingHttpResponse must consume asynchronous iterators")
+def test_sse_stream_emits_changes_event(auth_client, feed_settings):
+    feed_settings.CHANGE_FEED_STREAM_SECONDS = 0
+    token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+
+    resp = auth_client.get("/api/changes/stream/", {"models": "tasks.task", "access_token": token})
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/event-stream"
+    body = b"".join(resp).decode()  # the test client is WSGI-style: drains the stream
+    assert "event: changes" in body
+    payload = json.loads(body.split("data: ", 1)[1].split("\n", 1)[0])
+    assert payload["changes"] == {"tasks.task": []}
+
+
+@pytest.mark.django_db
+def test_project_feed_rows_match_list_rows(auth_client, feed_settings):
+    from projects.models import Project
+
+    baseline = _feed(auth_client, models="projects.project")
+    project = Project.objects.filter(is_archived=False, current_stage__isnull=False).order_by("id").first()
+    project.description = "Touched for the feed"
+    project.save()
+
+    rows = _feed(auth_client, models="projects.project", cursor=baseline["cursor"])["changes"]["projects.project"]
+    listed = auth_client.get("/api/projects/", {"q": project.name, "page_size": 100}).data["results"]
+    expected = json.loads(json.dumps(next(row for row in listed if row["id"] == project.id), default=str))
+    assert rows == [expected]
+    assert "is_completed" in rows[0]
@@ -4,14 +4,27 @@ from rest_framework import viewsets
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
-from accounts.utils import get_shop_for_user
+from accounts.utils import get_request_shop
 from makerfex_backend.filters import QueryParamSearchFilter, parse_bool
+from customers.models import Customer
+from makerfex_backend.mixins import ServerTableViewSetMixin, SparseFieldsetViewSetMixin
+from projects.models import Project
 
 from .models import Task
 from .serializers import TaskSerializer
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def task_table_queryset(shop):
+    """
+    The shop's tasks with the rows TaskSerializer reads joined in (shared with
+    the change feed).
+    """
+    return Task.objects.filter(shop=shop).select_related(
+        "shop", "project", "project__customer", "station", "assignee", "stage"
+    )
+
+
+class TaskViewSet(SparseFieldsetViewSetMixin, ServerTableViewSetMixin, viewsets.ModelViewSet):
     """
     Tasks API (shop-scoped)
 
@@ -19,6 +32,8 @@ class TaskViewSet(viewsets.ModelViewSet):
       ?q=
       ?ordering=
       ?page= / ?page_size=
+      ?fields= / ?omit=   (sparse fieldsets)
+      If-None-Match       (conditional GET -> 304)
 
     Preset-friendly filters:
       ?status=todo,in_progress,blocked,done,cancelled
@@ -40,6 +55,9 @@ class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.none()
     http_method_names = ["get", "post", "put", "patch", "head", "options"]
 
+    # is_vip reads task -> project -> customer.
+    etag_models = (Task, Project, Customer)
+
     filter_backends = [QueryParamSearchFilter, OrderingFilter]
     search_fields = [
         "title",
@@ -62,16 +80,14 @@ class TaskViewSet(viewsets.ModelViewSet):
         "updated_at",
     ]
     ordering = ("project_id", "order", "id")
+    query_budgets = {"list": 8, "retrieve": 7}
 
     def get_queryset(self):
-        shop = get_shop_for_user(self.request.user)
+        shop = get_request_shop(self.request)
         if not shop:
             return Task.objects.none()
 
-        qs = (
-            Task.objects.filter(shop=shop)
-            .select_related("shop", "project", "project__customer", "station", "assignee", "stage")
-        )
+        qs = task_table_queryset(shop)
 
         qp = self.request.query_params
 
@@ -129,5 +145,5 @@ class TaskViewSet(viewsets.ModelViewSet):
         return qs
 
     def perform_create(self, serializer):
-        shop = get_shop_for_user(self.request.user)
+        shop = get_request_shop(self.request)
         serializer.save(shop=shop)
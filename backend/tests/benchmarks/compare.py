@@ -0,0 +1,58 @@
+# backend/tests/benchmarks/compare.py
+"""
+Compare two benchmark result files:
+
+  python tests/benchmarks/compare.py .benchmarks/base.json .benchmarks/head.json
+
+Prints p50/p95 and query-count changes per case. Exits 1 when a case's p95
+grew by more than --threshold percent (and --min-ms milliseconds, to ignore
+noise on fast endpoints) or its query count grew.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=25.0, help="Allowed p95 growth in percent.")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="Ignore p95 growth smaller than this.")
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    print(f"base {base['meta']['commit']}  ->  head {head['meta']['commit']}")
+    print(f"{'case':<40} {'p50 ms':>16} {'p95 ms':>16} {'change':>8} {'queries':>9}")
+
+    regressions = []
+    for case_id in sorted(set(base["results"]) | set(head["results"])):
+        old, new = base["results"].get(case_id), head["results"].get(case_id)
+        if old is None or new is None:
+            print(f"{case_id:<40} {'(only in ' + ('head' if old is None else 'base') + ')':>16}")
+            continue
+        change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        queries = f"{old['queries']}->{new['queries']}" if old["queries"] != new["queries"] else str(new["queries"])
+        print(
+            f"{case_id:<40} {old['p50_ms']:>7.1f}->{new['p50_ms']:<7.1f} "
+            f"{old['p95_ms']:>7.1f}->{new['p95_ms']:<7.1f} {change:>+7.1f}% {queries:>9}"
+        )
+        slower = change > args.threshold and new["p95_ms"] - old["p95_ms"] > args.min_ms
+        if slower or new["queries"] > old["queries"]:
+            regressions.append(case_id)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
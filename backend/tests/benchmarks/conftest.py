@@ -0,0 +1,129 @@
+# backend/tests/benchmarks/conftest.py
+"""
+Fixtures for the API benchmark suite (pytest -m benchmark tests/benchmarks).
+
+The dataset is generated once per session with generate_load_data, outside
+any test transaction, so every benchmark (and the search thread pool) reads
+the same committed rows. Size and output are controlled by environment
+variables:
+
+  BENCHMARK_SCALE    multiplier on the default dataset size (default 1)
+  BENCHMARK_SEED     generate_load_data --seed (default "benchmark")
+  BENCHMARK_ANCHOR   generate_load_data --anchor (default today)
+  BENCHMARK_REPEAT   timed requests per case (default 15)
+  BENCHMARK_OUTPUT   results file (default .benchmarks/<timestamp>-<commit>.json)
+"""
+
+import json
+import os
+import platform
+import subprocess
+from io import StringIO
+from pathlib import Path
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import Employee, Shop
+
+BENCHMARK_SHOP_SLUG = "bench-0001"
+BENCHMARK_USERNAME = "benchuser"
+BENCHMARK_PASSWORD = "bench1234"
+
+# Per-shop sizes at BENCHMARK_SCALE=1.
+BASE_DATASET = {
+    "shops": 2,
+    "customers": 500,
+    "projects": 2000,
+    "tasks": 5,
+    "inventory": 150,
+    "ledger": 20,
+    "orders": 1000,
+}
+
+
+def benchmark_dataset() -> dict:
+    scale = float(os.environ.get("BENCHMARK_SCALE", "1"))
+    dataset = {key: max(1, round(value * scale)) for key, value in BASE_DATASET.items()}
+    dataset["shops"] = BASE_DATASET["shops"]
+    dataset["tasks"] = BASE_DATASET["tasks"]
+    dataset["ledger"] = BASE_DATASET["ledger"]
+    return dataset
+
+
+def _benchmark_repeat() -> int:
+    return max(1, int(os.environ.get("BENCHMARK_REPEAT", "15")))
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    dataset = benchmark_dataset()
+    options = [f"--{key}={value}" for key, value in dataset.items()]
+    options += ["--prefix=bench", f"--seed={os.environ.get('BENCHMARK_SEED', 'benchmark')}"]
+    if os.environ.get("BENCHMARK_ANCHOR"):
+        options.append(f"--anchor={os.environ['BENCHMARK_ANCHOR']}")
+
+    with django_db_blocker.unblock():
+        call_command("generate_load_data", *options, stdout=StringIO())
+        shop = Shop.objects.get(slug=BENCHMARK_SHOP_SLUG)
+        user = get_user_model().objects.create_user(BENCHMARK_USERNAME, password=BENCHMARK_PASSWORD)
+        Employee.objects.filter(shop=shop, role="Owner").update(user=user)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    """
+    {case id: measurements}, written as JSON when the session ends.
+    """
+    results = {}
+    yield results
+    if not results:
+        return
+
+    default_name = f"{timezone.now():%Y%m%d-%H%M%S}-{_git_commit()}.json"
+    path = Path(os.environ.get("BENCHMARK_OUTPUT") or Path(".benchmarks") / default_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "dataset": benchmark_dataset(),
+            "repeat": _benchmark_repeat(),
+            "db_vendor": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "results": dict(sorted(results.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    print(f"\nBenchmark results written to {path}")
+
+
+@pytest.fixture(scope="session")
+def benchmark_repeat():
+    return _benchmark_repeat()
+
+
+@pytest.fixture
+def bench_client(api_client):
+    resp = api_client.post(
+        "/api/accounts/token/",
+        {"username": BENCHMARK_USERNAME, "password": BENCHMARK_PASSWORD},
+        format="json",
+    )
+    assert resp.status_code == 200
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['access']}")
+    return api_client
@@ -0,0 +1,124 @@
+# backend/tests/benchmarks/test_api_benchmarks.py
+"""
+Latency and query-count benchmarks for every server-driven table endpoint,
+global search and every METRIC_REGISTRY key, against the generated dataset,
+plus the fast list path against the serializer path for the same pages.
+
+Each case is requested once untimed (warm-up, and query capture), then
+BENCHMARK_REPEAT times with a wall clock. Compare two result files with
+tests/benchmarks/compare.py.
+"""
+
+import math
+import statistics
+import time
+
+import pytest
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from analytics.metrics.registry import METRIC_REGISTRY
+from inventory.views import MaterialViewSet
+from sales.views import SalesOrderLineViewSet
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+PAGE_SIZE = 50
+
+# Server-driven tables: (name, url, ?q= term or None, ordering).
+TABLE_ENDPOINTS = [
+    ("projects", "/api/projects/", "walnut", "-due_date"),
+    ("tasks", "/api/tasks/tasks/", "task 3", "due_date"),
+    ("customers", "/api/customers/", "garcia", "last_name"),
+    ("materials", "/api/inventory/materials/", "item 1", "name"),
+    ("consumables", "/api/inventory/consumables/", "item 1", "name"),
+    ("equipment", "/api/inventory/equipment/", "item 1", "name"),
+    ("ledger", "/api/inventory/transactions/", None, "quantity_delta"),
+    ("sales_orders", "/api/sales/orders/", "1", "id"),
+    ("sales_lines", "/api/sales/lines/", "1", "id"),
+    ("workflows", "/api/workflows/", "wood", "name"),
+    ("product_templates", "/api/products/templates/", "desk", "name"),
+]
+
+SEARCH_QUERIES = ["walnut", "board status:active", "garcia", "cuting bord"]
+
+
+def table_cases():
+    for name, url, term, ordering in TABLE_ENDPOINTS:
+        yield f"{name}.list", f"{url}?page_size={PAGE_SIZE}"
+        if term:
+            yield f"{name}.search", f"{url}?q={term}&page_size={PAGE_SIZE}"
+        yield f"{name}.order", f"{url}?ordering={ordering}&page_size={PAGE_SIZE}"
+        # Last page: the deepest OFFSET the table has ({last_page} is resolved per run).
+        yield f"{name}.paginate", f"{url}?page={{last_page}}&page_size={PAGE_SIZE}"
+
+
+CASES = [
+    *table_cases(),
+    *((f"search.{q.replace(' ', '_')}", f"/api/search/?q={q}") for q in SEARCH_QUERIES),
+    *((f"metric.{key}", f"/api/analytics/metrics/?key={key}") for key in sorted(METRIC_REGISTRY)),
+]
+
+
+# Fast list path (FastListViewSetMixin) vs the serializer path, same 100-row pages.
+FAST_LIST_CASES = [
+    ("materials", MaterialViewSet, "/api/inventory/materials/?omit=image,image_url,description&page_size=100"),
+    ("sales_lines", SalesOrderLineViewSet, "/api/sales/lines/?page_size=100"),
+]
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(client, url, repeat) -> dict:
+    # The query log is a bounded deque; start from empty so the capture's
+    # start/end indexes stay meaningful.
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        first = client.get(url)
+    # Read now: the timed requests below reset the query log.
+    queries = len(ctx.captured_queries)
+    assert first.status_code == 200, (url, first.status_code)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    data = getattr(first, "data", None)
+    rows = len(data["results"]) if isinstance(data, dict) and "results" in data else None
+    return {
+        "url": url,
+        "status": first.status_code,
+        "queries": queries,
+        "rows": rows,
+        "bytes": len(first.content),
+        "partial": first.headers.get("X-Search-Partial"),
+        "min_ms": round(timings[0], 3),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+@pytest.mark.parametrize("case_id,url", CASES, ids=[case_id for case_id, _ in CASES])
+def test_benchmark(bench_client, benchmark_results, benchmark_repeat, case_id, url):
+    if "{last_page}" in url:
+        count = bench_client.get(url.replace("{last_page}", "1")).data["count"]
+        url = url.replace("{last_page}", str(max(1, math.ceil(count / PAGE_SIZE))))
+    benchmark_results[case_id] = measure(bench_client, url, benchmark_repeat)
+
+
+@pytest.mark.parametrize("name,viewset,url", FAST_LIST_CASES, ids=[name for name, _, _ in FAST_LIST_CASES])
+def test_fast_list_benchmark(bench_client, benchmark_results, benchmark_repeat, monkeypatch, name, viewset, url):
+    benchmark_results[f"fast_list.{name}.fast"] = measure(bench_client, url, benchmark_repeat)
+    monkeypatch.setattr(viewset, "fast_list_fields", ())
+    monkeypatch.setattr(viewset, "fast_list_expressions", {})
+    benchmark_results[f"fast_list.{name}.serializer"] = measure(bench_client, url, benchmark_repeat)
@@ -0,0 +1,144 @@
+# backend/workflows/board.py
+"""
+Kanban board reads for a workflow.
+
+build_board() renders a whole board in a fixed number of queries, however
+many stages or projects it has:
+
+  1. active stages, in order
+  2. project counts per stage (one GROUP BY)
+  3. the first `limit` cards of every column (ROW_NUMBER() per stage)
+
+Columns are paged past their first cards with build_column_page(), using a
+keyset cursor on the card order (-created_at, -id), so deep pages cost the
+same as the first one and cards created meanwhile don't shift the page.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from projects.views import project_table_queryset
+
+from .models import WorkflowStage
+from .serializers import WorkflowStageSerializer
+
+DEFAULT_CARDS_PER_COLUMN = 20
+MAX_CARDS_PER_COLUMN = 100
+
+# Newest cards first; "id" breaks created_at ties so the keyset is total.
+CARD_ORDERING = ("-created_at", "-id")
+
+
+def parse_card_limit(value) -> int:
+    try:
+        return max(1, min(int(value), MAX_CARDS_PER_COLUMN))
+    except (TypeError, ValueError):
+        return DEFAULT_CARDS_PER_COLUMN
+
+
+def encode_card_cursor(project) -> str:
+    raw = json.dumps([project.created_at.isoformat(), project.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_card_cursor(value: str):
+    """
+    Cursor -> (created_at, id). Raises ValidationError on garbage.
+    """
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        ts, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(ts)
+        if created_at is None:
+            raise ValueError(ts)
+        return created_at, int(pk)
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def card_queryset(shop):
+    """
+    Unarchived projects as board cards: the project table's queryset, so
+    ProjectSerializer (and ?fields=) renders them like /api/projects/ rows,
+    without extra queries.
+    """
+    return project_table_queryset(shop).filter(is_archived=False)
+
+
+def _serialize_cards(cards, request):
+    return ProjectSerializer(cards, many=True, context={"request": request}).data
+
+
+def build_board(workflow, *, shop, request, limit=DEFAULT_CARDS_PER_COLUMN) -> dict:
+    stages = list(WorkflowStage.objects.filter(workflow=workflow, is_active=True).order_by("order", "id"))
+    stage_ids = [stage.id for stage in stages]
+
+    counts = dict(
+        Project.objects.filter(shop=shop, is_archived=False, current_stage_id__in=stage_ids)
+        .values("current_stage_id")
+        .annotate(n=Count("id"))
+        .values_list("current_stage_id", "n")
+    )
+
+    cards_by_stage = {stage_id: [] for stage_id in stage_ids}
+    if counts:
+        ranked = (
+            card_queryset(shop)
+            .filter(current_stage_id__in=stage_ids)
+            .annotate(
+                board_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("current_stage_id")],
+                    order_by=[F("created_at").desc(), F("id").desc()],
+                )
+            )
+            .filter(board_rank__lte=limit)
+            .order_by("current_stage_id", *CARD_ORDERING)
+        )
+        for project in ranked:
+            cards_by_stage[project.current_stage_id].append(project)
+
+    columns = []
+    for stage in stages:
+        count = counts.get(stage.id, 0)
+        cards = cards_by_stage[stage.id]
+        columns.append(
+            {
+                "stage": WorkflowStageSerializer(stage).data,
+                "count": count,
+                # wip_limit 0 means "no limit".
+                "over_wip_limit": bool(stage.wip_limit) and count > stage.wip_limit,
+                "cards": _serialize_cards(cards, request),
+                "next_cursor": encode_card_cursor(cards[-1]) if count > len(cards) else None,
+            }
+        )
+
+    return {
+        "workflow": {"id": workflow.id, "name": workflow.name},
+        "limit": limit,
+        "columns": columns,
+    }
+
+
+def build_column_page(stage, *, shop, request, cursor=None, limit=DEFAULT_CARDS_PER_COLUMN) -> dict:
+    qs = card_queryset(shop).filter(current_stage=stage)
+    if cursor:
+        created_at, pk = decode_card_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    cards = list(qs.order_by(*CARD_ORDERING)[: limit + 1])
+    has_more = len(cards) > limit
+    cards = cards[:limit]
+    return {
+        "stage": stage.id,
+        "cards": _serialize_cards(cards, request),
+        "next_cursor": encode_card_cursor(cards[-1]) if has_more else None,
+    }
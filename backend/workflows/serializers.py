@@ -3,10 +3,11 @@
 from django.db.models import Max
 from rest_framework import serializers
 
+from makerfex_backend.serializers import SparseFieldsetSerializerMixin
 from .models import Workflow, WorkflowStage
 
 
-class WorkflowStageSerializer(serializers.ModelSerializer):
+class WorkflowStageSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = WorkflowStage
         fields = [
@@ -60,7 +61,7 @@ class WorkflowStageSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class WorkflowSerializer(serializers.ModelSerializer):
+class WorkflowSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # Optional nested read-only stages listing (useful for admin screens / quick detail views)
     stages = WorkflowStageSerializer(many=True, read_only=True)
 
@@ -0,0 +1,96 @@
+# backend/workflows/tests/test_workflows_board.py
+from collections import Counter
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Project
+from workflows.models import Workflow, WorkflowStage
+
+
+def _busiest_stage(workflow):
+    counts = Counter(
+        Project.objects.filter(workflow=workflow, is_archived=False).values_list("current_stage_id", flat=True)
+    )
+    stage_id, count = counts.most_common(1)[0]
+    return WorkflowStage.objects.get(id=stage_id), count
+
+
+@pytest.mark.django_db
+def test_board_returns_ordered_columns_with_counts_and_wip_flags(auth_client):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+    stage, count = _busiest_stage(workflow)
+    WorkflowStage.objects.filter(id=stage.id).update(wip_limit=count - 1)
+
+    resp = auth_client.get(f"/api/workflows/{workflow.id}/board/", {"limit": 2, "fields": "id,name,created_at"})
+    assert resp.status_code == 200
+
+    columns = resp.data["columns"]
+    expected_ids = list(
+        WorkflowStage.objects.filter(workflow=workflow, is_active=True).order_by("order", "id").values_list("id", flat=True)
+    )
+    assert [col["stage"]["id"] for col in columns] == expected_ids
+
+    column = next(col for col in columns if col["stage"]["id"] == stage.id)
+    assert column["count"] == count
+    assert column["over_wip_limit"] is True
+    assert len(column["cards"]) == min(2, count)
+    assert set(column["cards"][0]) == {"id", "name", "created_at"}
+    assert (column["next_cursor"] is not None) == (count > 2)
+    assert sum(col["count"] for col in columns) == Project.objects.filter(
+        current_stage__in=expected_ids, is_archived=False
+    ).count()
+    assert not any(col["over_wip_limit"] for col in columns if col["stage"]["id"] != stage.id)
+
+
+@pytest.mark.django_db
+def test_board_query_count_does_not_grow_with_cards(auth_client):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+
+    def count_queries(limit):
+        with CaptureQueriesContext(connection) as ctx:
+            assert auth_client.get(f"/api/workflows/{workflow.id}/board/", {"limit": limit}).status_code == 200
+        return len(ctx.captured_queries)
+
+    assert count_queries(1) == count_queries(50)
+
+
+@pytest.mark.django_db
+def test_column_cursor_pages_through_every_card_once(auth_client):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+    stage, count = _busiest_stage(workflow)
+
+    board = auth_client.get(f"/api/workflows/{workflow.id}/board/", {"limit": 1}).data
+    column = next(col for col in board["columns"] if col["stage"]["id"] == stage.id)
+    seen = [card["id"] for card in column["cards"]]
+    cursor = column["next_cursor"]
+    while cursor:
+        page = auth_client.get(
+            f"/api/workflows/{workflow.id}/board/columns/{stage.id}/", {"cursor": cursor, "limit": 2}
+        ).data
+        seen += [card["id"] for card in page["cards"]]
+        cursor = page["next_cursor"]
+
+    expected = list(
+        Project.objects.filter(current_stage=stage, is_archived=False)
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)
+    )
+    assert seen == expected and len(expected) == count
+
+    bad = auth_client.get(f"/api/workflows/{workflow.id}/board/columns/{stage.id}/", {"cursor": "nope"})
+    assert bad.status_code == 400
+
+
+@pytest.mark.django_db
+def test_board_cards_match_project_list_rows(auth_client):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+    board = auth_client.get(f"/api/workflows/{workflow.id}/board/", {"limit": 100})
+    cards = {card["id"]: card for column in board.data["columns"] for card in column["cards"]}
+    listed = auth_client.get("/api/projects/", {"page_size": 100}).data["results"]
+
+    shared = [row for row in listed if row["id"] in cards]
+    assert shared
+    for row in shared:
+        assert cards[row["id"]] == row
@@ -0,0 +1,63 @@
+# backend/workflows/tests/test_workflows_stage_reorder.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Shop
+from makerfex_backend.versions import get_versions
+from workflows.models import Workflow, WorkflowStage
+
+
+def _orders(workflow):
+    return list(WorkflowStage.objects.filter(workflow=workflow).order_by("order").values_list("id", "order"))
+
+
+@pytest.mark.django_db
+def test_reorder_applies_permutation_and_keeps_inactive_last(auth_client, django_capture_on_commit_callbacks):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+    stages = list(WorkflowStage.objects.filter(workflow=workflow).order_by("order"))
+    # Retire the second stage: it must end up after every active one.
+    WorkflowStage.objects.filter(id=stages[1].id).update(is_active=False)
+    active_ids = [s.id for s in stages if s.id != stages[1].id]
+    new_order = list(reversed(active_ids))
+    before = get_versions(workflow.shop_id, [WorkflowStage])["workflows.workflowstage"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.post(
+            f"/api/workflows/{workflow.id}/stages/reorder/", {"stage_ids": new_order}, format="json"
+        )
+    assert resp.status_code == 200, resp.data
+
+    assert _orders(workflow) == [(sid, idx) for idx, sid in enumerate(new_order + [stages[1].id])]
+    assert get_versions(workflow.shop_id, [WorkflowStage])["workflows.workflowstage"] == before + 1
+
+
+@pytest.mark.django_db
+def test_reorder_round_trips_do_not_grow_with_stage_count(auth_client):
+    shop = Shop.objects.get(name="Silver Grain Woodworks")
+
+    def reorder_queries(n):
+        workflow = Workflow.objects.create(shop=shop, name=f"Wide {n}")
+        ids = [WorkflowStage.objects.create(workflow=workflow, name=f"S{i}", order=i).id for i in range(n)]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = auth_client.post(
+                f"/api/workflows/{workflow.id}/stages/reorder/", {"stage_ids": ids[1:] + ids[:1]}, format="json"
+            )
+        assert resp.status_code == 200
+        assert _orders(workflow) == [(sid, idx) for idx, sid in enumerate(ids[1:] + ids[:1])]
+        return len(ctx.captured_queries)
+
+    assert reorder_queries(3) == reorder_queries(40)
+
+
+@pytest.mark.django_db
+def test_reorder_rejects_partial_or_duplicate_ids(auth_client):
+    workflow = Workflow.objects.get(name="Woodworking - Standard")
+    ids = list(WorkflowStage.objects.filter(workflow=workflow, is_active=True).values_list("id", flat=True))
+    before = _orders(workflow)
+    url = f"/api/workflows/{workflow.id}/stages/reorder/"
+
+    assert auth_client.post(url, {"stage_ids": ids[:-1]}, format="json").status_code == 400
+    assert auth_client.post(url, {"stage_ids": ids + ids[:1]}, format="json").status_code == 400
+    assert auth_client.post(url, {"stage_ids": "1,2"}, format="json").status_code == 400
+    assert _orders(workflow) == before
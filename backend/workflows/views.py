@@ -2,6 +2,9 @@
 
 from django.apps import apps
 from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Q, Value, When
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
@@ -11,8 +14,15 @@ from rest_framework.response import Response
 from accounts.models import Employee
 from accounts.utils import get_shop_for_user
 from makerfex_backend.filters import QueryParamSearchFilter, parse_bool
-from makerfex_backend.mixins import ServerTableViewSetMixin, ShopScopedQuerysetMixin
-
+from makerfex_backend.mixins import (
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    SparseFieldsetViewSetMixin,
+)
+from makerfex_backend.query_budget import query_budget
+from makerfex_backend.versions import bump_versions
+
+from .board import build_board, build_column_page, parse_card_limit
 from .models import Workflow, WorkflowStage
 from .serializers import WorkflowSerializer, WorkflowStageSerializer
 
@@ -24,7 +34,36 @@ def _workflow_is_referenced(workflow: Workflow) -> bool:
 
 def _stage_is_referenced(stage: WorkflowStage) -> bool:
     Project = apps.get_model("projects", "Project")
-    return Project.objects.filter(current_stage=stage).exists()
+    if Project.objects.filter(current_stage=stage).exists():
+        return True
+    # Keep stages that appear in stage history (cycle-time / flow metrics).
+    ProjectStageTransition = apps.get_model("projects", "ProjectStageTransition")
+    return ProjectStageTransition.objects.filter(Q(from_stage=stage) | Q(to_stage=stage)).exists()
+
+
+def apply_stage_order(workflow: Workflow, ordered_ids: list[int], max_order: int) -> None:
+    """
+    Give ordered_ids (every stage of the workflow) the orders 0..N-1 in two
+    UPDATEs, without tripping uniq_workflow_stage_order mid-statement (a
+    non-deferred unique constraint is checked row by row):
+
+      1. CASE id -> offset + position, with offset above every current order
+         and every final order, so no row lands on an order still in use;
+      2. order - offset.
+    """
+    offset = max(max_order + 1, len(ordered_ids))
+    now = timezone.now()
+    stages = WorkflowStage.objects.filter(workflow=workflow, id__in=ordered_ids)
+    stages.update(
+        order=Case(
+            *[When(id=sid, then=Value(offset + idx)) for idx, sid in enumerate(ordered_ids)],
+            output_field=PositiveIntegerField(),
+        ),
+        updated_at=now,
+    )
+    stages.update(order=F("order") - offset)
+    # update() skips post_save, so version stages explicitly.
+    bump_versions(workflow.shop_id, WorkflowStage)
 
 
 class ShopScopedMixin:
@@ -46,7 +85,11 @@ class ShopScopedMixin:
 
 
 class WorkflowViewSet(
-    ServerTableViewSetMixin, ShopScopedQuerysetMixin, ShopScopedMixin, viewsets.ModelViewSet
+    SparseFieldsetViewSetMixin,
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    ShopScopedMixin,
+    viewsets.ModelViewSet,
 ):
     lookup_value_regex = r"\d+"
     serializer_class = WorkflowSerializer
@@ -60,6 +103,7 @@ class WorkflowViewSet(
     search_fields = ["name", "description"]
     ordering_fields = ["id", "name", "is_default", "is_active", "created_at", "updated_at"]
     ordering = ("name", "id")
+    query_budgets = {"list": 6, "retrieve": 5}
 
     def get_shop_queryset(self, shop):
         qs = Workflow.objects.filter(shop=shop)
@@ -73,6 +117,9 @@ class WorkflowViewSet(
         if is_default is not None:
             qs = qs.filter(is_default=is_default)
 
+        if "stages" in self.get_serialized_field_names():
+            qs = qs.prefetch_related("stages")
+
         return qs
 
     def perform_create(self, serializer):
@@ -82,6 +129,47 @@ class WorkflowViewSet(
         emp = self.get_employee(shop)
         serializer.save(shop=shop, created_by=emp)
 
+    def _board_workflow(self, pk):
+        # Plain lookup: ?fields= on board requests narrows the cards, not the workflow.
+        workflow = get_object_or_404(Workflow.objects.filter(shop=self.get_shop()), pk=pk)
+        self.check_object_permissions(self.request, workflow)
+        return workflow
+
+    @query_budget(7)
+    @action(detail=True, methods=["get"], url_path="board")
+    def board(self, request, pk=None):
+        """
+        Kanban board in a fixed number of queries.
+
+        GET /workflows/{id}/board/?limit=20&fields=id,name,priority
+
+        Returns active stages in order, each with its project count, an
+        over_wip_limit flag, the first `limit` cards (newest first; ?fields=
+        narrows them) and a next_cursor for the column endpoint below.
+        """
+        workflow = self._board_workflow(pk)
+        limit = parse_card_limit(request.query_params.get("limit"))
+        return Response(build_board(workflow, shop=workflow.shop_id, request=request, limit=limit))
+
+    @action(detail=True, methods=["get"], url_path=r"board/columns/(?P<stage_id>\d+)")
+    def board_column(self, request, pk=None, stage_id=None):
+        """
+        Next cards of one board column.
+
+        GET /workflows/{id}/board/columns/{stage_id}/?cursor=<next_cursor>&limit=20
+        """
+        workflow = self._board_workflow(pk)
+        stage = get_object_or_404(WorkflowStage, pk=stage_id, workflow=workflow)
+        limit = parse_card_limit(request.query_params.get("limit"))
+        page = build_column_page(
+            stage,
+            shop=workflow.shop_id,
+            request=request,
+            cursor=request.query_params.get("cursor"),
+            limit=limit,
+        )
+        return Response(page)
+
     def destroy(self, request, *args, **kwargs):
         """
         Safe delete:
@@ -107,38 +195,47 @@ class WorkflowViewSet(
 
         return super().destroy(request, *args, **kwargs)
 
-        @action(detail=True, methods=["post"], url_path="stages/reorder")
-        def reorder_stages(self, request, pk=None):
-            """
-            Backend-authoritative stage ordering (active stages only).
+    @action(detail=True, methods=["post"], url_path="stages/reorder")
+    def reorder_stages(self, request, pk=None):
+        """
+        Backend-authoritative stage ordering (active stages only).
 
-            POST /workflows/{id}/stages/reorder/
-            Body: { "stage_ids": [3,1,2,...] }
+        POST /workflows/{id}/stages/reorder/
+        Body: { "stage_ids": [3,1,2,...] }
 
-            Semantics (locked):
-            - stage_ids must include exactly ALL active stage IDs for the workflow
-            - order is normalized to 0..N-1 every time
-            - inactive stages are not reorderable via this endpoint
-            """
-            workflow = self.get_object()
-            stage_ids = request.data.get("stage_ids")
+        Semantics (locked):
+        - stage_ids must include exactly ALL active stage IDs for the workflow
+        - order is normalized to 0..N-1 every time
+        - inactive stages are not reorderable via this endpoint; they keep
+          their relative order after the active ones (N, N+1, ...)
 
-            if not isinstance(stage_ids, list) or not all(isinstance(x, int) for x in stage_ids):
-                return Response(
-                    {"detail": "stage_ids must be a list of integers."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        Applied as two set-based UPDATEs whatever the stage count (see
+        apply_stage_order).
+        """
+        workflow = self.get_object()
+        stage_ids = request.data.get("stage_ids")
 
-            if len(stage_ids) != len(set(stage_ids)):
-                return Response(
-                    {"detail": "stage_ids contains duplicates."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if not isinstance(stage_ids, list) or not all(isinstance(x, int) for x in stage_ids):
+            return Response(
+                {"detail": "stage_ids must be a list of integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(stage_ids) != len(set(stage_ids)):
+            return Response(
+                {"detail": "stage_ids contains duplicates."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            # Active stages for this workflow
-            active_ids = list(
-                WorkflowStage.objects.filter(workflow=workflow, is_active=True).values_list("id", flat=True)
+        with transaction.atomic():
+            # All stages of the workflow, locked against a concurrent reorder.
+            stages = list(
+                WorkflowStage.objects.select_for_update()
+                .filter(workflow=workflow)
+                .order_by("order", "id")
+                .values_list("id", "is_active", "order")
             )
+            active_ids = [sid for sid, is_active, _ in stages if is_active]
 
             if set(stage_ids) != set(active_ids):
                 return Response(
@@ -149,16 +246,22 @@ class WorkflowViewSet(
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            with transaction.atomic():
-                # Normalize order to 0..n-1 for ALL active stages
-                for idx, sid in enumerate(stage_ids):
-                    WorkflowStage.objects.filter(workflow=workflow, id=sid, is_active=True).update(order=idx)
+            inactive_ids = [sid for sid, is_active, _ in stages if not is_active]
+            max_order = max((order for _, _, order in stages), default=0)
+            apply_stage_order(workflow, stage_ids + inactive_ids, max_order)
 
-            return Response({"detail": "Stage order updated."}, status=status.HTTP_200_OK)
+        return Response(
+            {"detail": "Stage order updated.", "stage_ids": stage_ids},
+            status=status.HTTP_200_OK,
+        )
 
 
 class WorkflowStageViewSet(
-    ServerTableViewSetMixin, ShopScopedQuerysetMixin, ShopScopedMixin, viewsets.ModelViewSet
+    SparseFieldsetViewSetMixin,
+    ServerTableViewSetMixin,
+    ShopScopedQuerysetMixin,
+    ShopScopedMixin,
+    viewsets.ModelViewSet,
 ):
     lookup_value_regex = r"\d+"
     serializer_class = WorkflowStageSerializer
@@ -182,6 +285,7 @@ class WorkflowStageViewSet(
         "updated_at",
     ]
     ordering = ("workflow_id", "order", "id")
+    query_budgets = {"list": 5, "retrieve": 4}
 
     def get_shop_queryset(self, shop):
         qs = WorkflowStage.objects.filter(workflow__shop=shop)